@@ -0,0 +1,201 @@
+"""batch_model_selection.py
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Runs the model selection of several datasets and dependent variables in one process, from a JSON manifest like :
+    {
+        "parameters": {"splitTestSize": 0.25},
+        "runs": [
+            {"modelType": "regressor", "dataset": "data/Data-For-Regression.csv", "parameters": {"featureScaleDependentVariables": true},
+             "targets": [-1, {"dependentVariableColumnIndex": 0, "independentVariablesStartIndex": 1}]},
+            {"modelType": "classifier", "dataset": "data/Data-For-Classification.csv", "parameters": {"independentVariablesStartIndex": 1}}
+        ]
+    }
+The parameters are the command line ones of the model selection (without the dash), the common ones being overridden by the ones of a run, then of a target.
+A target is a dependent variable column index, or the parameters of the target. Without targets, a run is done on its parameters only.
+The libraries are imported once, the models are trained on a pool of workers shared by all the runs,
+and a dataset file is only parsed once for all its targets. A combined leaderboard of all the runs is printed, and can be written as a CSV file.
+
+Desirable features :
+    - Run the evaluations of several runs at the same time on the shared pool.
+
+"""
+
+#### Libraries
+import utils.dataset_manager as dm
+import utils.input_parameters as ip
+import utils.output_renderer as orr
+import utils.profiler as pr
+import models.common.common_model_selection as cms
+import regression_model_selection as rms
+import classification_model_selection as clms
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import argparse
+import csv
+import json
+import os
+
+# Constants
+MODEL_TYPES = {
+    'regressor' : (rms.EXISTING_REGRESSORS, rms.select_models, rms.get_R2_score, 'R2 Score'),
+    'classifier' : (clms.EXISTING_CLASSIFIERS, clms.select_models, clms.get_accuracy_score, 'Accuracy Score')
+}
+DEFAULT_LEADERBOARD_FILE = None
+LEADERBOARD_HEADERS = ["Dataset", "Dependent Variable", "Model Type", "Rank", "Model", "Score Name", "Score"]
+ERRORS_HEADERS = ["Run", "Dataset", "Dependent Variable", "Model Type", "Error"]
+
+
+
+def main():
+    """Batch main process.
+
+    """
+    argumentParser = get_argument_parser()
+    args = argumentParser.parse_args()
+    if args.jobs == 0:
+        argumentParser.error("-jobs can't be 0")
+    orr.set_output_format(args.outputFormat)
+
+    # All the runs parameters are checked before running any of them
+    with open(args.manifest, 'r') as manifestFile:
+        runsParameters = get_runs_parameters(json.load(manifestFile), os.path.dirname(os.path.abspath(args.manifest)), args.jobs, args.executor)
+
+    executorType = cms.get_executor_type(args.jobs, args.executor)
+    executor = None
+    if executorType != 'serial':
+        executorClass = ThreadPoolExecutor if executorType == 'thread' else ProcessPoolExecutor
+        executor = executorClass(max_workers=cms.get_nb_workers(args.jobs, max(len(modelTypeDescription[0]) for modelTypeDescription in MODEL_TYPES.values())))
+    cms.set_shared_executor(executor)
+
+    try:
+        leaderboard, errors = run_all(runsParameters)
+    finally:
+        cms.set_shared_executor(None)
+        if executor is not None:
+            executor.shutdown()
+
+    orr.print_table([LEADERBOARD_HEADERS] + leaderboard, "Leaderboard of the {0} runs".format(len(runsParameters)))
+    if args.leaderboardFile is not None:
+        with open(args.leaderboardFile, 'w', newline='') as leaderboardFile:
+            csv.writer(leaderboardFile).writerows([LEADERBOARD_HEADERS] + leaderboard)
+        orr.print_message("\nLeaderboard written into {0}".format(args.leaderboardFile))
+
+    if errors:
+        orr.print_table([ERRORS_HEADERS] + errors, "Runs in error")
+
+
+
+def get_argument_parser():
+    argumentParser = argparse.ArgumentParser(description="Determine the best regressors and classifiers of several datasets and dependent variables, from a JSON manifest.")
+    argumentParser.add_argument('manifest', type=str, help="Defines the JSON manifest of the runs, the relative dataset paths being relative to it")
+    argumentParser.add_argument('-jobs', type=int, default=ip.DEFAULT_NB_JOBS,\
+        help="Indicates the number of workers of the pool shared by all the runs, -1 means use all processors (default: {0})".format(ip.DEFAULT_NB_JOBS))
+    argumentParser.add_argument('-executor', type=str, choices=ip.EXECUTOR_TYPES, default=ip.DEFAULT_EXECUTOR_TYPE,\
+        help="Indicates the workers type of the shared pool (default: {0}, means 'serial' for one job and 'process' for several jobs)".format(ip.DEFAULT_EXECUTOR_TYPE))
+    argumentParser.add_argument('-leaderboardFile', type=str, default=DEFAULT_LEADERBOARD_FILE,\
+        help="Defines a CSV file where the combined leaderboard of all the runs is written (default: {0})".format(DEFAULT_LEADERBOARD_FILE))
+    argumentParser.add_argument('-outputFormat', type=str, choices=ip.OUTPUT_FORMATS, default=ip.DEFAULT_OUTPUT_FORMAT,\
+        help="Indicates the format of the printed results tables (default: {0})".format(ip.DEFAULT_OUTPUT_FORMAT))
+    return argumentParser
+
+
+
+def get_runs_parameters(manifest, manifestDirectory, nbJobs, executorType):
+    """Returns the list of (model type, input parameters) of each target of each run of the manifest.
+    The parameters are checked by the command line parser of the model type, the shared pool ones being forced.
+
+    """
+    runsParameters = []
+    for run in manifest['runs']:
+        modelType = run.get('modelType', 'regressor')
+        if modelType not in MODEL_TYPES:
+            raise AttributeError("Invalid model type in the manifest : '{0}', expected types {1}".format(modelType, list(MODEL_TYPES.keys())))
+
+        datasetFilePath = os.path.join(manifestDirectory, run['dataset'])
+        if not os.path.isfile(datasetFilePath):
+            raise FileNotFoundError("Dataset file of the manifest not found : '{0}'".format(datasetFilePath))
+
+        existingModels = MODEL_TYPES[modelType][0]
+        argumentParser = ip.get_argument_parser(modelType, cms.get_dictionary_codes(existingModels))
+        for target in run.get('targets', [{}]):
+            targetParameters = target if isinstance(target, dict) else {'dependentVariableColumnIndex': target}
+            parameters = {**manifest.get('parameters', {}), **run.get('parameters', {}), **targetParameters, 'jobs': nbJobs, 'executor': executorType}
+            arguments = [datasetFilePath] + get_command_line_arguments(parameters)
+            runsParameters.append((modelType, ip.get_input_parameters_from_arguments(argumentParser, argumentParser.parse_args(arguments))))
+
+    return runsParameters
+
+
+
+def get_command_line_arguments(parameters):
+    """Returns the command line arguments of the parameters : a flag for a true value, nothing for a false or null one,
+    the values of a list, and repeated flags for a list of lists (like the '-predict' rows).
+
+    """
+    arguments = []
+    for name, value in parameters.items():
+        if value is None or value is False:
+            continue
+
+        if value is True:
+            arguments.append('-' + name)
+        elif isinstance(value, list) and value and isinstance(value[0], list):
+            for values in value:
+                arguments += ['-' + name] + [str(element) for element in values]
+        elif isinstance(value, list):
+            arguments += ['-' + name] + [str(element) for element in value]
+        else:
+            arguments += ['-' + name, str(value)]
+
+    return arguments
+
+
+
+def run_all(runsParameters):
+    """Runs the model selection of each target, the targets of a same dataset file one after another so that the file is parsed once.
+    A run in error doesn't stop the next ones.
+    Returns the rows of the combined leaderboard, and the rows of the runs in error.
+
+    """
+    runsByDataset = {}
+    for modelType, inputParameters in runsParameters:
+        runsByDataset.setdefault((inputParameters.datasetFilePath, inputParameters.noHeader), []).append((modelType, inputParameters))
+
+    leaderboard = []
+    errors = []
+    runIndex = 0
+    for (datasetFilePath, noHeader), datasetRuns in runsByDataset.items():
+        # Parsed once for all its targets, unless read by chunks or from the binary cache
+        dataset = None
+        for modelType, inputParameters in datasetRuns:
+            runIndex += 1
+            _, selectModelsLambda, scoreLambda, scoreName = MODEL_TYPES[modelType]
+            dependentVariableHeader = str(inputParameters.dependentVariableColumnIndex)
+            try:
+                if dataset is None and inputParameters.chunkSize is None and inputParameters.datasetCacheDir is None:
+                    dataset = dm.read_dataset(inputParameters)
+
+                dependentVariableHeader = dm.DatasetManager(inputParameters).get_dependent_variable_header() if dataset is None\
+                    else str(dataset.columns[inputParameters.dependentVariableColumnIndex])
+                orr.print_message("\nRun {0} of {1} : {2}s of {3} for {4}".format(runIndex, len(runsParameters), modelType, datasetFilePath, dependentVariableHeader))
+
+                profiler = pr.Profiler(inputParameters.profile, traceMemory=not inputParameters.profileTimesOnly)
+                try:
+                    evaluations = selectModelsLambda(inputParameters, profiler, dataset if inputParameters.chunkSize is None and inputParameters.datasetCacheDir is None else None)
+                finally:
+                    profiler.write_report()
+            except Exception as error:
+                orr.print_message("\nRun {0} of {1} in error : {2}: {3}".format(runIndex, len(runsParameters), type(error).__name__, error))
+                errors.append([runIndex, datasetFilePath, dependentVariableHeader, modelType, "{0}: {1}".format(type(error).__name__, error)])
+                continue
+
+            # The cross-validation evaluations are ranked by mean score
+            for rank, evaluation in enumerate(evaluations or [], start=1):
+                score = evaluation[1] if inputParameters.cvFolds is not None else scoreLambda(evaluation)
+                leaderboard.append([datasetFilePath, dependentVariableHeader, modelType, rank, evaluation[0], scoreName, "{:.20f}".format(score)])
+
+    return leaderboard, errors
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""benchmark_model_selection.py
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Benchmarks the regressors and classifiers on synthetic datasets of increasing number of rows and features.
+For each dataset, the full model selection pipeline is run as a command line process, and each model is evaluated alone in a fresh process,
+recording the training and prediction throughputs, the prediction latency of a single row and the memory.
+The times are measured without tracing the memory (tracemalloc slowing down the traced code), the peak memory of a model being measured by another evaluation.
+The results are saved as a JSON file, that can be compared with the results of another version.
+
+Desirable features :
+    - Benchmark the streaming evaluation and the dataset cache.
+    - Plot the scaling curves.
+
+"""
+
+#### Libraries
+import utils.atomic_files as af
+import utils.dataset_manager as dm
+import utils.input_parameters as ip
+import utils.output_renderer as orr
+import utils.profiler as pr
+import models.common.common_model_selection as cms
+import regression_model_selection as rms
+import classification_model_selection as clms
+import numpy as np
+import pandas as pd
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# Constants
+MODEL_TYPES = {
+    'regressor' : (rms.EXISTING_REGRESSORS, rms.get_R2_score, 'regression_model_selection.py'),
+    'classifier' : (clms.EXISTING_CLASSIFIERS, clms.get_accuracy_score, 'classification_model_selection.py')
+}
+DEFAULT_NB_ROWS = [1000, 10000, 100000, 1000000, 10000000]
+DEFAULT_NB_FEATURES = [5, 50, 500]
+DEFAULT_MAX_CELLS = 10 ** 8
+DEFAULT_TIMEOUT = 600.0
+DEFAULT_DATA_DIRECTORY = 'benchmark_data'
+DEFAULT_RESULTS_FILE = 'benchmark_results.json'
+# Number of values generated at once, so that the biggest datasets are written without being held in memory
+GENERATION_CHUNK_CELLS = 10 ** 6
+GENERATION_RANDOM_STATE = 0
+LATENCY_REPEATS = 100
+# Metrics compared between two results files, the higher the better for the throughputs and the lower the better for the others
+COMPARED_METRICS = ['wallTime', 'fitThroughput', 'predictThroughput', 'predictLatency', 'peakMemory', 'maxRss']
+
+
+
+def main():
+    """Benchmark main process.
+
+    """
+    args = get_argument_parser().parse_args()
+    orr.set_output_format(args.outputFormat)
+    os.makedirs(args.dataDir, exist_ok=True)
+
+    results = []
+    for modelType in args.modelTypes:
+        existingModels, _, _ = MODEL_TYPES[modelType]
+        modelsCodes = [modelCode for modelCode in existingModels if args.models is None or modelCode in args.models]
+        for nbFeatures in args.features:
+            for nbRows in args.rows:
+                if nbRows * nbFeatures > args.maxCells:
+                    orr.print_message("Skipping the {0} dataset of {1} rows and {2} features, beyond -maxCells".format(modelType, nbRows, nbFeatures))
+                    continue
+
+                datasetFilePath = generate_dataset(args.dataDir, modelType, nbRows, nbFeatures)
+                benchmarks = [] if args.noPipeline else [('pipeline', None)]
+                benchmarks += [('model', modelCode) for modelCode in modelsCodes]
+                for kind, modelCode in benchmarks:
+                    result = {'kind': kind, 'modelType': modelType, 'model': modelCode, 'nbRows': nbRows, 'nbFeatures': nbFeatures}
+                    if kind == 'pipeline':
+                        result.update(benchmark_pipeline(modelType, datasetFilePath, args.timeout))
+                    else:
+                        # The times are measured without tracing the memory, its peak being measured by a second evaluation in a new process
+                        result.update(run_in_process(benchmark_model, (modelType, modelCode, datasetFilePath, False), args.timeout))
+                        if 'error' not in result:
+                            result.update(run_in_process(benchmark_model, (modelType, modelCode, datasetFilePath, True), args.timeout))
+                    print_result(result)
+                    results.append(result)
+
+    with open(args.output, 'w') as resultsFile:
+        json.dump({'environment': get_environment(), 'results': results}, resultsFile, indent=2)
+    print_results(results)
+    orr.print_message("Benchmark results written into {0}".format(args.output))
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as previousResultsFile:
+            print_comparison(json.load(previousResultsFile)['results'], results)
+
+
+
+def get_argument_parser():
+    argumentParser = argparse.ArgumentParser(description="Benchmark the regressors and classifiers on synthetic datasets of increasing size.")
+    argumentParser.add_argument('-modelTypes', type=str, nargs='+', choices=list(MODEL_TYPES.keys()), default=list(MODEL_TYPES.keys()),\
+        help="Indicates the types of the benchmarked models (default: {0})".format(list(MODEL_TYPES.keys())))
+    argumentParser.add_argument('-models', type=str, nargs='+', default=None,\
+        help="Defines a list of regressors or classifiers codes to benchmark (default: None, means all existing ones)")
+    argumentParser.add_argument('-rows', type=int, nargs='+', default=DEFAULT_NB_ROWS, help="Defines the numbers of rows of the synthetic datasets (default: {0})".format(DEFAULT_NB_ROWS))
+    argumentParser.add_argument('-features', type=int, nargs='+', default=DEFAULT_NB_FEATURES, help="Defines the numbers of features of the synthetic datasets (default: {0})".format(DEFAULT_NB_FEATURES))
+    argumentParser.add_argument('-maxCells', type=int, default=DEFAULT_MAX_CELLS,\
+        help="Indicates the maximum number of values (rows times features) of a benchmarked dataset, the bigger ones being skipped (default: {0})".format(DEFAULT_MAX_CELLS))
+    argumentParser.add_argument('-timeout', type=float, default=DEFAULT_TIMEOUT,\
+        help="Indicates the maximum time in seconds of each benchmark, a slower one being stopped and reported as such (default: {0})".format(DEFAULT_TIMEOUT))
+    argumentParser.add_argument('-noPipeline', action=ip.get_action(False), help="Indicates to only benchmark each model alone, without the full pipelines (default: False)")
+    argumentParser.add_argument('-dataDir', type=str, default=DEFAULT_DATA_DIRECTORY,\
+        help="Indicates the directory of the generated datasets, reused by the next benchmarks (default: {0})".format(DEFAULT_DATA_DIRECTORY))
+    argumentParser.add_argument('-output', type=str, default=DEFAULT_RESULTS_FILE, help="Defines the JSON results file (default: {0})".format(DEFAULT_RESULTS_FILE))
+    argumentParser.add_argument('-compare', type=str, default=None,\
+        help="Defines a JSON results file of a previous benchmark, to compare the metrics of the common benchmarks with (default: None)")
+    argumentParser.add_argument('-outputFormat', type=str, choices=ip.OUTPUT_FORMATS, default=ip.DEFAULT_OUTPUT_FORMAT,\
+        help="Indicates the format of the printed results tables, the 'csv' and 'json' ones writing the progress messages to the error output (default: {0})".format(ip.DEFAULT_OUTPUT_FORMAT))
+    return argumentParser
+
+
+
+def generate_dataset(dataDirectory, modelType, nbRows, nbFeatures):
+    """Writes, if not done yet, a synthetic CSV dataset : independent variables drawn from a normal distribution,
+    and a dependent one linear with some noise and a non linear term (its sign, giving two labels, for classification).
+    Returns the dataset file path.
+
+    """
+    datasetFilePath = os.path.join(dataDirectory, "{0}-{1}x{2}.csv".format(modelType, nbRows, nbFeatures))
+    if os.path.isfile(datasetFilePath):
+        return datasetFilePath
+
+    randomGenerator = np.random.default_rng(GENERATION_RANDOM_STATE)
+    coefficients = randomGenerator.normal(size=nbFeatures)
+    headers = ["X{0}".format(i) for i in range(nbFeatures)] + ['y']
+    chunkSize = max(1, GENERATION_CHUNK_CELLS // nbFeatures)
+
+    def write_dataset(datasetFile):
+        for firstRow in range(0, nbRows, chunkSize):
+            X = randomGenerator.normal(size=(min(chunkSize, nbRows - firstRow), nbFeatures))
+            y = X @ coefficients + np.sin(X[:, 0]) + randomGenerator.normal(scale=0.5, size=len(X))
+            if modelType == 'classifier':
+                y = (y > 0).astype(int)
+            pd.DataFrame(np.column_stack((X, y)), columns=headers).to_csv(datasetFile, header=firstRow == 0, index=False, float_format='%.6g')
+
+    # An interrupted generation is never reused
+    af.write_file(datasetFilePath, write_dataset, 'w', newline='')
+
+    return datasetFilePath
+
+
+
+def benchmark_pipeline(modelType, datasetFilePath, timeout):
+    """Runs the full model selection command line on the dataset, with its profiling report of the times only.
+    Returns the wall time, the maximum resident set size and the wall time of each stage.
+
+    """
+    _, _, scriptName = MODEL_TYPES[modelType]
+    fileDescriptor, profileFilePath = tempfile.mkstemp(suffix='.json')
+    os.close(fileDescriptor)
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), scriptName), datasetFilePath, '-profile', profileFilePath, '-profileTimesOnly']
+    try:
+        startTime = time.perf_counter()
+        completedProcess = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+        wallTime = time.perf_counter() - startTime
+        if completedProcess.returncode != 0:
+            return {'error': completedProcess.stderr.decode(errors='replace').strip().splitlines()[-1]}
+
+        with open(profileFilePath, 'r') as profileFile:
+            profile = json.load(profileFile)
+    except subprocess.TimeoutExpired:
+        return {'error': "timeout after {0}s".format(timeout)}
+    finally:
+        os.remove(profileFilePath)
+
+    return {'wallTime': wallTime, 'maxRss': profile['maxRss'], 'stages': {stageName: stage['wallTime'] for stageName, stage in profile['stages'].items()}}
+
+
+
+def benchmark_model(modelType, modelCode, datasetFilePath, traceMemory):
+    """Evaluates one model alone on the dataset, with its profiling.
+    Returns the score, the times, the throughputs (rows by second), the latency of a single row prediction and the maximum resident set size,
+    or only the peak memory of the evaluation if 'traceMemory' is set (the times being slowed down by the memory tracing).
+
+    """
+    existingModels, scoreLambda, _ = MODEL_TYPES[modelType]
+    datasetManager = dm.DatasetManager(ip.InputParameters(datasetFilePath))
+    startTime = time.perf_counter()
+    datasetManager.load_and_split_data()
+    loadTime = time.perf_counter() - startTime
+
+    model = cms.instantiate_models(cms.import_models(existingModels, [modelCode]), datasetManager)[modelCode]
+    # The model is profiled in memory only, without any report
+    model.profile = pr.new_profile(traceMemory=traceMemory)
+    model, evaluation, error = cms.evaluate_model(model)
+    if error is not None:
+        return {'error': error}
+
+    stages = model.profile['stages']
+    if traceMemory:
+        return {'peakMemory': stages['evaluation']['peakMemory']}
+
+    # Latency of a single row prediction, the median being less sensitive to the scheduling noise
+    latencies = []
+    for _ in range(LATENCY_REPEATS):
+        startTime = time.perf_counter()
+        model.predict_values(datasetManager.X_test[:1])
+        latencies.append(time.perf_counter() - startTime)
+
+    fitTime = stages['fit']['wallTime'] if 'fit' in stages else None
+    predictTime = stages['predict']['wallTime'] if 'predict' in stages else None
+    return {'score': float(scoreLambda(evaluation)), 'loadTime': loadTime, 'wallTime': stages['evaluation']['wallTime'], 'fitTime': fitTime, 'predictTime': predictTime,\
+        'fitThroughput': len(datasetManager.y_train) / fitTime if fitTime else None, 'predictThroughput': len(datasetManager.y_test) / predictTime if predictTime else None,\
+        'predictLatency': float(np.median(latencies)), 'maxRss': pr.get_max_rss()}
+
+
+
+def run_in_process(function, arguments, timeout):
+    """Runs the function in a new process, so that each benchmark starts from a clean memory and can be stopped after the timeout.
+    Returns the function result, or a dictionary with the error.
+
+    """
+    context = multiprocessing.get_context('spawn')
+    parentConnection, childConnection = context.Pipe(duplex=False)
+    process = context.Process(target=send_result, args=(childConnection, function, arguments))
+    process.start()
+    childConnection.close()
+    try:
+        if not parentConnection.poll(timeout):
+            process.terminate()
+            return {'error': "timeout after {0}s".format(timeout)}
+
+        return parentConnection.recv()
+    except EOFError:
+        return {'error': "process stopped with exit code {0}".format(process.exitcode)}
+    finally:
+        process.join()
+        parentConnection.close()
+
+
+
+def send_result(connection, function, arguments):
+    try:
+        connection.send(function(*arguments))
+    except Exception as error:
+        connection.send({'error': "{0}: {1}".format(type(error).__name__, error)})
+    finally:
+        connection.close()
+
+
+
+def get_environment():
+    """Returns the description of the benchmarked version and of the machine, saved with the results.
+
+    """
+    try:
+        version = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        version = None
+
+    return {'version': version, 'date': datetime.datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),\
+        'platform': platform.platform(), 'nbCpus': os.cpu_count(), 'numpy': np.__version__, 'pandas': pd.__version__}
+
+
+
+def get_result_key(result):
+    return (result['kind'], result['modelType'], result['model'], result['nbRows'], result['nbFeatures'])
+
+
+
+def get_result_name(result):
+    return "{0} {1} {2}x{3}".format(result['modelType'], result['model'] or 'pipeline', result['nbRows'], result['nbFeatures'])
+
+
+
+def print_result(result):
+    if 'error' in result:
+        orr.print_message("{0} : {1}".format(get_result_name(result), result['error']))
+        return
+
+    metrics = ["{0}={1:.4g}".format(metric, result[metric]) for metric in ['score'] + COMPARED_METRICS if result.get(metric) is not None]
+    orr.print_message("{0} : {1}".format(get_result_name(result), ', '.join(metrics)))
+
+
+
+def print_results(results):
+    """Prints the table of the metrics of all the benchmarks, the missing ones being left empty.
+
+    """
+    if not results:
+        return
+
+    metrics = ['score'] + COMPARED_METRICS
+    rows = [["Benchmark"] + metrics + ["Error"]]
+    for result in results:
+        rows.append([get_result_name(result)] + ["{0:.4g}".format(result[metric]) if result.get(metric) is not None else '' for metric in metrics] + [result.get('error', '')])
+    orr.print_table(rows, "Benchmark results")
+
+
+
+def print_comparison(previousResults, results):
+    """Prints the metrics of the benchmarks common to the previous and the current results, with their ratio (current / previous).
+
+    """
+    previousResultsByKey = {get_result_key(result): result for result in previousResults}
+    rows = []
+    for result in results:
+        previousResult = previousResultsByKey.get(get_result_key(result))
+        if previousResult is None:
+            continue
+
+        for metric in COMPARED_METRICS:
+            if result.get(metric) and previousResult.get(metric):
+                rows.append([get_result_name(result), metric, "{0:.4g}".format(previousResult[metric]), "{0:.4g}".format(result[metric]), "{0:.3f}".format(result[metric] / previousResult[metric])])
+
+    if not rows:
+        orr.print_message("No common benchmark to compare with")
+        return
+
+    rows.insert(0, ["Benchmark", "Metric", "Previous", "Current", "Ratio"])
+    orr.print_table(rows, "Comparison with the previous benchmark")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -10,35 +10,40 @@ Desirable features :
 """
 
 #### Libraries
+import time
+# Taken before the other imports, for reporting the startup time
+STARTUP_START_TIME = time.perf_counter()
+import utils.classification_metrics as cm
 import utils.dataset_manager as dm
 import utils.input_parameters as ip
-from texttable import Texttable
+import models.common.approximate_kernel as ak
 import models.common.common_model_selection as cms
-# Classifiers
-from models.classifiers.decision_tree_classification import DecisionTreeClassifier as DTClassif
-from models.classifiers.k_nearest_neighbors_classification import KNearestNeighborsClassifier as KNNClassif
-from models.classifiers.kernel_svm_classification import KernelSvmClassifier as KSVMClassif
-from models.classifiers.logistic_regression_classification import LogisticRegressionClassifier as LRClassif
-from models.classifiers.naive_bayes_classification import NaiveBayesClassifier as NBClassif
-from models.classifiers.random_forest_classification import RandomForestClassifier as RFClassif
-from models.classifiers.support_vector_machine_classification import SupportVectorMachineClassifier as SVMClassif
-
+import models.common.dtype_report as dr
+import models.common.forest_growth as fg
+import models.common.hyperparameters_search as hs
+import models.common.models_racing as mr
+import models.common.models_store as ms
+import models.common.neighbors_index as ni
+import utils.output_renderer as orr
+import utils.profiler as pr
 import sys
 sys.path.append("../src/")
 
 
 
 # Dictionary of all existing classifiers.
-# For each row, the key is a classifier code (that can be used for restricting a specific prediction). And the value is the classifier class
+# For each row, the key is a classifier code (that can be used for restricting a specific prediction). And the value is the dotted path of the classifier class,
+# its module being only imported when the classifier is used
 # To avoid processing a specific classifier, feel free to comment the concerned line
 EXISTING_CLASSIFIERS = {
-    'DTC' : DTClassif,
-    'KNNC' : KNNClassif,
-    'KSVMC' : KSVMClassif,
-    'LRC' : LRClassif,
-    'NBC' : NBClassif,
-    'RFC' : RFClassif,
-    'SVMC' : SVMClassif
+    'DTC' : 'models.classifiers.decision_tree_classification.DecisionTreeClassifier',
+    'KNNC' : 'models.classifiers.k_nearest_neighbors_classification.KNearestNeighborsClassifier',
+    'KSVMC' : 'models.classifiers.kernel_svm_classification.KernelSvmClassifier',
+    'LRC' : 'models.classifiers.logistic_regression_classification.LogisticRegressionClassifier',
+    'NBC' : 'models.classifiers.naive_bayes_classification.NaiveBayesClassifier',
+    'RFC' : 'models.classifiers.random_forest_classification.RandomForestClassifier',
+    'SVMC' : 'models.classifiers.support_vector_machine_classification.SupportVectorMachineClassifier',
+    'SGDC' : 'models.classifiers.stochastic_gradient_descent_classification.StochasticGradientDescentClassifier'
 }
 
 def main():
@@ -47,46 +52,191 @@ def main():
     """
     # Get input parameters for dataset management
     inputParameters = ip.get_input_parameters('classifier', cms.get_dictionary_codes(EXISTING_CLASSIFIERS))
+    startupTime = time.perf_counter() - STARTUP_START_TIME
+    orr.set_output_format(inputParameters.outputFormat)
+    if inputParameters.showStartupTime:
+        orr.print_message("Startup time : {0:.3f}s (libraries imports and input parameters, the classifiers being imported when used)".format(startupTime))
+
+    # Profile the stages and the classifiers if requested, the report being written even if the run fails
+    profiler = pr.Profiler(inputParameters.profile, traceMemory=not inputParameters.profileTimesOnly)
+    profiler.record_stage('startup', startupTime)
+    try:
+        select_models(inputParameters, profiler)
+    finally:
+        profiler.write_report()
+
+
 
+def select_models(inputParameters, profiler, dataset=None):
+    """Loads the dataset (or uses the given DataFrame of the dataset file), then evaluates the classifiers and predicts from them, depending of the input parameters.
+    Returns the evaluations ranking the classifiers (the cross-validation ones if any), or None if none was evaluated.
+
+    """
     # Load the data
     datasetManager = dm.DatasetManager(inputParameters)
-    datasetManager.load_and_split_data()
+    if inputParameters.predictFromStore:
+        # Predict from the stored classifiers only, without training : the dataset is loaded for finding the classifiers trained on its content
+        with profiler.stage('loading'):
+            datasetManager.load_data(dataset)
+            datasetManager.split_data()
+            classifiersDictionary = ms.load_models('classifier', EXISTING_CLASSIFIERS, datasetManager, inputParameters.predictOnly)
+        with profiler.stage('prediction'):
+            if inputParameters.predict is not None:
+                predictions = cms.predict_from_lambda(classifiersDictionary.values(), lambda classifier : classifier.predict())
+                cms.print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='Predicted ')
+            if inputParameters.predictFile is not None:
+                nbPredictedRows = cms.predict_file('classifier', classifiersDictionary, datasetManager, inputParameters.predictOnly)
+                cms.print_predict_file_summary('classifier', nbPredictedRows, inputParameters.predictOutputFile)
+        return
+
+    if inputParameters.convertDatasetOnly:
+        with profiler.stage('loading'):
+            cacheEntryDirectory = datasetManager.convert_data_to_cache()
+        orr.print_message("Dataset cached into {0}".format(cacheEntryDirectory) if cacheEntryDirectory is not None else "Dataset can't be cached, only numeric values can be memory-mapped")
+        return
+
+    if inputParameters.streamingEvaluation:
+        # Only the classifiers able to learn by batches are trained, the dataset being streamed
+        with profiler.stage('importing'):
+            existingModels = cms.get_streamable_models(cms.import_models(EXISTING_CLASSIFIERS))
+        with profiler.stage('loading'):
+            datasetManager.get_streamed_statistics(collectLabels=True)
+    else:
+        with profiler.stage('importing'):
+            existingModels = cms.import_models(EXISTING_CLASSIFIERS)
+        with profiler.stage('loading'):
+            datasetManager.load_data(dataset)
+        with profiler.stage('splitting'):
+            datasetManager.split_data()
+        if inputParameters.dtype is not None:
+            dr.print_memory_usage(datasetManager)
+
+    modelName = 'classifier'
+    # Tune the hyperparameters of the classifiers
+    hyperparametersDictionary = None
+    if inputParameters.tune:
+        with profiler.stage('tuning'):
+            searchResults = hs.search_best_hyperparameters(existingModels, datasetManager, get_accuracy_score)
+        hs.print_search_results(modelName, searchResults, 'Accuracy Score')
+        hyperparametersDictionary = hs.get_best_hyperparameters(searchResults)
+
+    # Race the classifiers, only the survivors going on
+    if inputParameters.race:
+        with profiler.stage('racing'):
+            existingModels, raceResults = mr.race_models(existingModels, datasetManager, get_accuracy_score, hyperparametersDictionary)
+        mr.print_race_results(modelName, raceResults, 'Accuracy Score')
+
+    # Cross-validate the classifiers, the single split evaluation being only needed for predictions
+    if inputParameters.cvFolds is not None:
+        with profiler.stage('cross-validation'):
+            crossValidationEvaluations, errors = cms.cross_validate_and_sort_models(existingModels, datasetManager, get_accuracy_score, inputParameters.cvFolds, stratified=True,\
+                nbJobs=inputParameters.nbJobs, executorType=inputParameters.executorType, hyperparametersDictionary=hyperparametersDictionary)
+        print_cross_validation_evaluations(crossValidationEvaluations)
+        cms.print_evaluation_errors(modelName, errors)
+
+        if inputParameters.predict is None and inputParameters.predictFile is None and inputParameters.showPredictionsFor is None:
+            return crossValidationEvaluations
 
     # Instantiate the classifiers dictionary
-    classifiersDictionary = cms.instantiate_models(EXISTING_CLASSIFIERS, datasetManager)
+    with profiler.stage('initialization'):
+        classifiersDictionary = cms.instantiate_models(existingModels, datasetManager, hyperparametersDictionary)
 
     # Get the evaluations
-    evaluations = cms.evaluate_and_sort_models(classifiersDictionary.values(), get_accuracy_score)
+    with profiler.stage('evaluation'):
+        evaluationsByModel, errors = cms.evaluate_models(classifiersDictionary, inputParameters.nbJobs, inputParameters.executorType)
+        evaluations = cms.sort_evaluations(evaluationsByModel, get_accuracy_score)
+    profiler.add_models_profiles(classifiersDictionary)
     
     # Print evaluations
-    print_evaluations(evaluations)
+    with profiler.stage('rendering'):
+        print_evaluations(evaluations, profiler.get_evaluations_column(evaluations))
+
+    cms.print_evaluation_errors(modelName, errors)
+
+    # Print the score versus trees curves of the grown forests
+    if inputParameters.growForest:
+        fg.print_growth_curves(modelName, classifiersDictionary, 'Accuracy Score')
+
+    # Print the speedup and the score difference of the classifiers fitted on an approximation of the RBF kernel
+    ak.print_approximations(modelName, classifiersDictionary, 'Accuracy Score')
+
+    # Evaluate the classifiers again on the dataset loaded as float64, for the score drift of the float type
+    if inputParameters.dtypeDriftCheck:
+        with profiler.stage('drift check'):
+            driftRows, driftErrors = dr.check_dtype_drift(existingModels, evaluationsByModel, datasetManager, get_accuracy_score, hyperparametersDictionary, dataset)
+        dr.print_dtype_drift(driftRows, 'Accuracy Score', inputParameters.dtype)
+        cms.print_evaluation_errors(modelName, driftErrors)
+
+    # Print the recall versus latency report of the nearest neighbors indexes
+    if inputParameters.knnRecallReport:
+        nbNeighbors = (hyperparametersDictionary or {}).get('KNNC', {}).get('n_neighbors', ni.DEFAULT_NB_NEIGHBORS)
+        with profiler.stage('neighbors report'):
+            X_train, X_test = datasetManager.get_scaled_independent_variables()[1:]
+            reportRows = ni.get_recall_latency_report(X_train, X_test, nbNeighbors, inputParameters.knnQueryJobs, inputParameters.splitRandomState)
+        ni.print_recall_latency_report(reportRows, nbNeighbors)
+
+    # Store the fitted classifiers
+    if inputParameters.modelStoreDir is not None:
+        with profiler.stage('storing'):
+            ms.save_models(classifiersDictionary, datasetManager)
+
+    with profiler.stage('prediction'):
+        # Predict from users input
+        if inputParameters.predict is not None:
+            predictLambda = lambda classifier : classifier.predict()
+            predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, classifiersDictionary, inputParameters.predictOnly), predictLambda)
+            cms.print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='Predicted ')
+
+        # Predict from users file, by chunks
+        if inputParameters.predictFile is not None:
+            nbPredictedRows = cms.predict_file(modelName, classifiersDictionary, datasetManager, inputParameters.predictOnly)
+            cms.print_predict_file_summary(modelName, nbPredictedRows, inputParameters.predictOutputFile)
+
+        # Display predictions comparison
+        if inputParameters.showPredictionsFor is not None:
+            predictLambda = lambda classifier : classifier.predictions_relevance()
+            predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, classifiersDictionary, inputParameters.showPredictionsFor), predictLambda)
+            cms.print_predictions(datasetManager, predictions, additionalHeaders=[ "Predicted {0}".format(datasetManager.get_dependent_variable_header()) ])
+
+    return crossValidationEvaluations if inputParameters.cvFolds is not None else evaluations
+
+
+
+def print_evaluations(evaluations, profileColumn=None):
+    # Printing evaluations, with the profile of each classifier if any
+    # The counts of a binary classification are detailed, the multi-class ones being summarized by the macro averages of the per-class metrics
+    isBinary = all(evaluation[1].shape == (2, 2) for evaluation in evaluations)
+    if isBinary:
+        headers = ["Classification Model", "Accuracy Score", "Number of True Positives", "Number of False Positives", "Number of True Negatives", "Number of False Negatives", "Number of True Predictions", "Number of False Predictions"]
+    else:
+        headers = ["Classification Model", "Accuracy Score", "Macro Precision", "Macro Recall", "Macro F1 Score", "Number of Classes", "Number of True Predictions", "Number of False Predictions"]
 
-    modelName = 'classifier'
-    # Predict from users input
-    if inputParameters.predict is not None:
-        predictLambda = lambda classifier : classifier.predict()
-        predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, classifiersDictionary, inputParameters.predictOnly), predictLambda)
-        cms.print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='Predicted ')
+    evaluationsToPrint = []
+    for evaluation in evaluations:
+        if isBinary:
+            evaluationsToPrint.append([evaluation[0], "{:.20f}".format(evaluation[2]), str(evaluation[1][0][0]), str(evaluation[1][0][1]), str(evaluation[1][1][1]), str(evaluation[1][1][0]), str(evaluation[1][0][0] + evaluation[1][1][1]), str(evaluation[1][0][1] + evaluation[1][1][0])])
+            continue
 
-    # Display predictions comparison
-    if inputParameters.showPredictionsFor is not None:
-        predictLambda = lambda classifier : classifier.predictions_relevance()
-        predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, classifiersDictionary, inputParameters.showPredictionsFor), predictLambda)
-        cms.print_predictions(datasetManager, predictions, additionalHeaders=[ "Predicted {0}".format(datasetManager.get_dependent_variable_header()) ])
+        metrics = evaluation[3]
+        nbTruePredictions = metrics['truePositives'].sum()
+        evaluationsToPrint.append([evaluation[0], "{:.20f}".format(evaluation[2])] + ["{:.20f}".format(average) for average in cm.get_macro_averages(metrics)]\
+            + [str(len(metrics['labels'])), str(nbTruePredictions), str(metrics['support'].sum() - nbTruePredictions)])
 
+    if profileColumn is not None:
+        headers.append(pr.Profiler.COLUMN_HEADER)
+        evaluationsToPrint = [evaluation + [profile] for evaluation, profile in zip(evaluationsToPrint, profileColumn)]
 
+    evaluationsToPrint.insert(0, headers)
+    orr.print_table(evaluationsToPrint)
 
-def print_evaluations(evaluations):
-    # Printing evaluations
-    evaluationsToPrint = []
-    for evaluation in evaluations:
-        evaluationsToPrint.append([evaluation[0], "{:.20f}".format(evaluation[2]), str(evaluation[1][0][0]), str(evaluation[1][0][1]), str(evaluation[1][1][1]), str(evaluation[1][1][0]), str(evaluation[1][0][0] + evaluation[1][1][1]), str(evaluation[1][0][1] + evaluation[1][1][0])])
 
-    predictionTexttable = cms.get_text_table(8)
-    predictionTexttable.set_max_width(cms.get_console_window_width())
-    evaluationsToPrint.insert(0, ["Classification Model", "Accuracy Score", "Number of True Positives", "Number of False Positives", "Number of True Negatives", "Number of False Negatives", "Number of True Predictions", "Number of False Predictions"])
-    predictionTexttable.add_rows(evaluationsToPrint)
-    print(predictionTexttable.draw())
+
+def print_cross_validation_evaluations(crossValidationEvaluations):
+    # Printing cross-validation evaluations
+    evaluationsToPrint = [[evaluation[0], "{:.20f}".format(evaluation[1]), "{:.20f}".format(evaluation[2])] for evaluation in crossValidationEvaluations]
+
+    evaluationsToPrint.insert(0, ["Classification Model", "Mean Accuracy Score", "Accuracy Score Standard Deviation"])
+    orr.print_table(evaluationsToPrint)
 
 
 
@@ -17,19 +17,28 @@ import models.classifiers.generic_classifier as gc
 #### Main DecisionTreeClassifier class
 class DecisionTreeClassifier(gc.GenericClassifier):
 
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'max_depth': [None, 4, 8, 16], 'min_samples_leaf': [1, 2, 5, 10]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'max_depth': None, 'min_samples_leaf': 1}
+
     def evaluate(self):
         """Applies the Decision Tree Classification model on the dataset.
 
         """
-        self.classifier = skDTC(criterion = 'entropy', random_state = 0)
+        self.classifier = skDTC(criterion = 'entropy', random_state = 0, **self.hyperparameters)
         return self.evaluate_from_classifier('Decision Tree Classification', self.classifier)
 
     def predict(self):
         """Makes some predictions with Decision Tree Classification model.
 
         """
-        predictLambda = lambda valuesToPredict : self.classifier.predict(self.X_scaler.transform(valuesToPredict))
-        return ["Decision Tree Classification predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Decision Tree Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Decision Tree Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
 
 
 
@@ -37,4 +46,4 @@ class DecisionTreeClassifier(gc.GenericClassifier):
         """Returns a comparison table for Decision Tree Classification model.
 
         """
-        return ["Decision Tree Classification predictions comparison", super().truncate_predictions_relevance(self.X_scaler.inverse_transform(self.X_test), self.datasetManager.y_test, self.y_pred)]
+        return ["Decision Tree Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
@@ -7,10 +7,12 @@ It's also implements commons util methods used by classifiers.
 """
 
 #### Libraries
+import numpy as np
 import pandas as pd
-from sklearn.metrics import confusion_matrix, accuracy_score
 import models.common.common_model_selection as cms
+import utils.classification_metrics as cm
 import utils.dataset_manager as dm
+import utils.incremental_metrics as im
 
 
 
@@ -19,13 +21,14 @@ class GenericClassifier(cms.CommonModelSelection):
 
     def __init__(self, datasetManager:dm.DatasetManager):
         """Initialize the current classifier object with the dataset manager.
-        It also do feature scaling on X_train and X_test.
+        It also gets the feature scaled X_train and X_test, shared by all the classifiers (not available for a streamed dataset).
 
         """
         super().__init__(datasetManager)
+        if datasetManager.params.streamingEvaluation:
+            return
         
-        X_scaler, X_train = dm.do_feature_scaling(datasetManager.X_train)
-        X_test = X_scaler.transform(datasetManager.X_test)
+        X_scaler, X_train, X_test = datasetManager.get_scaled_independent_variables()
 
         self.X_train = X_train
         self.X_test = X_test
@@ -36,16 +39,58 @@ class GenericClassifier(cms.CommonModelSelection):
 
         """
         # Training the classifier on the Training set
-        classifier.fit(self.X_train, self.datasetManager.y_train)
+        with self.profile_stage('fit'):
+            classifier.fit(self.X_train, self.datasetManager.y_train)
         
         # Predicting the Test set results
-        self.y_pred = classifier.predict(self.X_test)
+        with self.profile_stage('predict'):
+            self.y_pred = classifier.predict(self.X_test)
         
-        # Returning the process result : the classifier type, the confusion matrix and the accuracy score
+        # Returning the process result : the classifier type, the confusion matrix, the accuracy score and the per-class metrics
         return [classificationName] + self.get_confusion_matrix_and_accuracy_score(self.datasetManager.y_test, self.y_pred)
 
+    def evaluate_streaming_from_classifier(self, classificationName, classifier, nbEpochs=1):
+        """A common method for training the provided classifier by batches of the streamed training set, and evaluating it on the streamed test set.
+        X is incrementally feature scaled, and the confusion matrix is computed incrementally.
+
+        """
+        X_scaler, _, labels = self.datasetManager.get_streamed_statistics(collectLabels=True)
+        self.X_scaler = X_scaler
+
+        # Training the classifier by batches of the Training set, all the labels have to be known from the first batch
+        with self.profile_stage('fit'):
+            for _ in range(nbEpochs):
+                for X, y, rowIndexes, isTestRow in self.datasetManager.read_data_chunks():
+                    if not isTestRow.all():
+                        classifier.partial_fit(X_scaler.transform(X[~isTestRow]), y[~isTestRow], classes=labels)
+
+        # Predicting the Test set results by batches
+        confusionMatrix = im.IncrementalConfusionMatrix(labels)
+        with self.profile_stage('predict'):
+            for X, y, rowIndexes, isTestRow in self.datasetManager.read_data_chunks():
+                if isTestRow.any():
+                    confusionMatrix.update(y[isTestRow], classifier.predict(X_scaler.transform(X[isTestRow])))
+
+        # Returning the process result : the classifier type, the confusion matrix, the accuracy score and the per-class metrics
+        metrics = cm.get_metrics_from_confusion_matrix(confusionMatrix.labels, confusionMatrix.get_confusion_matrix())
+        return [classificationName, metrics['confusionMatrix'], metrics['accuracyScore'], metrics]
+
+    def get_score_confidence_bounds(self, zScore):
+        """Returns the confidence interval bounds of the accuracy score of the last evaluation.
+        Wilson score interval, still meaningful for an accuracy close to 0 or 1 on few test rows.
+
+        """
+        nbTestRows = len(self.datasetManager.y_test)
+        accuracy = np.mean(np.asarray(self.datasetManager.y_test) == np.asarray(self.y_pred))
+        denominator = 1.0 + zScore ** 2 / nbTestRows
+        center = (accuracy + zScore ** 2 / (2 * nbTestRows)) / denominator
+        margin = zScore * np.sqrt(accuracy * (1.0 - accuracy) / nbTestRows + zScore ** 2 / (4 * nbTestRows ** 2)) / denominator
+        return center - margin, center + margin
+
     def get_confusion_matrix_and_accuracy_score(self, y_test:pd.DataFrame, y_pred:pd.DataFrame):
-        """Evaluates a classifier model performance with the y_test and y_pred DataFrame inputs, and returns an array of Confusion Matrix and Accuracy Score.
+        """Evaluates a classifier model performance with the y_test and y_pred DataFrame inputs, and returns an array of Confusion Matrix, Accuracy Score and per-class metrics.
+        All the metrics are computed from one pass over the labels, for any number of classes.
 
         """
-        return [confusion_matrix(y_test, y_pred), accuracy_score(y_test, y_pred)]
+        metrics = cm.get_classification_metrics(y_test, y_pred)
+        return [metrics['confusionMatrix'], metrics['accuracyScore'], metrics]
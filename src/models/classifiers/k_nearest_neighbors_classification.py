@@ -2,6 +2,7 @@
 ~~~~~~~~~~~~~~
 
 An implementation of K Nearest Neighbors Classification.
+The nearest neighbors index is configurable : an exact one of scikit-learn, or an approximate inverted file index built once for all the hyperparameters candidates.
 
 Desirable features :
     - Tune the classifier input parameters for better performance.
@@ -10,6 +11,7 @@ Desirable features :
 
 #### Libraries
 from sklearn.neighbors import KNeighborsClassifier
+import models.common.neighbors_index as ni
 import models.classifiers.generic_classifier as gc
 
 
@@ -17,19 +19,36 @@ import models.classifiers.generic_classifier as gc
 #### Main KNearestNeighborsClassifier class
 class KNearestNeighborsClassifier(gc.GenericClassifier):
 
+    DEFAULT_HYPERPARAMETERS = {'n_neighbors': 5}
+    HYPERPARAMETERS_SPACE = {'n_neighbors': [3, 5, 7, 11, 15], 'weights': ['uniform', 'distance']}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'weights': 'uniform'}
+    RESULT_PARAMETERS = gc.GenericClassifier.RESULT_PARAMETERS + ['knnIndex', 'knnProbedCells']
+
     def evaluate(self):
         """Applies the K Nearest Neighbors Classification model on the dataset.
 
         """
-        self.classifier = KNeighborsClassifier(n_neighbors = 5, metric = 'minkowski', p = 2)
-        return self.evaluate_from_classifier('K Nearest Neighbors Classification', self.classifier)
+        params = self.datasetManager.params
+        if params.knnIndex != 'ivf':
+            self.classifier = KNeighborsClassifier(metric = 'minkowski', p = 2, algorithm = params.knnIndex, n_jobs = params.knnQueryJobs, **self.hyperparameters)
+            return self.evaluate_from_classifier('K Nearest Neighbors Classification', self.classifier)
+
+        # The inverted file of the scaled X_train is shared by all the K Nearest Neighbors classifiers of the dataset manager
+        invertedFile = self.datasetManager.derivedDataCache.get(('inverted_file',), lambda : ni.build_inverted_file(self.X_train, params.splitRandomState))
+        self.classifier = ni.ApproximateKNeighborsClassifier(ni.InvertedFileIndex(*invertedFile), nbProbedCells = params.knnProbedCells, n_jobs = params.knnQueryJobs, **self.hyperparameters)
+        return self.evaluate_from_classifier('K Nearest Neighbors Classification (inverted file index, {0} probed cells)'.format(params.knnProbedCells), self.classifier)
 
     def predict(self):
         """Makes some predictions with K Nearest Neighbors Classification model.
 
         """
-        predictLambda = lambda valuesToPredict : self.classifier.predict(valuesToPredict)
-        return ["K Nearest Neighbors Classification predictions", super().predict_user_input_variables(predictLambda)]
+        return ["K Nearest Neighbors Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by K Nearest Neighbors Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
 
 
 
@@ -37,4 +56,4 @@ class KNearestNeighborsClassifier(gc.GenericClassifier):
         """Returns a comparison table for K Nearest Neighbors Classification model.
 
         """
-        return ["K Nearest Neighbors Classification predictions comparison", super().truncate_predictions_relevance(self.X_test, self.datasetManager.y_test, self.y_pred)]
+        return ["K Nearest Neighbors Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
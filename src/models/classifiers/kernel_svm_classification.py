@@ -9,7 +9,11 @@ Desirable features :
 """
 
 #### Libraries
-from sklearn.svm import SVC
+import time
+import numpy as np
+from sklearn.metrics import accuracy_score
+from sklearn.svm import SVC, LinearSVC
+import models.common.approximate_kernel as ak
 import models.classifiers.generic_classifier as gc
 
 
@@ -17,19 +21,59 @@ import models.classifiers.generic_classifier as gc
 #### Main KernelSvmClassifier class
 class KernelSvmClassifier(gc.GenericClassifier):
 
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'C': [0.1, 1.0, 10.0, 100.0], 'gamma': ['scale', 0.01, 0.1, 1.0]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'C': 1.0, 'gamma': 'scale'}
+    RESULT_PARAMETERS = gc.GenericClassifier.RESULT_PARAMETERS + ['approximateKernelRowThreshold']
+
     def evaluate(self):
         """Applies the Kernel Support Vector Machine Classification model on the dataset.
 
         """
-        self.classifier = SVC(kernel = 'rbf', random_state = 0)
-        return self.evaluate_from_classifier('Kernel Support Vector Machine Classification', self.classifier)
+        # A Nystroem approximation of the kernel is used for a big training set
+        if not ak.is_approximate_kernel_needed(self.datasetManager):
+            self.classifier = SVC(kernel = 'rbf', random_state = 0, **self.hyperparameters)
+            self.approximateDuration = None
+            return self.evaluate_from_classifier('Kernel Support Vector Machine Classification', self.classifier)
+
+        self.classifier = self.get_approximate_classifier()
+        startTime = time.perf_counter()
+        evaluation = self.evaluate_from_classifier('Kernel Support Vector Machine Classification', self.classifier)
+        self.approximateDuration = time.perf_counter() - startTime
+        return evaluation
+
+    def get_approximate_classifier(self):
+        """Returns the classifier fitting a linear SVM on the Nystroem features of the RBF kernel.
+
+        """
+        hyperparameters = dict(self.hyperparameters)
+        gamma = hyperparameters.pop('gamma', 'scale')
+        return ak.get_approximate_kernel_model(LinearSVC(random_state = 0, **hyperparameters), gamma, self.X_train)
+
+    def probe_approximation(self):
+        """Returns the probe of the approximate classifier against the exact Kernel SVM (see 'approximate_kernel.probe_approximation').
+
+        """
+        def compute_probe():
+            y_test = np.asarray(self.datasetManager.y_test).ravel()
+            with self.profile_stage('probe'):
+                return ak.probe_approximation(SVC(kernel = 'rbf', random_state = 0, **self.hyperparameters), self.get_approximate_classifier(), self.X_train,\
+                    np.asarray(self.datasetManager.y_train).ravel(), self.X_test, lambda testPositions, y_pred: accuracy_score(y_test[testPositions], y_pred),\
+                    self.datasetManager.params.splitRandomState)
+
+        return ak.get_approximation_probe(self, compute_probe)
 
     def predict(self):
         """Makes some predictions with Kernel Support Vector Machine Classification model.
 
         """
-        predictLambda = lambda valuesToPredict : self.classifier.predict(self.X_scaler.transform(valuesToPredict))
-        return ["Kernel Support Vector Machine Classification predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Kernel Support Vector Machine Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Kernel Support Vector Machine Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
 
 
 
@@ -37,4 +81,4 @@ class KernelSvmClassifier(gc.GenericClassifier):
         """Returns a comparison table for Kernel Support Vector Machine Classification model.
 
         """
-        return ["Kernel Support Vector Machine Classification predictions comparison", super().truncate_predictions_relevance(self.X_scaler.inverse_transform(self.X_test), self.datasetManager.y_test, self.y_pred)]
+        return ["Kernel Support Vector Machine Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
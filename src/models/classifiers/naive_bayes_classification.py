@@ -2,6 +2,7 @@
 ~~~~~~~~~~~~~~
 
 An implementation of Naive Bayes Classification.
+It can also be trained by batches of a streamed dataset.
 
 Desirable features :
     - Tune the classifier input parameters for better performance (change classifier type ?).
@@ -17,19 +18,37 @@ import models.classifiers.generic_classifier as gc
 #### Main NaiveBayesClassifier class
 class NaiveBayesClassifier(gc.GenericClassifier):
 
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'var_smoothing': [1e-11, 1e-10, 1e-9, 1e-8, 1e-7]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'var_smoothing': 1e-9}
+    SUPPORTS_STREAMING_EVALUATION = True
+
     def evaluate(self):
         """Applies the Naive Bayes Classification model on the dataset.
 
         """
-        self.classifier = GaussianNB()
+        self.classifier = GaussianNB(**self.hyperparameters)
         return self.evaluate_from_classifier('Naive Bayes Classification', self.classifier)
 
+    def evaluate_streaming(self):
+        """Applies the Naive Bayes Classification model on the streamed dataset.
+        The class means and variances are exactly updated, so one pass over the training set is enough.
+
+        """
+        self.classifier = GaussianNB(**self.hyperparameters)
+        return self.evaluate_streaming_from_classifier('Naive Bayes Classification', self.classifier)
+
     def predict(self):
         """Makes some predictions with Naive Bayes Classification model.
 
         """
-        predictLambda = lambda valuesToPredict : self.classifier.predict(self.X_scaler.transform(valuesToPredict))
-        return ["Naive Bayes Classification predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Naive Bayes Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Naive Bayes Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
 
 
 
@@ -37,4 +56,4 @@ class NaiveBayesClassifier(gc.GenericClassifier):
         """Returns a comparison table for Naive Bayes Classification model.
 
         """
-        return ["Naive Bayes Classification predictions comparison", super().truncate_predictions_relevance(self.X_scaler.inverse_transform(self.X_test), self.datasetManager.y_test, self.y_pred)]
+        return ["Naive Bayes Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
@@ -10,6 +10,7 @@ Desirable features :
 
 #### Libraries
 from sklearn.ensemble import RandomForestClassifier as sklRFClassifier
+import models.common.forest_growth as fg
 import models.classifiers.generic_classifier as gc
 
 
@@ -17,19 +18,32 @@ import models.classifiers.generic_classifier as gc
 #### Main RandomForestClassifier class
 class RandomForestClassifier(gc.GenericClassifier):
 
+    DEFAULT_HYPERPARAMETERS = {'n_estimators': 10}
+    HYPERPARAMETERS_SPACE = {'n_estimators': [10, 50, 100, 200], 'max_features': ['sqrt', 0.5, 1.0], 'min_samples_leaf': [1, 2, 5]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'max_features': 'sqrt', 'min_samples_leaf': 1}
+    RESULT_PARAMETERS = gc.GenericClassifier.RESULT_PARAMETERS + ['growForest', 'growForestBlockSize', 'growForestMaxTrees', 'growForestTolerance']
+
     def evaluate(self):
         """Applies the Random Forest Classification model on the dataset.
 
         """
-        self.classifier = sklRFClassifier(n_estimators = 10, criterion = 'entropy', random_state = 0)
+        # Grown by blocks of trees if requested
+        self.classifier = sklRFClassifier(criterion = 'entropy', random_state = 0, **self.hyperparameters)
+        if self.datasetManager.params.growForest:
+            self.classifier = fg.GrowingForest(self.classifier, self.datasetManager.params)
         return self.evaluate_from_classifier('Random Forest Classification', self.classifier)
 
     def predict(self):
         """Makes some predictions with Random Forest Classification model.
 
         """
-        predictLambda = lambda valuesToPredict : self.classifier.predict(self.X_scaler.transform(valuesToPredict))
-        return ["Random Forest Classification predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Random Forest Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Random Forest Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
 
 
 
@@ -37,4 +51,4 @@ class RandomForestClassifier(gc.GenericClassifier):
         """Returns a comparison table for Random Forest Classification model.
 
         """
-        return ["Random Forest Classification predictions comparison", super().truncate_predictions_relevance(self.X_scaler.inverse_transform(self.X_test), self.datasetManager.y_test, self.y_pred)]
+        return ["Random Forest Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
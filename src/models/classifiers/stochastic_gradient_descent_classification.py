@@ -0,0 +1,59 @@
+"""stochastic_gradient_descent_classification.py
+~~~~~~~~~~~~~~
+
+An implementation of Stochastic Gradient Descent Classification, a linear classifier learned by iterative updates.
+It can also be trained by batches of a streamed dataset.
+
+Desirable features :
+    - Tune the classifier input parameters for better performance.
+
+"""
+
+#### Libraries
+from sklearn.linear_model import SGDClassifier
+import models.classifiers.generic_classifier as gc
+
+
+
+#### Main StochasticGradientDescentClassifier class
+class StochasticGradientDescentClassifier(gc.GenericClassifier):
+
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'loss': ['hinge', 'log_loss', 'modified_huber'], 'alpha': [1e-5, 1e-4, 1e-3, 1e-2]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'loss': 'hinge', 'alpha': 1e-4}
+    RESULT_PARAMETERS = gc.GenericClassifier.RESULT_PARAMETERS + ['streamingEpochs']
+    SUPPORTS_STREAMING_EVALUATION = True
+
+    def evaluate(self):
+        """Applies the Stochastic Gradient Descent Classification model on the dataset.
+
+        """
+        self.classifier = SGDClassifier(random_state = 0, **self.hyperparameters)
+        return self.evaluate_from_classifier('Stochastic Gradient Descent Classification', self.classifier)
+
+    def evaluate_streaming(self):
+        """Applies the Stochastic Gradient Descent Classification model on the streamed dataset.
+
+        """
+        self.classifier = SGDClassifier(random_state = 0, **self.hyperparameters)
+        return self.evaluate_streaming_from_classifier('Stochastic Gradient Descent Classification', self.classifier, self.datasetManager.params.streamingEpochs)
+
+    def predict(self):
+        """Makes some predictions with Stochastic Gradient Descent Classification model.
+
+        """
+        return ["Stochastic Gradient Descent Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Stochastic Gradient Descent Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
+
+
+
+    def predictions_relevance(self):
+        """Returns a comparison table for Stochastic Gradient Descent Classification model.
+
+        """
+        return ["Stochastic Gradient Descent Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
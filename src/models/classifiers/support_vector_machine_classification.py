@@ -17,19 +17,28 @@ import models.classifiers.generic_classifier as gc
 #### Main SupportVectorMachineClassifier class
 class SupportVectorMachineClassifier(gc.GenericClassifier):
 
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'C': [0.01, 0.1, 1.0, 10.0, 100.0]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'C': 1.0}
+
     def evaluate(self):
         """Applies the Support Vector Machine Classification model on the dataset.
 
         """
-        self.classifier = SVC(kernel = 'linear', random_state = 0)
+        self.classifier = SVC(kernel = 'linear', random_state = 0, **self.hyperparameters)
         return self.evaluate_from_classifier('Support Vector Machine Classification', self.classifier)
 
     def predict(self):
         """Makes some predictions with Support Vector Machine Classification model.
 
         """
-        predictLambda = lambda valuesToPredict : self.classifier.predict(self.X_scaler.transform(valuesToPredict))
-        return ["Support Vector Machine Classification predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Support Vector Machine Classification predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Support Vector Machine Classification model, for a two dimensions table of independent variables.
+
+        """
+        return self.classifier.predict(self.X_scaler.transform(valuesToPredict))
 
 
 
@@ -37,4 +46,4 @@ class SupportVectorMachineClassifier(gc.GenericClassifier):
         """Returns a comparison table for Support Vector Machine Classification model.
 
         """
-        return ["Support Vector Machine Classification predictions comparison", super().truncate_predictions_relevance(self.X_scaler.inverse_transform(self.X_test), self.datasetManager.y_test, self.y_pred)]
+        return ["Support Vector Machine Classification predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
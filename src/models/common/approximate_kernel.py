@@ -0,0 +1,103 @@
+"""approximate_kernel.py
+~~~~~~~~~~~~~~
+
+An approximation of the RBF kernel models for big training sets, whose exact fitting cost grows quadratically to cubically with the number of rows.
+The RBF kernel is approximated by Nystroem features (the kernel against a random sample of training rows), on which a linear model is fitted.
+A probe fits the exact and the approximate models on the same subsample, to report the score difference of the approximation,
+and the exact model is also fitted on the half of the subsample to extrapolate its duration on the whole training set, for reporting the speedup.
+The probe is only run for the report of the evaluated models, once by dataset manager and hyperparameters.
+
+Desirable features :
+    - Stop probing the exact model once its extrapolated duration is known to be far above the approximate one.
+
+"""
+
+#### Libraries
+import json
+import time
+import numpy as np
+import utils.output_renderer as orr
+
+# Constants
+NB_COMPONENTS = 500
+PROBE_ROWS = 5000
+# Bounds of the growth exponent of the exact model duration with the number of rows, quadratic to cubic in theory
+# (the growth measured on small subsamples being lowered by the fixed costs)
+MIN_GROWTH_EXPONENT = 2.0
+MAX_GROWTH_EXPONENT = 3.0
+
+
+
+def is_approximate_kernel_needed(datasetManager):
+    return len(datasetManager.y_train) > datasetManager.params.approximateKernelRowThreshold
+
+
+
+def get_approximate_kernel_model(linearModel, gamma, X_train):
+    """Returns the pipeline of the Nystroem features of the RBF kernel and of the linear model, to fit on the feature scaled X_train.
+    The gamma follows the scikit-learn kernel models, 'scale' meaning 1 / (number of features * X_train variance).
+
+    """
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.pipeline import make_pipeline
+
+    if gamma == 'scale':
+        gamma = 1.0 / (X_train.shape[1] * X_train.var())
+
+    nbComponents = min(NB_COMPONENTS, len(X_train))
+    return make_pipeline(Nystroem(kernel = 'rbf', gamma = gamma, n_components = nbComponents, random_state = 0), linearModel)
+
+
+
+def probe_approximation(exactModel, approximateModel, X_train, y_train, X_test, predictionsScoreLambda, randomState):
+    """Fits the exact and the approximate models on the same subsample of 'PROBE_ROWS' training rows, and predicts the same subsample of test rows.
+    'predictionsScoreLambda' returns the score of the predictions of the given test rows positions.
+    Returns the probe as a dictionary : the score difference of the approximate model with the exact one, the number of probe rows,
+    and the duration (fitting and predicting) of the exact model on the whole training set, extrapolated from its growth between the half of the probe rows and all of them.
+
+    """
+    randomGenerator = np.random.default_rng(randomState)
+    trainPositions = np.sort(randomGenerator.choice(len(X_train), min(PROBE_ROWS, len(X_train)), replace=False))
+    testPositions = np.sort(randomGenerator.choice(len(X_test), min(PROBE_ROWS, len(X_test)), replace=False))
+    y_train = np.asarray(y_train)
+
+    def fit_and_predict(model, nbTrainingRows):
+        startTime = time.perf_counter()
+        model.fit(X_train[trainPositions[:nbTrainingRows]], y_train[trainPositions[:nbTrainingRows]])
+        y_pred = model.predict(X_test[testPositions])
+        return time.perf_counter() - startTime, predictionsScoreLambda(testPositions, y_pred)
+
+    nbProbeRows = len(trainPositions)
+    halfExactDuration, _ = fit_and_predict(exactModel, max(1, nbProbeRows // 2))
+    exactDuration, exactScore = fit_and_predict(exactModel, nbProbeRows)
+    _, approximateScore = fit_and_predict(approximateModel, nbProbeRows)
+
+    growthExponent = np.clip(np.log2(exactDuration / halfExactDuration), MIN_GROWTH_EXPONENT, MAX_GROWTH_EXPONENT) if halfExactDuration > 0 else MIN_GROWTH_EXPONENT
+    return {'scoreDifference': approximateScore - exactScore, 'nbProbeRows': nbProbeRows,\
+        'estimatedExactDuration': exactDuration * (len(X_train) / nbProbeRows) ** growthExponent}
+
+
+
+def get_approximation_probe(model, probeLambda):
+    """Returns the probe of the approximation of the model, computed through 'probeLambda' once and shared by the models
+    of the same class and hyperparameters on the same dataset manager.
+
+    """
+    key = ('approximation_probe', type(model).__name__, json.dumps(model.hyperparameters, sort_keys=True, default=str))
+    return model.datasetManager.derivedDataCache.get(key, probeLambda)
+
+
+
+def print_approximations(modelName, modelsDictionary, scoreName):
+    # Printing the estimated speedup and the score difference of the models fitted on an approximation of the kernel
+    approximationsToPrint = [["{0} Code".format(modelName.capitalize()), "Estimated Speedup", "{0} Difference".format(scoreName), "Probe Rows"]]
+    for modelCode, model in modelsDictionary.items():
+        approximateDuration = getattr(model, 'approximateDuration', None)
+        if approximateDuration is None:
+            continue
+
+        probe = model.probe_approximation()
+        approximationsToPrint.append([modelCode, "{0:.1f}x".format(probe['estimatedExactDuration'] / approximateDuration), "{:+.4f}".format(probe['scoreDifference']), str(probe['nbProbeRows'])])
+
+    if len(approximationsToPrint) > 1:
+        orr.print_table(approximationsToPrint, "Nystroem approximations of the RBF kernel {0}s".format(modelName))
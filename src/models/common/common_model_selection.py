@@ -8,20 +8,54 @@ It's also implements commons util methods used by regressors and classifiers ; a
 
 #### Libraries
 import numpy as np
+import pandas as pd
 import utils.dataset_manager as dm
-from texttable import Texttable
+import utils.input_parameters as ip
+import utils.output_renderer as orr
+import utils.profiler as pr
+import models.common.result_cache as rc
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import importlib
 import os
+import threading
+
+# Pool of workers shared by the evaluations of several runs (like the batch runs)
+SHARED_EXECUTOR = None
 
 
 
 #### Main CommonModelSelection class
 class CommonModelSelection:
 
+    # Hyperparameters used by default, and the candidate values of each one explored by the hyperparameters search
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {}
+    # Values of the hyperparameters space left to the estimator defaults, recognizing the default hyperparameters among the candidates
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {}
+    # Indicates if the regressor or classifier can be trained by batches, on a streamed dataset
+    SUPPORTS_STREAMING_EVALUATION = False
+    # Input parameters read by the regressor or classifier training, part of the key of its cached results
+    RESULT_PARAMETERS = ['streamingEvaluation', 'chunkSize']
+
     def __init__(self, datasetManager:dm.DatasetManager):
-        """Initialize the current regressor or classifier object with the dataset manager.
+        """Initialize the current regressor or classifier object with the dataset manager, and the default hyperparameters.
 
         """
         self.datasetManager = datasetManager
+        self.hyperparameters = dict(self.DEFAULT_HYPERPARAMETERS)
+        self.profile = pr.new_profile(traceMemory=not datasetManager.params.profileTimesOnly) if datasetManager.params.profile is not None else None
+
+    def set_hyperparameters(self, hyperparameters):
+        """Overrides the default hyperparameters, used on next evaluation.
+
+        """
+        self.hyperparameters = {**self.DEFAULT_HYPERPARAMETERS, **hyperparameters}
+
+    def profile_stage(self, stageName):
+        """Returns a context recording the enclosed code as a stage of the regressor or classifier profile (doing nothing if profiling is disabled).
+
+        """
+        return pr.profile_stage(self.profile, stageName)
 
     def evaluate(self):
         """Trains the regressor or classifier and calculate the R2 score (for regressors) or the  of Confusion Matrix and Accuracy Score (for classifiers).
@@ -31,6 +65,21 @@ class CommonModelSelection:
         """
         raise NotImplementedError
 
+    def evaluate_streaming(self):
+        """Trains the regressor or classifier by batches of the streamed training set, and evaluates it on the streamed test set.
+        Defines the 'evaluate_streaming' method that each regressor or classifier supporting the streaming evaluation will have to implement.
+        Returns the same result as the 'evaluate' method.
+
+        """
+        raise NotImplementedError
+
+    def get_score_confidence_bounds(self, zScore):
+        """Returns the lower and upper bounds of the confidence interval of the last evaluation score, for the normal distribution 'zScore'.
+        Defines the 'get_score_confidence_bounds' method that generic regressor and classifier will have to implement.
+
+        """
+        raise NotImplementedError
+
     def predict(self):
         """Predicts dependent variables, from users command line input independent variables table.
         Defines the 'predict' method that each regressor or classifier will have to implement.
@@ -39,6 +88,14 @@ class CommonModelSelection:
         """
         raise NotImplementedError
 
+    def predict_values(self, valuesToPredict):
+        """Predicts dependent variables, from a two dimensions table of independent variables.
+        Defines the 'predict_values' method that each regressor or classifier will have to implement, used for all kinds of predictions.
+        Returns the one dimension table of predicted dependent variables.
+
+        """
+        raise NotImplementedError
+
     def predictions_relevance(self):
         """Returns a comparison table for predicted values et real values of test set.
         Defines the 'predictions_relevance' method that each regressor or classifier will have to implement.
@@ -53,7 +110,7 @@ class CommonModelSelection:
 
         """
         userInputVariables = self.get_user_input_for_prediction()
-        return self.reshape_y_pred_and_concatenate(userInputVariables, predictLambda(userInputVariables))
+        return get_predictions_table([userInputVariables, predictLambda(userInputVariables)])
 
     def get_user_input_for_prediction(self):
         """Checks and returns the user predefined independent variables table for prediction.
@@ -63,57 +120,295 @@ class CommonModelSelection:
         if valuesToPredict is None:
             raise AttributeError
 
-        X_train = self.datasetManager.X_train
-        if X_train is None:
-            raise LookupError("The model was not yet be evaluated at the moment")
-
-        independentVariablesNumber = len(X_train[0])
+        independentVariablesNumber = self.datasetManager.get_nb_independent_variables()
         for oneSetToPredict in valuesToPredict:
             if independentVariablesNumber != len(oneSetToPredict):
                 raise AttributeError("Invalid independent variables set to predict : {0}, expected {1} elements".format(oneSetToPredict, independentVariablesNumber))
         
-        return valuesToPredict
-
-    def reshape_y_pred_and_concatenate(self, firstTable, secondTable):
-        """Reshapes the secondTable table (from one dimension to two) and concatenates it with the 'firstTable' table.
-
-        """
-        return np.concatenate((firstTable, np.reshape(secondTable, (len(secondTable), 1))) ,1)
-
-    def get_new_truncated_list(self, inputList, nbFirstElementsToKeep):
-        """Truncates and returns a new list containing the 'nbFirstElementsToKeep' elements.
-
-        """
-        return inputList.copy()[:nbFirstElementsToKeep]
+        return np.asarray(valuesToPredict)
 
     def truncate_predictions_relevance(self, X_test, y_test, y_pred):
             """Returns a truncated comparison table.
+            The sets are sliced before being copied, so only the rows to display are copied.
 
             """
             nbPredictionLinesToShow = self.datasetManager.params.nbPredictionLinesToShow
-            return self.reshape_y_pred_and_concatenate(self.reshape_y_pred_and_concatenate\
-                (self.get_new_truncated_list(X_test, nbPredictionLinesToShow), self.get_new_truncated_list(y_test, nbPredictionLinesToShow)),\
-                    self.get_new_truncated_list(y_pred, nbPredictionLinesToShow))
+            return get_predictions_table([X_test[:nbPredictionLinesToShow], y_test[:nbPredictionLinesToShow], y_pred[:nbPredictionLinesToShow]])
 
 
+def import_models(modelsPathsDictionary, modelsCodes=None):
+    """Imports the classes of the given models codes (all of them if None), from the dictionary of their dotted paths.
+    Returns the dictionary of the models classes by model code, only the modules of these models being imported.
 
-def instantiate_models(modelsDictionary, datasetManager):
+    """
+    if modelsCodes is None:
+        modelsCodes = get_dictionary_codes(modelsPathsDictionary)
+
+    return {modelCode: import_model_class(modelsPathsDictionary[modelCode]) for modelCode in modelsCodes}
+
+
+
+def import_model_class(modelClassPath):
+    moduleName, className = modelClassPath.rsplit('.', 1)
+    return getattr(importlib.import_module(moduleName), className)
+
+
+
+def instantiate_models(modelsDictionary, datasetManager, hyperparametersDictionary=None):
     models = {}
     for modelDefinition in modelsDictionary.items():
-        models[modelDefinition[0]] = modelDefinition[1](datasetManager)
+        # The initialization (like the shared feature scaling) is profiled before the model and its profile exist
+        initializationProfile = pr.new_profile(traceMemory=not datasetManager.params.profileTimesOnly) if datasetManager.params.profile is not None else None
+        with pr.profile_stage(initializationProfile, 'initialization'):
+            models[modelDefinition[0]] = modelDefinition[1](datasetManager)
+        if initializationProfile is not None:
+            models[modelDefinition[0]].profile['stages'].update(initializationProfile['stages'])
+        if hyperparametersDictionary is not None and modelDefinition[0] in hyperparametersDictionary:
+            models[modelDefinition[0]].set_hyperparameters(hyperparametersDictionary[modelDefinition[0]])
     return models
 
 
 
-def evaluate_and_sort_models(models, sortLambda):
-    # Training the models
-    evaluations = []
-    for model in models:
-        evaluations.append(model.evaluate())
+def evaluate_and_sort_models(modelsDictionary, sortLambda, nbJobs=ip.DEFAULT_NB_JOBS, executorType=ip.DEFAULT_EXECUTOR_TYPE):
+    """Trains all the models of the dictionary, one after another or at the same time depending of the executor type.
+    Returns the evaluations descendent sorted by the predefined function, and a dictionary of errors by model code (the failing models being removed from the dictionary).
+
+    """
+    evaluationsByModel, errors = evaluate_models(modelsDictionary, nbJobs, executorType)
+    return sort_evaluations(evaluationsByModel, sortLambda), errors
+
 
+
+def sort_evaluations(evaluationsByModel, sortLambda):
     # Descendent sorting of evaluations by predefined function
-    evaluations.sort(key=sortLambda, reverse=True)
-    return evaluations
+    return sorted(evaluationsByModel.values(), key=sortLambda, reverse=True)
+
+
+
+def evaluate_models(modelsDictionary, nbJobs=ip.DEFAULT_NB_JOBS, executorType=ip.DEFAULT_EXECUTOR_TYPE):
+    """Trains all the models of the dictionary, one after another or at the same time depending of the executor type.
+    A failing model doesn't stop the others : it is removed from the dictionary and its error is returned apart.
+    Returns a dictionary of evaluations by model code (in the dictionary order), and a dictionary of errors by model code.
+
+    """
+    modelsCodes = get_dictionary_codes(modelsDictionary)
+    models = [modelsDictionary[modelCode] for modelCode in modelsCodes]
+    executorType = get_executor_type(nbJobs, executorType)
+
+    # Loading the results of the models whose inputs didn't change since a previous run, only the other models are trained
+    isResultCacheEnabled = len(models) > 0 and models[0].datasetManager.params.resultCacheDir is not None
+    cachedResults = {}
+    if isResultCacheEnabled:
+        for modelCode, model in zip(modelsCodes, models):
+            evaluation = rc.load_result(model)
+            if evaluation is not None:
+                cachedResults[modelCode] = (model, evaluation, None)
+        if cachedResults:
+            orr.print_message("Results of {0} loaded from the result cache".format(", ".join(cachedResults.keys())))
+    modelsToTrain = [model for modelCode, model in zip(modelsCodes, models) if modelCode not in cachedResults]
+
+    # Training the models, on the shared pool if any
+    if executorType == 'serial' or not modelsToTrain:
+        trainedResults = [evaluate_model(model) for model in modelsToTrain]
+    elif SHARED_EXECUTOR is not None:
+        trainedResults = evaluate_models_on_executor(SHARED_EXECUTOR, modelsToTrain)
+    else:
+        executorClass = ThreadPoolExecutor if executorType == 'thread' else ProcessPoolExecutor
+        with executorClass(max_workers=get_nb_workers(nbJobs, len(modelsToTrain))) as executor:
+            trainedResults = evaluate_models_on_executor(executor, modelsToTrain)
+
+    trainedResults = iter(trainedResults)
+    results = [cachedResults[modelCode] if modelCode in cachedResults else next(trainedResults) for modelCode in modelsCodes]
+
+    evaluations = {}
+    errors = {}
+    for modelCode, model, result in zip(modelsCodes, models, results):
+        evaluatedModel, evaluation, error = result
+        if error is not None:
+            errors[modelCode] = error
+            del modelsDictionary[modelCode]
+            continue
+
+        # A model coming back from another process holds a copy of the dataset manager, the shared one is restored
+        evaluatedModel.datasetManager = model.datasetManager
+        modelsDictionary[modelCode] = evaluatedModel
+        evaluations[modelCode] = evaluation
+        if isResultCacheEnabled and modelCode not in cachedResults:
+            rc.save_result(evaluatedModel, evaluation)
+
+    if isResultCacheEnabled:
+        rc.evict_least_recently_used(models[0].datasetManager.params)
+
+    return evaluations, errors
+
+
+
+def evaluate_models_on_executor(executor, models):
+    """Trains the models on the executor, one task by model.
+    Returns the result of each model (see 'evaluate_model'), the error of a task that failed outside of the model evaluation
+    (like a model that can't be sent to another process, or a broken pool of processes) being the error of its model.
+
+    """
+    futures = []
+    for model in models:
+        try:
+            futures.append(executor.submit(evaluate_model, model))
+        except Exception as error:
+            futures.append(error)
+
+    results = []
+    for model, future in zip(models, futures):
+        error = future if isinstance(future, Exception) else future.exception()
+        results.append(future.result() if error is None else (model, None, "{0}: {1}".format(type(error).__name__, error)))
+    return results
+
+
+
+def set_shared_executor(executor):
+    """Sets the pool of workers used by the next evaluations, instead of a new pool by evaluation (None for a new pool again).
+
+    """
+    global SHARED_EXECUTOR
+    SHARED_EXECUTOR = executor
+
+
+
+def cross_validate_and_sort_models(modelsClassesDictionary, datasetManager, scoreLambda, nbFolds, stratified=False, nbJobs=ip.DEFAULT_NB_JOBS, executorType=ip.DEFAULT_EXECUTOR_TYPE,\
+    hyperparametersDictionary=None):
+    """Evaluates each model class on each of the K folds of the whole dataset, the model x fold grid being trained serially or at the same time.
+    The folds positions are computed once and shared : with a process pool, they are sent once to each worker with the dataset manager.
+    The tasks are ordered fold by fold, so that the dataset manager of a fold is built once and shared by the models of the fold.
+    Returns the evaluations [model name, mean score, score standard deviation] descendent sorted by mean score, and a dictionary of errors by model code.
+
+    """
+    folds = datasetManager.get_folds(nbFolds, stratified)
+    crossValidationContext = (modelsClassesDictionary, datasetManager, folds, hyperparametersDictionary or {})
+    tasks = [(modelCode, foldIndex) for foldIndex in range(nbFolds) for modelCode in modelsClassesDictionary]
+    executorType = get_executor_type(nbJobs, executorType)
+
+    # Training the models on each fold
+    if executorType == 'process':
+        with ProcessPoolExecutor(max_workers=get_nb_workers(nbJobs, len(tasks)), initializer=set_cross_validation_context, initargs=crossValidationContext) as executor:
+            results = list(executor.map(evaluate_model_on_fold, tasks))
+    else:
+        set_cross_validation_context(*crossValidationContext)
+        if executorType == 'thread':
+            with ThreadPoolExecutor(max_workers=get_nb_workers(nbJobs, len(tasks))) as executor:
+                results = list(executor.map(evaluate_model_on_fold, tasks))
+        else:
+            results = [evaluate_model_on_fold(task) for task in tasks]
+
+    # Gathering the scores of each model, a model failing on one fold is in error
+    modelsNames = {}
+    modelsScores = {modelCode: [] for modelCode in modelsClassesDictionary}
+    errors = {}
+    for (modelCode, foldIndex), (evaluation, error) in zip(tasks, results):
+        if error is not None:
+            errors.setdefault(modelCode, "Fold {0}, {1}".format(foldIndex + 1, error))
+            continue
+
+        modelsNames[modelCode] = evaluation[0]
+        modelsScores[modelCode].append(scoreLambda(evaluation))
+
+    evaluations = [[modelsNames[modelCode], np.mean(scores), np.std(scores)] for modelCode, scores in modelsScores.items() if modelCode not in errors]
+    evaluations.sort(key=lambda evaluation : evaluation[1], reverse=True)
+    return evaluations, errors
+
+
+
+# Models classes, dataset manager, folds and models hyperparameters of the running cross-validation, defined once by process
+CROSS_VALIDATION_CONTEXT = None
+# Fold index and dataset manager of the last fold evaluated by the process, shared by the models of the fold
+FOLD_DATASET_MANAGER = (None, None)
+FOLD_DATASET_MANAGER_LOCK = threading.Lock()
+
+def set_cross_validation_context(modelsClassesDictionary, datasetManager, folds, hyperparametersDictionary):
+    global CROSS_VALIDATION_CONTEXT, FOLD_DATASET_MANAGER
+    CROSS_VALIDATION_CONTEXT = (modelsClassesDictionary, datasetManager, folds, hyperparametersDictionary)
+    FOLD_DATASET_MANAGER = (None, None)
+
+
+
+def get_fold_dataset_manager(foldIndex):
+    """Returns the dataset manager of the fold of the running cross-validation, built once for all the models of the fold.
+    As the tasks are started fold by fold, only the last fold one is kept, the models of the previous folds holding theirs.
+
+    """
+    global FOLD_DATASET_MANAGER
+    with FOLD_DATASET_MANAGER_LOCK:
+        if FOLD_DATASET_MANAGER[0] != foldIndex:
+            _, datasetManager, folds, _ = CROSS_VALIDATION_CONTEXT
+            trainPositions, testPositions = folds[foldIndex]
+            FOLD_DATASET_MANAGER = (foldIndex, datasetManager.get_subset_dataset_manager(trainPositions, testPositions))
+        return FOLD_DATASET_MANAGER[1]
+
+
+
+def evaluate_model_on_fold(task):
+    """Trains one model class on one fold of the running cross-validation.
+    Returns its evaluation and its error message.
+
+    """
+    modelCode, foldIndex = task
+    modelsClassesDictionary, _, _, hyperparametersDictionary = CROSS_VALIDATION_CONTEXT
+    try:
+        model = modelsClassesDictionary[modelCode](get_fold_dataset_manager(foldIndex))
+        model.set_hyperparameters(hyperparametersDictionary.get(modelCode, {}))
+    except Exception as error:
+        return None, "{0}: {1}".format(type(error).__name__, error)
+
+    _, evaluation, error = evaluate_model(model)
+    return evaluation, error
+
+
+
+def evaluate_model(model):
+    """Trains one model and catches its possible error.
+    Returns the evaluated model (needed when it was trained in another process), its evaluation and its error message.
+
+    """
+    try:
+        with model.profile_stage('evaluation'):
+            evaluation = model.evaluate_streaming() if model.datasetManager.params.streamingEvaluation else model.evaluate()
+        if model.profile is not None:
+            model.profile['name'] = evaluation[0]
+        return model, evaluation, None
+    except Exception as error:
+        return model, None, "{0}: {1}".format(type(error).__name__, error)
+
+
+
+def get_streamable_models(modelsDictionary):
+    """Returns the dictionary of the models that can be trained by batches, on a streamed dataset.
+
+    """
+    return {modelCode: modelClass for modelCode, modelClass in modelsDictionary.items() if modelClass.SUPPORTS_STREAMING_EVALUATION}
+
+
+
+def get_executor_type(nbJobs, executorType):
+    if executorType is not None:
+        return executorType
+
+    return 'serial' if nbJobs == 1 else 'process'
+
+
+
+def get_nb_workers(nbJobs, nbTasks):
+    if nbJobs is None or nbJobs <= 0:
+        nbJobs = os.cpu_count() or 1
+
+    return max(1, min(nbJobs, nbTasks))
+
+
+
+def print_evaluation_errors(modelName, errors):
+    # Printing the errors of the models that failed during the training
+    if not errors:
+        return
+
+    errorsToPrint = [["{0} Code".format(modelName.capitalize()), "Error"]] + [[modelCode, error] for modelCode, error in errors.items()]
+    orr.print_table(errorsToPrint, "{0}s in error".format(modelName.capitalize()))
 
 
 
@@ -128,16 +423,63 @@ def predict_from_lambda(models, predictLambda):
 def print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='', additionalHeaders=None):
     # Printing predictions
     for prediction in predictions:
-        print("\n{0}".format(prediction[0]))
-        predictionTexttable = get_text_table(len(prediction[1][0]))
-        predictionTexttable.set_max_width(get_console_window_width())
-        predictionTexttable.add_rows(datasetManager.insert_header_to_top(str_all_bidimensional_list_elements(prediction[1]), appendToDependentVariablesHeader, additionalHeaders))
-        print(predictionTexttable.draw())
+        orr.print_table(datasetManager.insert_header_to_top(str_all_bidimensional_list_elements(prediction[1]), appendToDependentVariablesHeader, additionalHeaders), prediction[0])
+
+
+
+def predict_file(modelName, modelsDictionary, datasetManager, codesOfDesiredModels):
+    """Predicts the '-predictFile' rows with the desired models (all of them if None), one chunk after another,
+    and appends the predictions of each chunk to the '-predictOutputFile' CSV file (a column by model), so the memory stays flat.
+    Returns the number of predicted rows.
+
+    """
+    models = get_models_for_prediction(modelName, modelsDictionary, codesOfDesiredModels)
+    modelsCodes = codesOfDesiredModels if codesOfDesiredModels is not None else get_dictionary_codes(modelsDictionary)
+    headers = ["{0} ({1})".format(datasetManager.get_dependent_variable_header('Predicted '), modelCode) for modelCode in modelsCodes]
+
+    nbPredictedRows = 0
+    with open(datasetManager.params.predictOutputFile, 'w', newline='') as predictOutputFile:
+        for valuesToPredict in datasetManager.read_prediction_chunks():
+            predictions = pd.DataFrame({header: model.predict_values(valuesToPredict) for header, model in zip(headers, models)})
+            predictions.to_csv(predictOutputFile, header=nbPredictedRows == 0, index=False)
+            nbPredictedRows += len(valuesToPredict)
+
+        # An empty file still gets its header
+        if nbPredictedRows == 0:
+            pd.DataFrame(columns=headers).to_csv(predictOutputFile, index=False)
+
+    return nbPredictedRows
+
+
+
+def print_predict_file_summary(modelName, nbPredictedRows, predictOutputFile):
+    orr.print_message("\n{0} rows predicted by each {1}, written into {2}".format(nbPredictedRows, modelName, predictOutputFile))
+
+
+
+def get_predictions_table(tables):
+    """Returns a single two dimensions table, filled in place with the columns of the tables (two dimensions ones, or one dimension ones as a single column).
+    The result is allocated once, with a common type of all the tables (object for mixed numbers and texts).
+
+    """
+    tables = [table.reshape(len(table), 1) if table.ndim == 1 else table for table in map(np.asarray, tables)]
+    try:
+        dtype = np.result_type(*tables)
+    except TypeError:
+        dtype = object
+
+    predictionsTable = np.empty((len(tables[0]), sum(table.shape[1] for table in tables)), dtype=dtype)
+    firstColumn = 0
+    for table in tables:
+        predictionsTable[:, firstColumn:firstColumn + table.shape[1]] = table
+        firstColumn += table.shape[1]
+
+    return predictionsTable
 
 
 
 def str_all_bidimensional_list_elements(oneDimensionalList):
-    return [[str(element) for element in elements] for elements in oneDimensionalList]
+    return np.asarray(oneDimensionalList).astype(str).tolist()
 
 
 
@@ -160,18 +502,3 @@ def get_models_for_prediction(modelName, modelsDictionary, codesOfDesiredModels)
 
     return models
 
-
-
-def get_text_table(nbColumn):
-    result = Texttable()
-    result.set_max_width(get_console_window_width())
-    result.set_cols_align(['c'] * nbColumn)
-    result.set_cols_valign(['m'] * nbColumn)
-    result.set_cols_dtype(['t'] * nbColumn)
-    return result
-
-
-
-def get_console_window_width():
-    rows, columns = os.popen('stty size', 'r').read().split()
-    return int(columns)
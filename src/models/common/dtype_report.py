@@ -0,0 +1,56 @@
+"""dtype_report.py
+~~~~~~~~~~~~~~
+
+The report of the '-dtype' float type : the memory of the dataset, compared to float64,
+and the score drift of each regressor or classifier, evaluated again on the dataset loaded as float64.
+
+Desirable features :
+    - Report the memory of the scaled and expanded sets too.
+
+"""
+
+#### Libraries
+import copy
+import models.common.common_model_selection as cms
+import utils.dataset_manager as dm
+import utils.output_renderer as orr
+import utils.profiler as pr
+
+
+
+def print_memory_usage(datasetManager):
+    # Printing the memory of X and y in the '-dtype' float type, and the memory saved compared to float64
+    nbBytes, nbFloat64Bytes = datasetManager.get_memory_usage()
+    savedProportion = 1.0 - nbBytes / nbFloat64Bytes if nbFloat64Bytes > 0 else 0.0
+    orr.print_message("Dataset loaded as {0} : {1:.1f} MB instead of {2:.1f} MB as float64 ({3:.0%} saved)".format(datasetManager.params.dtype,\
+        nbBytes / pr.BYTES_PER_MEGABYTE, nbFloat64Bytes / pr.BYTES_PER_MEGABYTE, savedProportion))
+
+
+
+def check_dtype_drift(modelsClassesDictionary, evaluationsByModel, datasetManager, scoreLambda, hyperparametersDictionary=None, dataset=None):
+    """Evaluates again the models of the evaluations (by model code) on the dataset loaded as float64, with the same hyperparameters.
+    Returns the rows of the drift : the model code, the score in the '-dtype' float type and the float64 score ; and a dictionary of errors by model code.
+
+    """
+    float64Params = copy.copy(datasetManager.params)
+    float64Params.dtype = 'float64'
+    float64DatasetManager = dm.DatasetManager(float64Params)
+    float64DatasetManager.load_data(dataset)
+    float64DatasetManager.split_data()
+
+    modelsDictionary = cms.instantiate_models({modelCode: modelClass for modelCode, modelClass in modelsClassesDictionary.items() if modelCode in evaluationsByModel},\
+        float64DatasetManager, hyperparametersDictionary)
+    float64EvaluationsByModel, errors = cms.evaluate_models(modelsDictionary, float64Params.nbJobs, float64Params.executorType)
+
+    driftRows = [[modelCode, scoreLambda(evaluation), scoreLambda(float64EvaluationsByModel[modelCode])] for modelCode, evaluation in evaluationsByModel.items() if modelCode in float64EvaluationsByModel]
+    return driftRows, errors
+
+
+
+def print_dtype_drift(driftRows, scoreName, dtype):
+    # Printing the score of each model in the float type and in float64, and their difference
+    driftRowsToPrint = [["Model", "{0} ({1})".format(scoreName, dtype), "{0} (float64)".format(scoreName), "Drift"]]
+    for modelCode, score, float64Score in driftRows:
+        driftRowsToPrint.append([modelCode, "{:.20f}".format(score), "{:.20f}".format(float64Score), "{:+.3e}".format(score - float64Score)])
+
+    orr.print_table(driftRowsToPrint, "Score drift of {0} compared to float64".format(dtype))
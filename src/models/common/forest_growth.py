@@ -0,0 +1,80 @@
+"""forest_growth.py
+~~~~~~~~~~~~~~
+
+A growth of the random forests by blocks of trees, instead of fitting a new forest for each number of trees.
+The trees are added to the forest with warm start, and the out-of-bag score is computed after each block.
+The growth stops once the score plateaus, and the whole score versus trees curve is reported.
+
+Desirable features :
+    - Score on a hold-out set when the forest doesn't use bootstrap samples (no out-of-bag rows).
+
+"""
+
+#### Libraries
+import warnings
+import utils.output_renderer as orr
+
+# Constants
+# Number of the last blocks of trees that must improve the best score, otherwise the score plateaus
+PLATEAU_BLOCKS = 3
+
+
+
+#### Main GrowingForest class
+class GrowingForest:
+
+    def __init__(self, forest, params):
+        """Initialize the growth of the scikit-learn forest, from the '-growForest' input parameters.
+        The number of trees of the forest is decided by the growth, so its 'n_estimators' is ignored.
+
+        """
+        self.forest = forest
+        self.blockSize = params.growForestBlockSize
+        self.maxTrees = params.growForestMaxTrees
+        self.tolerance = params.growForestTolerance
+        self.growthCurve = []
+
+    def fit(self, X, y):
+        """Adds blocks of trees to the forest until its out-of-bag score plateaus or it reaches the maximum number of trees.
+
+        """
+        self.forest.set_params(warm_start = True, oob_score = True, bootstrap = True)
+        self.growthCurve = []
+
+        nbTrees = 0
+        while nbTrees < self.maxTrees and not self.is_plateau():
+            nbTrees = min(nbTrees + self.blockSize, self.maxTrees)
+            self.forest.set_params(n_estimators = nbTrees)
+
+            # Until every row has been left out of bag by a tree, the out-of-bag score is biased (scikit-learn warns about it), so it isn't kept
+            with warnings.catch_warnings(record=True) as caughtWarnings:
+                warnings.simplefilter('always', UserWarning)
+                self.forest.fit(X, y)
+            isScored = not any(issubclass(caughtWarning.category, UserWarning) and 'OOB' in str(caughtWarning.message) for caughtWarning in caughtWarnings)
+            self.growthCurve.append((nbTrees, self.forest.oob_score_ if isScored else None))
+
+        return self
+
+    def is_plateau(self):
+        scores = [score for _, score in self.growthCurve if score is not None]
+        if len(scores) <= PLATEAU_BLOCKS:
+            return False
+
+        return max(scores[-PLATEAU_BLOCKS:]) - max(scores[:-PLATEAU_BLOCKS]) < self.tolerance
+
+    def predict(self, X):
+        return self.forest.predict(X)
+
+
+
+def print_growth_curves(modelName, modelsDictionary, scoreName):
+    # Printing the out-of-bag score versus trees curve of each grown forest
+    for modelCode, model in modelsDictionary.items():
+        growingForest = getattr(model, modelName, None)
+        if not isinstance(growingForest, GrowingForest) or not growingForest.growthCurve:
+            continue
+
+        nbTrees = growingForest.growthCurve[-1][0]
+        stopReason = "maximum number of trees" if nbTrees >= growingForest.maxTrees else "out-of-bag score plateau"
+        growthCurveToPrint = [["Number of Trees", "Out-of-Bag {0}".format(scoreName)]] + [[str(nbTrees), "{:.20f}".format(score) if score is not None else "not scored (rows never out of bag)"] for nbTrees, score in growingForest.growthCurve]
+        orr.print_table(growthCurveToPrint, "{0} growth curve, grown to {1} trees ({2})".format(modelCode, nbTrees, stopReason))
@@ -0,0 +1,211 @@
+"""hyperparameters_search.py
+~~~~~~~~~~~~~~
+
+An automatic search of the best hyperparameters of each regressor or classifier, through successive halving.
+The candidates are drawn from the hyperparameters space declared by each model class, the default hyperparameters being always one of them.
+At first, all the candidates are trained on a small part of the training set ; after each rung, only the best 1 / 'reductionFactor' of them
+go on with 'reductionFactor' times more training rows, until the last one trained on the whole training set.
+Candidates are scored on a validation part of the training set, the test set being kept for the final evaluation.
+The trainings of a rung run at the same time through the executor, and no more training is launched once the time budget is spent.
+A rung is not launched either if its duration, estimated from the previous rung, goes beyond the time budget.
+The best candidate is only adopted once scored after a training on the whole training set, otherwise the default hyperparameters are kept.
+A training running when the budget is spent can't be interrupted : its result is dropped, but it is waited for,
+so that the search may overrun its time budget by the duration of the longest training.
+
+Desirable features :
+    - Use the number of trees as budget for the forests.
+    - Hyperband : several successive halving brackets, with different initial budgets.
+
+"""
+
+#### Libraries
+import numpy as np
+import itertools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+import models.common.common_model_selection as cms
+import utils.output_renderer as orr
+
+# Constants
+VALIDATION_SIZE = 0.2
+MIN_TRAINING_ROWS = 30
+
+
+
+def search_best_hyperparameters(modelsClassesDictionary, datasetManager, scoreLambda):
+    """Searches the best hyperparameters of each model class declaring a hyperparameters space, within the time budget of the input parameters.
+    The time left is shared between the models still to tune.
+    Returns a dictionary by model code of the search results : best hyperparameters, validation score, number of trainings, last rung training rows,
+    number of failed trainings and last error.
+
+    """
+    params = datasetManager.params
+    tunableModelsClasses = {modelCode: modelClass for modelCode, modelClass in modelsClassesDictionary.items() if modelClass.HYPERPARAMETERS_SPACE}
+    deadline = time.monotonic() + params.tuneTimeBudget
+
+    # The training set is split once into the rows for training the candidates and the ones for scoring them
+    randomGenerator = np.random.RandomState(params.splitRandomState)
+    searchContext = (tunableModelsClasses, datasetManager, *split_validation_positions(len(datasetManager.y_train), randomGenerator))
+
+    executorType = cms.get_executor_type(params.nbJobs, params.executorType)
+    nbWorkers = cms.get_nb_workers(params.nbJobs, params.tuneCandidates)
+    if executorType == 'process':
+        executor = ProcessPoolExecutor(max_workers=nbWorkers, initializer=set_search_context, initargs=searchContext)
+    else:
+        set_search_context(*searchContext)
+        executor = ThreadPoolExecutor(max_workers=nbWorkers) if executorType == 'thread' else None
+        nbWorkers = nbWorkers if executor is not None else 1
+
+    searchResults = {}
+    try:
+        for modelIndex, (modelCode, modelClass) in enumerate(tunableModelsClasses.items()):
+            modelDeadline = time.monotonic() + (deadline - time.monotonic()) / (len(tunableModelsClasses) - modelIndex)
+            searchResults[modelCode] = successive_halving(modelCode, modelClass, executor, nbWorkers, scoreLambda, len(searchContext[2]), modelDeadline, randomGenerator, params)
+    finally:
+        # The trainings still running can't be stopped, and are waited for
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return searchResults
+
+
+
+def split_validation_positions(nbTrainingRows, randomGenerator):
+    """Shuffles the positions of the training set, and splits them into the positions for training and the ones for validation (about 'VALIDATION_SIZE' of them).
+
+    """
+    positions = randomGenerator.permutation(nbTrainingRows)
+    nbValidationRows = max(1, int(nbTrainingRows * VALIDATION_SIZE))
+    return positions[nbValidationRows:], positions[:nbValidationRows]
+
+
+
+def successive_halving(modelCode, modelClass, executor, nbWorkers, scoreLambda, nbTrainingRows, deadline, randomGenerator, params):
+    """Runs the successive halving rungs of one model class, until only one candidate is left or the deadline is reached.
+    Returns the search result of the model : the best candidate of the last completed rung if trained on all the training rows, else the default hyperparameters.
+
+    """
+    candidates = draw_candidates(modelClass, params.tuneCandidates, randomGenerator)
+    reductionFactor = params.tuneReductionFactor
+    nbRungs = 1 + int(math.log(len(candidates), reductionFactor)) if len(candidates) > 1 else 1
+    searchResult = {'hyperparameters': {}, 'score': None, 'nbTrainings': 0, 'rung': 0, 'nbRungs': nbRungs, 'nbTrainingRows': 0, 'nbErrors': 0, 'lastError': None}
+
+    estimatedRungTime = 0.0
+    for rung in range(nbRungs):
+        if time.monotonic() + estimatedRungTime >= deadline:
+            break
+
+        nbRungTrainingRows = min(nbTrainingRows, max(MIN_TRAINING_ROWS, int(nbTrainingRows / reductionFactor ** (nbRungs - 1 - rung))))
+        rungStartTime = time.monotonic()
+        evaluations, errors = evaluate_candidates(executor, [(modelCode, candidate, nbRungTrainingRows) for candidate in candidates], deadline)
+        searchResult['nbTrainings'] += sum(evaluation is not None for evaluation in evaluations)
+        searchResult['nbErrors'] += len(errors)
+        searchResult['lastError'] = errors[-1] if errors else searchResult['lastError']
+
+        # Descendent sorting of the candidates by score, the failed or not finished ones being dropped
+        rankedCandidates = sorted([(scoreLambda(evaluation), candidateIndex) for candidateIndex, evaluation in enumerate(evaluations) if evaluation is not None],\
+            key=lambda rankedCandidate : rankedCandidate[0], reverse=True)
+        if not rankedCandidates:
+            break
+
+        # A candidate ranked on a part of the training rows only is not trusted over the default hyperparameters
+        bestScore, bestCandidateIndex = rankedCandidates[0]
+        searchResult.update({'rung': rung + 1, 'nbTrainingRows': nbRungTrainingRows})
+        if nbRungTrainingRows == nbTrainingRows:
+            searchResult.update({'hyperparameters': candidates[bestCandidateIndex], 'score': bestScore})
+        nbNextCandidates = max(1, math.ceil(len(candidates) / reductionFactor))
+
+        # The next rung duration grows with its training rows, and with its number of candidates by worker
+        nextRungTrainingRows = min(nbTrainingRows, max(MIN_TRAINING_ROWS, int(nbTrainingRows / reductionFactor ** max(0, nbRungs - 2 - rung))))
+        estimatedRungTime = (time.monotonic() - rungStartTime) * nextRungTrainingRows / nbRungTrainingRows\
+            * math.ceil(nbNextCandidates / nbWorkers) / math.ceil(len(candidates) / nbWorkers)
+        candidates = [candidates[candidateIndex] for _, candidateIndex in rankedCandidates[:nbNextCandidates]]
+
+    return searchResult
+
+
+
+def draw_candidates(modelClass, nbCandidates, randomGenerator):
+    """Returns the candidates hyperparameters of the model class : the whole grid of its hyperparameters space if small enough, else a random draw.
+    The default hyperparameters (an empty dictionary) are always the first candidate, and are not drawn again from the grid.
+
+    """
+    names = sorted(modelClass.HYPERPARAMETERS_SPACE)
+    defaultHyperparameters = {**modelClass.ESTIMATOR_DEFAULT_HYPERPARAMETERS, **modelClass.DEFAULT_HYPERPARAMETERS}
+    defaultValues = tuple(defaultHyperparameters[name] for name in names) if set(names) <= set(defaultHyperparameters) else None
+    grid = [values for values in itertools.product(*[modelClass.HYPERPARAMETERS_SPACE[name] for name in names]) if values != defaultValues]
+    if len(grid) > nbCandidates - 1:
+        grid = [grid[gridIndex] for gridIndex in randomGenerator.choice(len(grid), max(0, nbCandidates - 1), replace=False)]
+
+    return [{}] + [dict(zip(names, values)) for values in grid]
+
+
+
+def evaluate_candidates(executor, tasks, deadline):
+    """Trains the candidates of a rung through the executor (or one after another without executor), until the deadline.
+    Returns the evaluation of each candidate, None for the failed or not finished ones, and the errors of the failed ones.
+    The trainings not started at the deadline are cancelled, the running ones going on until their end.
+
+    """
+    if executor is None:
+        results = [evaluate_candidate(task) if time.monotonic() < deadline else (None, None) for task in tasks]
+    else:
+        futures = [executor.submit(evaluate_candidate, task) for task in tasks]
+        wait(futures, timeout=max(0, deadline - time.monotonic()))
+        results = []
+        for future in futures:
+            if not future.done():
+                future.cancel()
+                results.append((None, None))
+            elif future.exception() is not None:
+                # Like a broken pool of processes
+                results.append((None, "{0}: {1}".format(type(future.exception()).__name__, future.exception())))
+            else:
+                results.append(future.result())
+
+    return [evaluation for evaluation, _ in results], [error for _, error in results if error is not None]
+
+
+
+# Models classes, dataset manager, training and validation positions of the running search, defined once by process
+SEARCH_CONTEXT = None
+
+def set_search_context(modelsClassesDictionary, datasetManager, trainingPositions, validationPositions):
+    global SEARCH_CONTEXT
+    SEARCH_CONTEXT = (modelsClassesDictionary, datasetManager, trainingPositions, validationPositions)
+
+
+
+def evaluate_candidate(task):
+    """Trains one candidate on the first 'nbTrainingRows' training positions, and evaluates it on the validation positions.
+    Returns its evaluation and None, or None and the error if it failed (like too few rows for the candidate).
+
+    """
+    modelCode, hyperparameters, nbTrainingRows = task
+    modelsClassesDictionary, datasetManager, trainingPositions, validationPositions = SEARCH_CONTEXT
+    try:
+        model = modelsClassesDictionary[modelCode](datasetManager.get_subset_dataset_manager(trainingPositions[:nbTrainingRows], validationPositions))
+        model.set_hyperparameters(hyperparameters)
+        return model.evaluate(), None
+    except Exception as error:
+        return None, "{0}: {1}".format(type(error).__name__, error)
+
+
+
+def get_best_hyperparameters(searchResults):
+    return {modelCode: searchResult['hyperparameters'] for modelCode, searchResult in searchResults.items()}
+
+
+
+def print_search_results(modelName, searchResults, scoreName):
+    # Printing the best hyperparameters found for each model
+    searchResultsToPrint = [["{0} Code".format(modelName.capitalize()), "Best Hyperparameters", "Validation {0}".format(scoreName), "Number of Trainings", "Last Rung",\
+        "Last Rung Training Rows", "Number of Failed Trainings", "Last Error"]]
+    for modelCode, searchResult in searchResults.items():
+        hyperparameters = ", ".join("{0}={1}".format(name, value) for name, value in searchResult['hyperparameters'].items()) or "default"
+        score = "{:.20f}".format(searchResult['score']) if searchResult['score'] is not None else "not evaluated on all the training rows"
+        searchResultsToPrint.append([modelCode, hyperparameters, score, str(searchResult['nbTrainings']), "{0} / {1}".format(searchResult['rung'], searchResult['nbRungs']),\
+            str(searchResult['nbTrainingRows']), str(searchResult['nbErrors']), searchResult['lastError'] or ""])
+
+    orr.print_table(searchResultsToPrint)
@@ -0,0 +1,77 @@
+"""incremental_least_squares.py
+~~~~~~~~~~~~~~
+
+An ordinary least squares linear regression learned by batches, through the accumulation of the normal equations (X'X and X'y).
+It gives the coefficients of a linear regression fitted on all the batches at once, without ever holding them together.
+Its memory only depends on the number of features, which makes it usable for streamed datasets and big design matrices.
+
+Desirable features :
+    - Add an optional ridge penalty for ill-conditioned normal equations.
+
+"""
+
+#### Libraries
+import numpy as np
+
+
+
+#### Main IncrementalLinearRegression class
+class IncrementalLinearRegression:
+
+    def __init__(self, fit_intercept=True):
+        """Initialize empty normal equations, following the scikit-learn estimators naming.
+
+        """
+        self.fit_intercept = fit_intercept
+        self.reset()
+
+    def reset(self):
+        self.XtX = None
+        self.Xty = None
+        self.n_samples_seen_ = 0
+        self.coef_ = None
+        self.intercept_ = 0.0
+
+    def partial_fit(self, X, y):
+        """Accumulates the batch into the normal equations, the coefficients are solved again on next prediction.
+
+        """
+        X = self.add_intercept_column(np.asarray(X, dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64).ravel()
+
+        if self.XtX is None:
+            self.XtX = np.zeros((X.shape[1], X.shape[1]))
+            self.Xty = np.zeros(X.shape[1])
+
+        self.XtX += X.T @ X
+        self.Xty += X.T @ y
+        self.n_samples_seen_ += len(X)
+        self.coef_ = None
+        return self
+
+    def fit(self, X, y):
+        self.reset()
+        return self.partial_fit(X, y)
+
+    def predict(self, X):
+        if self.coef_ is None:
+            self.solve()
+
+        return np.asarray(X) @ self.coef_ + self.intercept_
+
+    def solve(self):
+        """Solves the accumulated normal equations (least squares solution, so also defined for singular ones).
+
+        """
+        if self.XtX is None:
+            raise LookupError("The incremental linear regression was not yet be fitted at the moment")
+
+        coefficients = np.linalg.lstsq(self.XtX, self.Xty, rcond=None)[0]
+        self.coef_ = coefficients[1:] if self.fit_intercept else coefficients
+        self.intercept_ = coefficients[0] if self.fit_intercept else 0.0
+
+    def add_intercept_column(self, X):
+        if not self.fit_intercept:
+            return X
+
+        return np.hstack((np.ones((len(X), 1)), X))
@@ -0,0 +1,74 @@
+"""models_racing.py
+~~~~~~~~~~~~~~
+
+A racing of the regressors or classifiers, to avoid the full training of the hopeless ones.
+All the models are trained on growing subsamples of the training set, and scored on a validation part of it.
+After each rung, a model whose score confidence interval upper bound falls below the leader lower bound is dropped.
+Only the survivors are then trained on the whole training set.
+
+Desirable features :
+    - Take the learning curve slope into account, a slow starter may still catch up the leader.
+
+"""
+
+#### Libraries
+import numpy as np
+from statistics import NormalDist
+import models.common.common_model_selection as cms
+import models.common.hyperparameters_search as hs
+import utils.output_renderer as orr
+
+
+
+def race_models(modelsClassesDictionary, datasetManager, scoreLambda, hyperparametersDictionary=None):
+    """Races the models classes on 'raceRungs' subsamples of the training set, doubling at each rung up to the half of its training part.
+    Returns the dictionary of the surviving models classes, and the race results by model code.
+
+    """
+    params = datasetManager.params
+    zScore = NormalDist().inv_cdf(0.5 + params.raceConfidence / 2)
+
+    # The training set is split once into the rows for training the models and the ones for scoring them
+    trainingPositions, validationPositions = hs.split_validation_positions(len(datasetManager.y_train), np.random.RandomState(params.splitRandomState))
+
+    survivors = dict(modelsClassesDictionary)
+    raceResults = {modelCode: {'status': 'kept', 'nbTrainingRows': 0, 'score': None, 'bounds': None} for modelCode in modelsClassesDictionary}
+    for rung in range(params.raceRungs):
+        nbTrainingRows = min(len(trainingPositions), max(hs.MIN_TRAINING_ROWS, len(trainingPositions) // 2 ** (params.raceRungs - rung)))
+        subsetDatasetManager = datasetManager.get_subset_dataset_manager(trainingPositions[:nbTrainingRows], validationPositions)
+        modelsDictionary = cms.instantiate_models(survivors, subsetDatasetManager, hyperparametersDictionary)
+        evaluations, errors = cms.evaluate_models(modelsDictionary, params.nbJobs, params.executorType)
+
+        for modelCode, error in errors.items():
+            raceResults[modelCode].update({'status': 'dropped ({0})'.format(error), 'nbTrainingRows': nbTrainingRows})
+            del survivors[modelCode]
+
+        if not evaluations:
+            break
+
+        for modelCode, model in modelsDictionary.items():
+            raceResults[modelCode].update({'nbTrainingRows': nbTrainingRows, 'score': scoreLambda(evaluations[modelCode]), 'bounds': model.get_score_confidence_bounds(zScore)})
+
+        # Dropping the models that can't reach the leader, whose lower bound is the best one
+        leaderLowerBound = max(raceResults[modelCode]['bounds'][0] for modelCode in modelsDictionary)
+        for modelCode in modelsDictionary:
+            if raceResults[modelCode]['bounds'][1] < leaderLowerBound:
+                raceResults[modelCode]['status'] = 'dropped'
+                del survivors[modelCode]
+
+        if len(survivors) <= 1:
+            break
+
+    return survivors, raceResults
+
+
+
+def print_race_results(modelName, raceResults, scoreName):
+    # Printing the race results of each model
+    raceResultsToPrint = [["{0} Code".format(modelName.capitalize()), "Status", "Last Training Rows", "Validation {0}".format(scoreName), "Confidence Interval"]]
+    for modelCode, raceResult in raceResults.items():
+        score = "{:.20f}".format(raceResult['score']) if raceResult['score'] is not None else "not evaluated"
+        bounds = "[{:.6f}, {:.6f}]".format(*raceResult['bounds']) if raceResult['bounds'] is not None else ""
+        raceResultsToPrint.append([modelCode, raceResult['status'], str(raceResult['nbTrainingRows']), score, bounds])
+
+    orr.print_table(raceResultsToPrint)
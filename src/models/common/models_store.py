@@ -0,0 +1,130 @@
+"""models_store.py
+~~~~~~~~~~~~~~
+
+A store of the fitted regressors or classifiers, for predicting without training them again.
+Each fitted model is serialized with its scalers or transformers (like 'X_scaler', 'y_scaler' or 'poly_reg') and its hyperparameters,
+but without the dataset manager and the training or test sets.
+The stored models are grouped by the fingerprint of the content of the training and test sets, and each one is keyed by its configuration :
+its class, its hyperparameters and the input parameters read by its training. So the tuned models never replace the default ones.
+The hyperparameters of the last tuned run are also stored, for predicting with the tuned models (-tune parameter).
+On prediction, only the requested models are loaded.
+
+"""
+
+#### Libraries
+import hashlib
+import json
+import os
+import pickle
+import models.common.common_model_selection as cms
+import models.common.result_cache as rc
+import utils.atomic_files as af
+
+# Constants
+MODEL_FILE_EXTENSION = '.pkl'
+TUNED_HYPERPARAMETERS_FILE_NAME = 'tuned_hyperparameters.json'
+# Model attributes not stored : the dataset manager is given back on loading, the sets are only needed for the evaluation
+TRANSIENT_ATTRIBUTES = ['datasetManager', 'X_train', 'X_test', 'y_pred']
+
+
+
+def get_store_directory(datasetManager):
+    return os.path.join(datasetManager.params.modelStoreDir, rc.get_dataset_fingerprint(datasetManager))
+
+
+
+def get_model_file_path(datasetManager, modelCode, modelClass, hyperparameters):
+    """Returns the file path of a stored model, keyed by its code and its configuration.
+
+    """
+    modelKey = hashlib.sha256(rc.get_model_configuration(modelClass, hyperparameters, datasetManager.params).encode('utf-8')).hexdigest()
+    return os.path.join(get_store_directory(datasetManager), "{0}-{1}{2}".format(modelCode, modelKey, MODEL_FILE_EXTENSION))
+
+
+
+def get_tuned_hyperparameters(datasetManager):
+    """Returns the dictionary by model code of the hyperparameters of the last tuned run, empty if none was stored.
+
+    """
+    tunedHyperparametersFilePath = os.path.join(get_store_directory(datasetManager), TUNED_HYPERPARAMETERS_FILE_NAME)
+    if not os.path.isfile(tunedHyperparametersFilePath):
+        return {}
+
+    with open(tunedHyperparametersFilePath, 'r') as tunedHyperparametersFile:
+        return json.load(tunedHyperparametersFile)
+
+
+
+def get_stored_hyperparameters(datasetManager, modelCode, modelClass):
+    """Returns the hyperparameters of the stored model to predict with : the tuned ones with the -tune parameter (if any), the default ones otherwise.
+
+    """
+    tunedHyperparameters = get_tuned_hyperparameters(datasetManager).get(modelCode) if datasetManager.params.tune else None
+    return tunedHyperparameters if tunedHyperparameters is not None else dict(modelClass.DEFAULT_HYPERPARAMETERS)
+
+
+
+def save_models(modelsDictionary, datasetManager):
+    """Writes each fitted model of the dictionary into the store, and their hyperparameters if tuned.
+
+    """
+    storeDirectory = get_store_directory(datasetManager)
+    os.makedirs(storeDirectory, exist_ok=True)
+    for modelCode, model in modelsDictionary.items():
+        modelState = {attributeName: value for attributeName, value in model.__dict__.items() if attributeName not in TRANSIENT_ATTRIBUTES}
+        af.write_file(get_model_file_path(datasetManager, modelCode, type(model), model.hyperparameters),\
+            lambda modelFile: pickle.dump((type(model), modelState), modelFile, protocol=pickle.HIGHEST_PROTOCOL))
+
+    if datasetManager.params.tune:
+        tunedHyperparameters = {**get_tuned_hyperparameters(datasetManager), **{modelCode: model.hyperparameters for modelCode, model in modelsDictionary.items()}}
+        af.write_file(os.path.join(storeDirectory, TUNED_HYPERPARAMETERS_FILE_NAME),\
+            lambda tunedHyperparametersFile: json.dump(tunedHyperparameters, tunedHyperparametersFile, default=str), 'w')
+
+
+
+def get_stored_models_codes(modelsPathsDictionary, datasetManager):
+    """Returns the codes of the models stored for the dataset, with the hyperparameters to predict with.
+
+    """
+    modelsCodes = []
+    for modelCode, modelClass in cms.import_models(modelsPathsDictionary).items():
+        if os.path.isfile(get_model_file_path(datasetManager, modelCode, modelClass, get_stored_hyperparameters(datasetManager, modelCode, modelClass))):
+            modelsCodes.append(modelCode)
+
+    return modelsCodes
+
+
+
+def load_models(modelName, modelsPathsDictionary, datasetManager, codesOfDesiredModels):
+    """Loads the desired models from the store (all the stored ones if None), attached to the dataset manager.
+    Returns the dictionary of the loaded models by model code.
+
+    """
+    if codesOfDesiredModels is None:
+        codesOfDesiredModels = get_stored_models_codes(modelsPathsDictionary, datasetManager)
+        if not codesOfDesiredModels:
+            raise LookupError("No stored {0} for this dataset and these parameters, train them first with the -modelStoreDir parameter".format(modelName))
+
+    models = {}
+    for modelCode in codesOfDesiredModels:
+        if modelCode not in modelsPathsDictionary:
+            raise AttributeError("Invalid {0} code for prediction : '{1}', expected codes {2}".format(modelName, modelCode, list(modelsPathsDictionary.keys())))
+
+        models[modelCode] = load_model(modelName, modelCode, cms.import_model_class(modelsPathsDictionary[modelCode]), datasetManager)
+
+    return models
+
+
+
+def load_model(modelName, modelCode, modelClass, datasetManager):
+    modelFilePath = get_model_file_path(datasetManager, modelCode, modelClass, get_stored_hyperparameters(datasetManager, modelCode, modelClass))
+    if not os.path.isfile(modelFilePath):
+        raise LookupError("No stored {0} '{1}' for this dataset and these parameters, train it first with the -modelStoreDir parameter".format(modelName, modelCode))
+
+    with open(modelFilePath, 'rb') as modelFile:
+        modelClass, modelState = pickle.load(modelFile)
+
+    model = modelClass.__new__(modelClass)
+    model.__dict__.update(modelState)
+    model.datasetManager = datasetManager
+    return model
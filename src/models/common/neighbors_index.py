@@ -0,0 +1,230 @@
+"""neighbors_index.py
+~~~~~~~~~~~~~~
+
+The nearest neighbors indexes of the K Nearest Neighbors classifier, and their recall versus latency report.
+Besides the exact indexes of scikit-learn (KD-tree, ball tree and brute force), an approximate inverted file index is available :
+the training rows are quantized into cells by k-means, and a query only searches the rows of the cells of its nearest centroids.
+The queries are run by batches, in parallel threads (the distances computations releasing the GIL).
+The index keeps the float type of the training rows, a float32 training set giving a float32 index.
+
+Desirable features :
+    - Compress the rows of the cells by product quantization, for indexes bigger than the memory.
+
+"""
+
+#### Libraries
+from concurrent.futures import ThreadPoolExecutor
+import time
+import numpy as np
+import models.common.common_model_selection as cms
+import utils.dataset_manager as dm
+import utils.output_renderer as orr
+
+# Constants
+DEFAULT_NB_NEIGHBORS = 5
+QUERY_BATCH_SIZE = 1024
+# Rows sampled by cell for learning the centroids of the inverted file
+CENTROIDS_TRAINING_ROWS_PER_CELL = 64
+EXACT_INDEX_TYPES = ['kd_tree', 'ball_tree', 'brute']
+REPORT_QUERY_ROWS = 2000
+REPORT_PROBED_CELLS = [1, 2, 4, 8, 16, 32, 64]
+# Tolerance of the distances comparison, for the rounding errors of the distances computations (in float64, and in float32)
+RECALL_TOLERANCE = 1e-6
+FLOAT32_RECALL_TOLERANCE = 1e-3
+
+
+
+def build_inverted_file(X_train, randomState=0):
+    """Quantizes the rows of X_train into about sqrt(number of rows) cells.
+    Returns the centroids of the cells, the rows sorted by cell, their positions in X_train, and the start of each cell in the sorted rows.
+
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    X_train = np.asarray(X_train, dtype=dm.get_computation_dtype(X_train))
+    nbCells = max(1, int(np.sqrt(len(X_train))))
+    sampledPositions = np.random.default_rng(randomState).permutation(len(X_train))[:nbCells * CENTROIDS_TRAINING_ROWS_PER_CELL]
+    kMeans = MiniBatchKMeans(n_clusters = nbCells, n_init = 3, random_state = randomState).fit(X_train[sampledPositions])
+
+    cells = kMeans.predict(X_train)
+    positions = np.argsort(cells, kind='stable')
+    cellsStarts = np.concatenate(([0], np.cumsum(np.bincount(cells, minlength=nbCells))))
+    return kMeans.cluster_centers_, X_train[positions], positions, cellsStarts
+
+
+
+def get_squared_distances(X, rows, rowsSquaredNorms):
+    return np.maximum((X * X).sum(axis=1)[:, np.newaxis] - 2 * X @ rows.T + rowsSquaredNorms[np.newaxis, :], 0)
+
+
+
+def query_by_batches(kneighborsLambda, X, nbJobs):
+    """Returns the distances and the positions of the neighbors found by 'kneighborsLambda' for the rows of X, queried by batches in 'nbJobs' threads.
+
+    """
+    batches = [X[start:start + QUERY_BATCH_SIZE] for start in range(0, len(X), QUERY_BATCH_SIZE)]
+    nbWorkers = cms.get_nb_workers(nbJobs, len(batches))
+    if nbWorkers == 1:
+        results = [kneighborsLambda(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=nbWorkers) as executor:
+            results = list(executor.map(kneighborsLambda, batches))
+
+    return np.concatenate([distances for distances, _ in results]), np.concatenate([positions for _, positions in results])
+
+
+
+def get_recall(distances, exactDistances):
+    """Returns the mean proportion of the neighbors found among the exact nearest ones, by query.
+    The neighbors are compared by distance, any neighbor as near as the farthest exact one being right (the neighbors at the same distance being interchangeable).
+
+    """
+    tolerance = FLOAT32_RECALL_TOLERANCE if distances.dtype == np.float32 else RECALL_TOLERANCE
+    return (distances <= exactDistances[:, -1:] + tolerance * (1 + exactDistances[:, -1:])).mean()
+
+
+
+#### Main InvertedFileIndex class
+class InvertedFileIndex:
+
+    def __init__(self, centroids, sortedRows, positions, cellsStarts):
+        """Initialize the index from an inverted file built by 'build_inverted_file'.
+
+        """
+        self.centroids = centroids
+        self.sortedRows = sortedRows
+        self.positions = positions
+        self.cellsStarts = cellsStarts
+        self.centroidsSquaredNorms = (centroids * centroids).sum(axis=1)
+        self.rowsSquaredNorms = (sortedRows * sortedRows).sum(axis=1)
+
+    def get_nb_cells(self):
+        return len(self.centroids)
+
+    def kneighbors(self, X, nbNeighbors, nbProbedCells):
+        """Returns the distances and the positions in X_train of the approximate nearest neighbors of the rows of X, sorted by distance.
+        Only the rows of the 'nbProbedCells' cells of the nearest centroids are searched, the missing neighbors having an infinite distance and a -1 position.
+
+        """
+        X = np.asarray(X, dtype=self.sortedRows.dtype)
+        nbProbedCells = min(nbProbedCells, self.get_nb_cells())
+        centroidsDistances = get_squared_distances(X, self.centroids, self.centroidsSquaredNorms)
+        probedCells = np.argpartition(centroidsDistances, nbProbedCells - 1, axis=1)[:, :nbProbedCells]
+
+        # The queries are grouped by probed cell, each cell being searched once for all its queries
+        queriesRows = np.repeat(np.arange(len(X)), nbProbedCells)
+        cells = probedCells.ravel()
+        order = np.argsort(cells, kind='stable')
+        cells, queriesRows = cells[order], queriesRows[order]
+        groupsStarts = np.flatnonzero(np.diff(cells, prepend=-1))
+
+        bestDistances = np.full((len(X), nbNeighbors), np.inf, dtype=X.dtype)
+        bestPositions = np.full((len(X), nbNeighbors), -1)
+        for groupStart, groupStop in zip(groupsStarts, np.append(groupsStarts[1:], len(cells))):
+            cellStart, cellStop = self.cellsStarts[cells[groupStart]], self.cellsStarts[cells[groupStart] + 1]
+            if cellStart == cellStop:
+                continue
+
+            rows = queriesRows[groupStart:groupStop]
+            distances = np.hstack((bestDistances[rows], get_squared_distances(X[rows], self.sortedRows[cellStart:cellStop], self.rowsSquaredNorms[cellStart:cellStop])))
+            positions = np.hstack((bestPositions[rows], np.broadcast_to(np.arange(cellStart, cellStop), (len(rows), cellStop - cellStart))))
+            nearest = np.argpartition(distances, nbNeighbors - 1, axis=1)[:, :nbNeighbors]
+            bestDistances[rows] = np.take_along_axis(distances, nearest, axis=1)
+            bestPositions[rows] = np.take_along_axis(positions, nearest, axis=1)
+
+        order = np.argsort(bestDistances, axis=1)
+        bestDistances = np.take_along_axis(bestDistances, order, axis=1)
+        bestPositions = np.take_along_axis(bestPositions, order, axis=1)
+        return np.sqrt(bestDistances), np.where(bestPositions >= 0, self.positions[bestPositions], -1)
+
+
+
+#### Main ApproximateKNeighborsClassifier class
+class ApproximateKNeighborsClassifier:
+
+    def __init__(self, invertedFileIndex, n_neighbors=5, weights='uniform', nbProbedCells=8, n_jobs=1):
+        """Initialize the classifier on an inverted file index of the training rows, following the scikit-learn estimators naming.
+
+        """
+        self.invertedFileIndex = invertedFileIndex
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.nbProbedCells = nbProbedCells
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y):
+        """Keeps the labels of the training rows, X being the rows the inverted file index was built on.
+
+        """
+        self.classes_, self.labelsPositions = np.unique(np.asarray(y).ravel(), return_inverse=True)
+        return self
+
+    def kneighbors(self, X):
+        return query_by_batches(lambda batch : self.invertedFileIndex.kneighbors(batch, self.n_neighbors, self.nbProbedCells), np.asarray(X, dtype=self.invertedFileIndex.sortedRows.dtype), self.n_jobs)
+
+    def predict(self, X):
+        """Returns the label of the weighted majority of the neighbors of each row, the smallest label on ties (like scikit-learn).
+
+        """
+        distances, positions = self.kneighbors(X)
+        weights = self.get_neighbors_weights(distances)
+
+        votes = np.zeros((len(positions), len(self.classes_)))
+        np.add.at(votes, (np.repeat(np.arange(len(positions)), positions.shape[1]), self.labelsPositions[positions].ravel()), weights.ravel())
+        return self.classes_[votes.argmax(axis=1)]
+
+    def get_neighbors_weights(self, distances):
+        """Returns the vote weights of the neighbors, a missing neighbor not voting.
+        With 'distance' weights, the neighbors at a null distance are the only ones voting.
+
+        """
+        if self.weights == 'uniform':
+            return np.isfinite(distances).astype(np.float64)
+
+        with np.errstate(divide='ignore'):
+            weights = 1.0 / distances
+        isInfiniteWeight = np.isinf(weights)
+        hasInfiniteWeight = isInfiniteWeight.any(axis=1)
+        weights[hasInfiniteWeight] = isInfiniteWeight[hasInfiniteWeight]
+        return weights
+
+
+
+def get_recall_latency_report(X_train, X_test, nbNeighbors, nbJobs, randomState=0):
+    """Queries a sample of X_test with each index type, and the inverted file index with growing numbers of probed cells.
+    Returns the rows of the report : the index type, the probed cells, the build time, the query latency per row (in seconds) and the recall of the exact neighbors.
+
+    """
+    from sklearn.neighbors import NearestNeighbors
+    X_train = np.asarray(X_train, dtype=dm.get_computation_dtype(X_train))
+    queries = np.asarray(X_test, dtype=X_train.dtype)[np.random.default_rng(randomState).permutation(len(X_test))[:REPORT_QUERY_ROWS]]
+    exactDistances = NearestNeighbors(n_neighbors = nbNeighbors, algorithm = 'brute').fit(X_train).kneighbors(queries)[0]
+
+    reportRows = []
+    for indexType in EXACT_INDEX_TYPES:
+        startTime = time.perf_counter()
+        index = NearestNeighbors(n_neighbors = nbNeighbors, algorithm = indexType).fit(X_train)
+        buildTime = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        distances = query_by_batches(index.kneighbors, queries, nbJobs)[0]
+        reportRows.append([indexType, '', buildTime, (time.perf_counter() - startTime) / len(queries), get_recall(distances, exactDistances)])
+
+    startTime = time.perf_counter()
+    invertedFileIndex = InvertedFileIndex(*build_inverted_file(X_train, randomState))
+    buildTime = time.perf_counter() - startTime
+    for nbProbedCells in [nbProbedCells for nbProbedCells in REPORT_PROBED_CELLS if nbProbedCells <= invertedFileIndex.get_nb_cells()]:
+        startTime = time.perf_counter()
+        distances = query_by_batches(lambda batch : invertedFileIndex.kneighbors(batch, nbNeighbors, nbProbedCells), queries, nbJobs)[0]
+        reportRows.append(['ivf', "{0} / {1}".format(nbProbedCells, invertedFileIndex.get_nb_cells()), buildTime, (time.perf_counter() - startTime) / len(queries), get_recall(distances, exactDistances)])
+
+    return reportRows
+
+
+
+def print_recall_latency_report(reportRows, nbNeighbors):
+    # Printing the recall and the latency of each index
+    reportRowsToPrint = [["Neighbors Index", "Probed Cells", "Build Time (s)", "Latency per 1000 Rows (ms)", "Recall of the {0} Nearest Neighbors".format(nbNeighbors)]]
+    for indexType, probedCells, buildTime, latency, recall in reportRows:
+        reportRowsToPrint.append([indexType, probedCells, "{:.3f}".format(buildTime), "{:.3f}".format(latency * 1000 * 1000), "{:.4f}".format(recall)])
+
+    orr.print_table(reportRowsToPrint)
@@ -0,0 +1,137 @@
+"""result_cache.py
+~~~~~~~~~~~~~~
+
+An on-disk cache of the evaluations of the regressors or classifiers, so that a run only trains the models whose inputs changed since a previous run.
+Each result is keyed by a fingerprint of the content of the training and test sets, and by the configuration of the model :
+its class, its hyperparameters, the input parameters read by its training ('RESULT_PARAMETERS'), and the versions of the numerical libraries.
+A result holds the evaluation (score, confusion matrix ...) and the fitted model with its predictions of the test set, for the predictions of the run.
+The cache size is bounded, the least recently used results being evicted.
+
+Desirable features :
+    - Cache the cross-validation folds evaluations.
+
+"""
+
+#### Libraries
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+import utils.atomic_files as af
+import utils.dataset_cache as dc
+import utils.profiler as pr
+
+# Constants
+RESULT_FILE_EXTENSION = '.pkl'
+# Model attributes not cached : the dataset manager is given back on loading, and the profile is the one of the current run
+TRANSIENT_ATTRIBUTES = ['datasetManager', 'profile', 'X_train', 'X_test']
+
+
+
+def get_dataset_fingerprint(datasetManager):
+    """Returns a hash of the content of the training and test sets, computed once and shared by all the models of the dataset manager.
+    A streamed dataset isn't held in memory : the key of its dataset cache entry (the dataset file state and the loading and split input parameters) is used instead.
+
+    """
+    def compute_fingerprint():
+        if datasetManager.params.streamingEvaluation:
+            return dc.get_cache_key(datasetManager.params)
+
+        datasetHash = hashlib.sha256()
+        for values in [datasetManager.X_train, datasetManager.X_test, datasetManager.y_train, datasetManager.y_test]:
+            values = np.ascontiguousarray(values)
+            datasetHash.update("{0}{1}".format(values.dtype.str, values.shape).encode('utf-8'))
+            # Text values have no fixed size bytes representation
+            datasetHash.update(pickle.dumps(values.tolist()) if values.dtype == object else values.data)
+
+        return datasetHash.hexdigest()
+
+    return datasetManager.derivedDataCache.get(('fingerprint',), compute_fingerprint)
+
+
+
+def get_model_configuration(modelClass, hyperparameters, params):
+    """Returns the configuration of a model as a JSON string : its class, its hyperparameters, the input parameters read by its training and the numerical libraries versions.
+
+    """
+    import sklearn
+
+    modelConfiguration = {
+        'model': "{0}.{1}".format(modelClass.__module__, modelClass.__qualname__),
+        'hyperparameters': hyperparameters,
+        'parameters': {name: getattr(params, name) for name in modelClass.RESULT_PARAMETERS},
+        'versions': [np.__version__, sklearn.__version__]
+    }
+    return json.dumps(modelConfiguration, sort_keys=True, default=str)
+
+
+
+def get_result_key(model):
+    """Returns the key of the result of the model, from the dataset fingerprint and the configuration of the model.
+
+    """
+    keyElements = [get_dataset_fingerprint(model.datasetManager), get_model_configuration(type(model), model.hyperparameters, model.datasetManager.params)]
+    return hashlib.sha256(json.dumps(keyElements).encode('utf-8')).hexdigest()
+
+
+
+def get_result_file_path(model):
+    return os.path.join(model.datasetManager.params.resultCacheDir, get_result_key(model) + RESULT_FILE_EXTENSION)
+
+
+
+def load_result(model):
+    """Restores the fitted state of the model from its cached result, marking the result as recently used.
+    Returns the evaluation of the model, or None if its result is not cached.
+
+    """
+    resultFilePath = get_result_file_path(model)
+    try:
+        with open(resultFilePath, 'rb') as resultFile:
+            evaluation, modelState = pickle.load(resultFile)
+        os.utime(resultFilePath)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+    model.__dict__.update(modelState)
+    return evaluation
+
+
+
+def save_result(model, evaluation):
+    """Writes the evaluation and the fitted state of the model into the cache.
+
+    """
+    params = model.datasetManager.params
+    os.makedirs(params.resultCacheDir, exist_ok=True)
+    modelState = {attributeName: value for attributeName, value in model.__dict__.items() if attributeName not in TRANSIENT_ATTRIBUTES}
+
+    af.write_file(get_result_file_path(model), lambda resultFile: pickle.dump((evaluation, modelState), resultFile, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+
+def evict_least_recently_used(params):
+    """Removes the least recently used results (by modification time) until the cache size fits in the maximum size.
+
+    """
+    resultCacheDir, maxSizeInMegabytes = params.resultCacheDir, params.resultCacheMaxSize
+    if not os.path.isdir(resultCacheDir):
+        return
+
+    resultsFiles = []
+    for directoryEntry in os.scandir(resultCacheDir):
+        if directoryEntry.is_file() and directoryEntry.name.endswith(RESULT_FILE_EXTENSION):
+            fileStat = directoryEntry.stat()
+            resultsFiles.append((fileStat.st_mtime_ns, fileStat.st_size, directoryEntry.path))
+
+    cacheSize = sum(fileSize for _, fileSize, _ in resultsFiles)
+    for _, fileSize, filePath in sorted(resultsFiles):
+        if cacheSize <= maxSizeInMegabytes * pr.BYTES_PER_MEGABYTE:
+            break
+
+        try:
+            os.remove(filePath)
+        except FileNotFoundError:
+            pass
+        cacheSize -= fileSize
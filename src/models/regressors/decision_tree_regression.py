@@ -17,20 +17,29 @@ import models.regressors.generic_regressor as gr
 #### Main DecisionTreeRegressor class
 class DecisionTreeRegressor(gr.GenericRegressor):
 
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'max_depth': [None, 5, 10, 20], 'min_samples_leaf': [1, 2, 5, 10]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'max_depth': None, 'min_samples_leaf': 1}
+
     def evaluate(self):
         """Applies the Decision Tree Regression model on the dataset.
 
         """
         # Training the Decision Tree Regression model on the Training set
-        self.regressor = sklDecisionTreeRegressor(random_state = 0)
+        self.regressor = sklDecisionTreeRegressor(random_state = 0, **self.hyperparameters)
         return self.evaluate_from_dataset_manager_and_regressor("Decision Tree Regression", self.regressor)
 
     def predict(self):
         """Makes some predictions with Decision Tree Regression model.
 
         """
-        predictLambda = lambda valuesToPredict : self.regressor.predict(valuesToPredict)
-        return ["Decision Tree Regression predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Decision Tree Regression predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Decision Tree Regression model, for a two dimensions table of independent variables.
+
+        """
+        return self.regressor.predict(valuesToPredict)
 
 
 
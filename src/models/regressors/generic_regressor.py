@@ -7,9 +7,11 @@ It's also implements commons util methods used by regressors.
 """
 
 #### Libraries
+import numpy as np
 import pandas as pd
 from sklearn.metrics import r2_score
 import models.common.common_model_selection as cms
+import utils.incremental_metrics as im
 
 
 
@@ -21,16 +23,57 @@ class GenericRegressor(cms.CommonModelSelection):
 
         """
         # Training the regressor on the Training set
-        regressor.fit(self.datasetManager.X_train, self.datasetManager.y_train)
+        with self.profile_stage('fit'):
+            regressor.fit(self.datasetManager.X_train, self.datasetManager.y_train)
 
         # Predicting the Test set results
-        self.y_pred = regressor.predict(self.datasetManager.X_test)
+        with self.profile_stage('predict'):
+            self.y_pred = regressor.predict(self.datasetManager.X_test)
         
         # Returning the process result : the regression name and the R2 score
         return [regressorName, self.get_r2_score(self.datasetManager.y_test, self.y_pred)]
 
+    def evaluate_streaming_from_regressor(self, regressorName, regressor, nbEpochs=1):
+        """A common method for training the provided regressor by batches of the streamed training set, and evaluating it on the streamed test set.
+        X and y are incrementally feature scaled, and the R2 score is computed incrementally.
+
+        """
+        X_scaler, y_scaler, _ = self.datasetManager.get_streamed_statistics()
+        self.X_scaler = X_scaler
+        self.y_scaler = y_scaler
+
+        # Training the regressor by batches of the Training set
+        with self.profile_stage('fit'):
+            for _ in range(nbEpochs):
+                for X, y, rowIndexes, isTestRow in self.datasetManager.read_data_chunks():
+                    if not isTestRow.all():
+                        regressor.partial_fit(X_scaler.transform(X[~isTestRow]), y_scaler.transform(y[~isTestRow].reshape(-1, 1)).ravel())
+
+        # Predicting the Test set results by batches
+        r2Score = im.IncrementalR2Score()
+        with self.profile_stage('predict'):
+            for X, y, rowIndexes, isTestRow in self.datasetManager.read_data_chunks():
+                if isTestRow.any():
+                    y_pred = y_scaler.inverse_transform(regressor.predict(X_scaler.transform(X[isTestRow])).reshape(-1, 1)).ravel()
+                    r2Score.update(y[isTestRow], y_pred)
+
+        # Returning the process result : the regression name and the R2 score
+        return [regressorName, r2Score.get_score()]
+
+    def get_score_confidence_bounds(self, zScore):
+        """Returns the confidence interval bounds of the R2 score of the last evaluation.
+        The mean squared error is normally distributed around its estimate, with the standard error of the squared errors.
+
+        """
+        y_test = np.asarray(self.datasetManager.y_test, dtype=np.float64).ravel()
+        squaredErrors = (y_test - np.asarray(self.y_pred, dtype=np.float64).ravel()) ** 2
+        meanSquaredErrorMargin = zScore * squaredErrors.std(ddof=1) / np.sqrt(len(squaredErrors)) if len(squaredErrors) > 1 else np.inf
+        variance = y_test.var()
+        return 1.0 - (squaredErrors.mean() + meanSquaredErrorMargin) / variance, 1.0 - (squaredErrors.mean() - meanSquaredErrorMargin) / variance
+
     def get_r2_score(self, y_test:pd.DataFrame, y_pred:pd.DataFrame):
         """Evaluates a regressor model performance with the y_test and y_pred DataFrame inputs, and returns the R2 score.
+        The sums of squares are computed in float64, whatever the float type of the sets.
 
         """
-        return r2_score(y_test, y_pred)
+        return r2_score(np.asarray(y_test, dtype=np.float64), np.asarray(y_pred, dtype=np.float64))
@@ -2,6 +2,7 @@
 ~~~~~~~~~~~~~~
 
 An implementation of Multiple Linear Regression (MLR).
+It can also be trained by batches of a streamed dataset, through the accumulation of the normal equations.
 
 Desirable features :
     - Tune the regressor input parameters for better performance.
@@ -11,12 +12,15 @@ Desirable features :
 #### Libraries
 from sklearn.linear_model import LinearRegression
 import models.regressors.generic_regressor as gr
+import models.common.incremental_least_squares as ils
 
 
 
 #### Main MultipleLinearRegressor class
 class MultipleLinearRegressor(gr.GenericRegressor):
 
+    SUPPORTS_STREAMING_EVALUATION = True
+
     def evaluate(self):
         """Applies the Multiple Linear Regression model on the dataset.
 
@@ -24,13 +28,26 @@ class MultipleLinearRegressor(gr.GenericRegressor):
         # Training the Multiple Linear Regression model on the Training set
         self.regressor = LinearRegression()
         return self.evaluate_from_dataset_manager_and_regressor("Multiple Linear Regression", self.regressor)
+
+    def evaluate_streaming(self):
+        """Applies the Multiple Linear Regression model on the streamed dataset.
+        The exact least squares solution only needs one pass over the training set.
+
+        """
+        self.regressor = ils.IncrementalLinearRegression()
+        return self.evaluate_streaming_from_regressor("Multiple Linear Regression", self.regressor)
         
     def predict(self):
         """Makes some predictions with Multiple Linear Regression model.
 
         """
-        predictLambda = lambda valuesToPredict : self.regressor.predict(valuesToPredict)
-        return ["Multiple Linear Regression predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Multiple Linear Regression predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Multiple Linear Regression model, for a two dimensions table of independent variables.
+
+        """
+        return self.regressor.predict(valuesToPredict)
 
 
 
@@ -2,6 +2,8 @@
 ~~~~~~~~~~~~~~
 
 An implementation of Polynomial Regression.
+When the expanded features of the dataset don't fit into the memory budget, the degree is lowered until the normal equations fit into it,
+and the expanded features are built block by block and accumulated into the normal equations, without holding the whole design matrix.
 
 Desirable features :
     - Tune the regressor input parameters for better performance.
@@ -9,38 +11,101 @@ Desirable features :
 """
 
 #### Libraries
-from sklearn.preprocessing import PolynomialFeatures
+from math import comb
+import numpy as np
 from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import PolynomialFeatures
+import models.common.incremental_least_squares as ils
 import models.regressors.generic_regressor as gr
+import utils.profiler as pr
+
+# Constants
+BYTES_PER_VALUE = np.dtype(np.float64).itemsize
+# Copies of the normal equations held at the same time while solving them (X'X and the least squares workspace)
+NORMAL_EQUATIONS_COPIES = 3
+# Copies of a block of expanded features held at the same time (the block, and the block with the intercept column)
+BLOCK_COPIES = 2
+MIN_BLOCK_ROWS = 256
 
 
 
 #### Main PolynomialRegressor class
 class PolynomialRegressor(gr.GenericRegressor):
 
+    DEFAULT_HYPERPARAMETERS = {'degree': 4}
+    HYPERPARAMETERS_SPACE = {'degree': [2, 3, 4, 5]}
+    RESULT_PARAMETERS = gr.GenericRegressor.RESULT_PARAMETERS + ['polynomialMemoryBudget']
+
     def evaluate(self):
         """Applies the Polynomial Regression model on the dataset.
 
         """
+        degree = self.hyperparameters['degree']
+        memoryBudget = self.datasetManager.params.polynomialMemoryBudget * pr.BYTES_PER_MEGABYTE
+        nbRows = len(self.datasetManager.X_train) + len(self.datasetManager.X_test)
+        self.X_scaler = None
+        # The features are expanded in float64 whatever the float type of X : in float32, the high degree terms of unscaled variables (like 1000^4) lose the low degree ones
+        if nbRows * get_nb_polynomial_features(self.datasetManager.get_nb_independent_variables(), degree) * BYTES_PER_VALUE > memoryBudget:
+            return self.evaluate_by_blocks(degree, memoryBudget)
+
         # Training the Polynomial Regression model on the Training set
-        self.poly_reg = PolynomialFeatures(degree = 4)
-        X_poly = self.poly_reg.fit_transform(self.datasetManager.X_train)
+        self.poly_reg, X_poly, X_test_poly = self.datasetManager.get_polynomial_features(degree)
 
         self.regressor = LinearRegression()
-        self.regressor.fit(X_poly, self.datasetManager.y_train)
+        with self.profile_stage('fit'):
+            self.regressor.fit(X_poly, self.datasetManager.y_train)
 
         # Predicting the Test set results
-        self.y_pred = self.regressor.predict(self.poly_reg.transform(self.datasetManager.X_test))
+        with self.profile_stage('predict'):
+            self.y_pred = self.regressor.predict(X_test_poly)
         
         # Returning the process result : the regression type and the predicted dependent variables set
         return ["Polynomial Regression", self.get_r2_score(self.datasetManager.y_test, self.y_pred)]
 
+    def evaluate_by_blocks(self, degree, memoryBudget):
+        """Applies the Polynomial Regression model of the highest degree (up to 'degree') whose normal equations fit into the memory budget,
+        the features being expanded by blocks of rows of the feature scaled dataset (for the normal equations conditioning).
+
+        """
+        nbIndependentVariables = self.datasetManager.get_nb_independent_variables()
+        self.degree = get_degree_within_memory_budget(nbIndependentVariables, degree, memoryBudget)
+        self.blockSize = get_block_size(get_nb_polynomial_features(nbIndependentVariables, self.degree), memoryBudget)
+
+        # Training the Polynomial Regression model on the Training set, by blocks of expanded features
+        self.X_scaler, X_train, _ = self.datasetManager.get_scaled_independent_variables()
+        y_train = np.asarray(self.datasetManager.y_train, dtype=np.float64).ravel()
+        self.poly_reg = PolynomialFeatures(degree = self.degree, include_bias = False).fit(X_train[:1])
+
+        self.regressor = ils.IncrementalLinearRegression()
+        with self.profile_stage('fit'):
+            for start in range(0, len(X_train), self.blockSize):
+                self.regressor.partial_fit(self.poly_reg.transform(np.asarray(X_train[start:start + self.blockSize], dtype=np.float64)), y_train[start:start + self.blockSize])
+            self.regressor.solve()
+
+        # Predicting the Test set results
+        with self.profile_stage('predict'):
+            self.y_pred = self.predict_values(self.datasetManager.X_test)
+
+        # Returning the process result : the regression type and the predicted dependent variables set
+        return ["Polynomial Regression (degree {0}, by blocks)".format(self.degree), self.get_r2_score(self.datasetManager.y_test, self.y_pred)]
+
     def predict(self):
         """Makes some predictions with Polynomial Regression model.
 
         """
-        predictLambda = lambda valuesToPredict : self.regressor.predict(self.poly_reg.transform(valuesToPredict))
-        return ["Polynomial Regression predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Polynomial Regression predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Polynomial Regression model, for a two dimensions table of independent variables.
+
+        """
+        if self.X_scaler is None:
+            return self.regressor.predict(self.poly_reg.transform(np.asarray(valuesToPredict, dtype=np.float64)))
+
+        # The features are expanded by blocks, like for training
+        valuesToPredict = np.asarray(self.X_scaler.transform(valuesToPredict), dtype=np.float64)
+        return np.concatenate([self.regressor.predict(self.poly_reg.transform(valuesToPredict[start:start + self.blockSize]))\
+            for start in range(0, len(valuesToPredict), self.blockSize)])
 
 
 
@@ -49,3 +114,34 @@ class PolynomialRegressor(gr.GenericRegressor):
 
         """
         return ["Polynomial Regression predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
+
+
+
+def get_nb_polynomial_features(nbIndependentVariables, degree):
+    """Returns the number of polynomial features of the degree, bias included.
+
+    """
+    return comb(nbIndependentVariables + degree, degree)
+
+
+
+def get_degree_within_memory_budget(nbIndependentVariables, maxDegree, memoryBudget):
+    """Returns the highest degree up to 'maxDegree' whose normal equations, and a block of the minimum size, fit into the memory budget in bytes.
+
+    """
+    for degree in range(maxDegree, 0, -1):
+        nbFeatures = get_nb_polynomial_features(nbIndependentVariables, degree)
+        if (NORMAL_EQUATIONS_COPIES * nbFeatures + BLOCK_COPIES * MIN_BLOCK_ROWS) * nbFeatures * BYTES_PER_VALUE <= memoryBudget:
+            return degree
+
+    raise MemoryError("The normal equations of {0} independent variables don't fit into the polynomial memory budget of {1:g} MB, even for the degree 1"\
+        .format(nbIndependentVariables, memoryBudget / pr.BYTES_PER_MEGABYTE))
+
+
+
+def get_block_size(nbFeatures, memoryBudget):
+    """Returns the number of rows of the blocks of expanded features, using the memory budget left by the normal equations.
+
+    """
+    memoryLeft = memoryBudget - NORMAL_EQUATIONS_COPIES * nbFeatures * nbFeatures * BYTES_PER_VALUE
+    return max(MIN_BLOCK_ROWS, int(memoryLeft // (BLOCK_COPIES * nbFeatures * BYTES_PER_VALUE)))
@@ -10,6 +10,7 @@ Desirable features :
 
 #### Libraries
 from sklearn.ensemble import RandomForestRegressor as sklRandomForestRegressor
+import models.common.forest_growth as fg
 import models.regressors.generic_regressor as gr
 
 
@@ -17,20 +18,32 @@ import models.regressors.generic_regressor as gr
 #### Main RandomForestRegressor class
 class RandomForestRegressor(gr.GenericRegressor):
 
+    DEFAULT_HYPERPARAMETERS = {'n_estimators': 10}
+    HYPERPARAMETERS_SPACE = {'n_estimators': [10, 50, 100, 200], 'max_features': [1.0, 0.5, 'sqrt'], 'min_samples_leaf': [1, 2, 5]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'max_features': 1.0, 'min_samples_leaf': 1}
+    RESULT_PARAMETERS = gr.GenericRegressor.RESULT_PARAMETERS + ['growForest', 'growForestBlockSize', 'growForestMaxTrees', 'growForestTolerance']
+
     def evaluate(self):
         """Applies the Random Forest Regression model on the dataset.
 
         """
-        # Training the Random Forest Regression model on the Training set
-        self.regressor = sklRandomForestRegressor(n_estimators = 10, random_state = 0)
+        # Training the Random Forest Regression model on the Training set, grown by blocks of trees if requested
+        self.regressor = sklRandomForestRegressor(random_state = 0, **self.hyperparameters)
+        if self.datasetManager.params.growForest:
+            self.regressor = fg.GrowingForest(self.regressor, self.datasetManager.params)
         return self.evaluate_from_dataset_manager_and_regressor("Random Forest Regression", self.regressor)
 
     def predict(self):
         """Makes some predictions with Random Forest Regression model.
 
         """
-        predictLambda = lambda valuesToPredict : self.regressor.predict(valuesToPredict)
-        return ["Random Forest Regression predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Random Forest Regression predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Random Forest Regression model, for a two dimensions table of independent variables.
+
+        """
+        return self.regressor.predict(valuesToPredict)
 
 
 
@@ -0,0 +1,80 @@
+"""stochastic_gradient_descent_regression.py
+~~~~~~~~~~~~~~
+
+An implementation of Stochastic Gradient Descent Regression (SGDR), a linear regression learned by iterative updates.
+It can also be trained by batches of a streamed dataset.
+
+Desirable features :
+    - Tune the regressor input parameters for better performance.
+
+"""
+
+#### Libraries
+from sklearn.linear_model import SGDRegressor
+import models.regressors.generic_regressor as gr
+
+
+
+#### Main StochasticGradientDescentRegressor class
+class StochasticGradientDescentRegressor(gr.GenericRegressor):
+
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'alpha': [1e-5, 1e-4, 1e-3, 1e-2], 'penalty': ['l2', 'l1', 'elasticnet']}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'alpha': 1e-4, 'penalty': 'l2'}
+    RESULT_PARAMETERS = gr.GenericRegressor.RESULT_PARAMETERS + ['streamingEpochs']
+    SUPPORTS_STREAMING_EVALUATION = True
+
+    def evaluate(self):
+        """Applies the Stochastic Gradient Descent Regression model on the dataset.
+        X and y are always feature scaled, the gradient descent doesn't converge otherwise.
+
+        """
+        X_scaler, X_train, X_test = self.datasetManager.get_scaled_independent_variables()
+        y_scaler, y_train = self.datasetManager.get_scaled_dependent_variable()
+        self.X_scaler = X_scaler
+        self.y_scaler = y_scaler
+
+        # Training the Stochastic Gradient Descent Regression model on the Training set
+        self.regressor = SGDRegressor(random_state = 0, **self.hyperparameters)
+        with self.profile_stage('fit'):
+            self.regressor.fit(X_train, y_train.ravel())
+
+        # Predicting the Test set results
+        with self.profile_stage('predict'):
+            self.y_pred = self.inverse_scaling_of_predictions(self.regressor.predict(X_test))
+
+        # Returning the process result : the regression type and the R2 score
+        return ["Stochastic Gradient Descent Regression", self.get_r2_score(self.datasetManager.y_test, self.y_pred)]
+
+    def evaluate_streaming(self):
+        """Applies the Stochastic Gradient Descent Regression model on the streamed dataset.
+
+        """
+        self.regressor = SGDRegressor(random_state = 0, **self.hyperparameters)
+        return self.evaluate_streaming_from_regressor("Stochastic Gradient Descent Regression", self.regressor, self.datasetManager.params.streamingEpochs)
+
+    def predict(self):
+        """Makes some predictions with Stochastic Gradient Descent Regression model.
+
+        """
+        return ["Stochastic Gradient Descent Regression predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Stochastic Gradient Descent Regression model, for a two dimensions table of independent variables.
+
+        """
+        return self.inverse_scaling_of_predictions(self.regressor.predict(self.X_scaler.transform(valuesToPredict)))
+
+    def inverse_scaling_of_predictions(self, y_pred):
+        """Returns the one dimension predictions set, back to the dependent variable scale.
+
+        """
+        return self.y_scaler.inverse_transform(y_pred.reshape(len(y_pred), 1)).ravel()
+
+
+
+    def predictions_relevance(self):
+        """Returns a comparison table for Stochastic Gradient Descent Regression model.
+
+        """
+        return ["Stochastic Gradient Descent Regression predictions comparison", super().truncate_predictions_relevance(self.datasetManager.X_test, self.datasetManager.y_test, self.y_pred)]
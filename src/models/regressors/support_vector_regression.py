@@ -10,8 +10,10 @@ Desirable features :
 """
 
 #### Libraries
-from sklearn.svm import SVR
-import utils.dataset_manager as dm
+import time
+import numpy as np
+from sklearn.svm import SVR, LinearSVR
+import models.common.approximate_kernel as ak
 import models.regressors.generic_regressor as gr
 
 
@@ -19,18 +21,22 @@ import models.regressors.generic_regressor as gr
 #### Main SupportVectorRegressor class
 class SupportVectorRegressor(gr.GenericRegressor):
 
+    DEFAULT_HYPERPARAMETERS = {}
+    HYPERPARAMETERS_SPACE = {'C': [0.1, 1.0, 10.0, 100.0], 'epsilon': [0.01, 0.1, 0.5], 'gamma': ['scale', 0.1, 1.0]}
+    ESTIMATOR_DEFAULT_HYPERPARAMETERS = {'C': 1.0, 'epsilon': 0.1, 'gamma': 'scale'}
+    RESULT_PARAMETERS = gr.GenericRegressor.RESULT_PARAMETERS + ['featureScaleDependentVariables', 'approximateKernelRowThreshold']
+
     def evaluate(self):
         """Applies the SVR model on the dataset.
 
         """
         # Method variables definition
-        X_train, X_test, y_train, y_test = dm.reshape_y_set_split_data(self.datasetManager)
         featureScaleDependentVariables = self.datasetManager.params.featureScaleDependentVariables
 
-        # Feature Scaling
-        X_scaler, X_train = dm.do_feature_scaling(X_train)
+        # Feature Scaling, shared with the other models and done on the unique train/test split of the dataset manager
+        X_scaler, X_train, X_test = self.datasetManager.get_scaled_independent_variables()
         if featureScaleDependentVariables:
-            y_scaler, y_train = dm.do_feature_scaling(y_train)
+            y_scaler, y_train = self.datasetManager.get_scaled_dependent_variable()
         else:
             y_scaler = None
             y_train = self.datasetManager.y_train
@@ -38,25 +44,65 @@ class SupportVectorRegressor(gr.GenericRegressor):
         self.X_scaler = X_scaler
         self.y_scaler = y_scaler
 
-        # Training the SVR model on the training set
-        regressor = SVR(kernel = 'rbf')
-        regressor.fit(X_train, y_train.ravel())
+        # Training the SVR model on the training set, on a Nystroem approximation of the kernel for a big training set
+        isApproximateKernelNeeded = ak.is_approximate_kernel_needed(self.datasetManager)
+        regressor = self.get_approximate_regressor(X_train) if isApproximateKernelNeeded else SVR(kernel = 'rbf', **self.hyperparameters)
+
+        startTime = time.perf_counter()
+        with self.profile_stage('fit'):
+            regressor.fit(X_train, y_train.ravel())
         self.regressor = regressor
 
         # Predicting the Test set results
-        self.y_pred = y_scaler.inverse_transform(regressor.predict(X_scaler.transform(X_test))) if featureScaleDependentVariables else regressor.predict(X_test)
+        with self.profile_stage('predict'):
+            self.y_pred = self.inverse_scaling_of_predictions(regressor.predict(X_test))
+        self.approximateDuration = time.perf_counter() - startTime if isApproximateKernelNeeded else None
         
         # Returning the process result : the regression type and the predicted dependent variables set
-        return ["Support Vector Regression", self.get_r2_score(y_test, self.y_pred)]
+        return ["Support Vector Regression", self.get_r2_score(self.datasetManager.y_test, self.y_pred)]
+
+    def get_approximate_regressor(self, X_train):
+        """Returns the regressor fitting a linear SVR on the Nystroem features of the RBF kernel.
+
+        """
+        hyperparameters = dict(self.hyperparameters)
+        gamma = hyperparameters.pop('gamma', 'scale')
+        return ak.get_approximate_kernel_model(LinearSVR(loss = 'squared_epsilon_insensitive', random_state = 0, **{'epsilon': 0.1, **hyperparameters}), gamma, X_train)
+
+    def probe_approximation(self):
+        """Returns the probe of the approximate regressor against the exact SVR (see 'approximate_kernel.probe_approximation').
+
+        """
+        def compute_probe():
+            _, X_train, X_test = self.datasetManager.get_scaled_independent_variables()
+            y_train = self.datasetManager.get_scaled_dependent_variable()[1] if self.datasetManager.params.featureScaleDependentVariables else self.datasetManager.y_train
+            y_test = np.asarray(self.datasetManager.y_test).ravel()
+            with self.profile_stage('probe'):
+                return ak.probe_approximation(SVR(kernel = 'rbf', **self.hyperparameters), self.get_approximate_regressor(X_train), X_train, np.asarray(y_train).ravel(), X_test,\
+                    lambda testPositions, y_pred: self.get_r2_score(y_test[testPositions], self.inverse_scaling_of_predictions(y_pred)), self.datasetManager.params.splitRandomState)
+
+        return ak.get_approximation_probe(self, compute_probe)
 
     def predict(self):
         """Makes some predictions with Support Vector Regression model.
 
         """
-        predictLambda = lambda valuesToPredict : self.y_scaler.inverse_transform(self.regressor.predict(self.X_scaler.transform(valuesToPredict)))\
-            if self.datasetManager.params.featureScaleDependentVariables else self.regressor.predict(valuesToPredict)
-        
-        return ["Support Vector Regression predictions", super().predict_user_input_variables(predictLambda)]
+        return ["Support Vector Regression predictions", super().predict_user_input_variables(self.predict_values)]
+
+    def predict_values(self, valuesToPredict):
+        """Returns the dependent variables predicted by Support Vector Regression model, for a two dimensions table of independent variables.
+
+        """
+        return self.inverse_scaling_of_predictions(self.regressor.predict(self.X_scaler.transform(valuesToPredict)))
+
+    def inverse_scaling_of_predictions(self, y_pred):
+        """Returns the one dimension predictions set, back to the dependent variable scale if it was feature scaled.
+
+        """
+        if self.y_scaler is None:
+            return y_pred
+
+        return self.y_scaler.inverse_transform(y_pred.reshape(len(y_pred), 1)).ravel()
 
 
 
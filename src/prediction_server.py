@@ -0,0 +1,214 @@
+"""prediction_server.py
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Serves the predictions of the regressors or classifiers over HTTP, the models being loaded from the store or trained only once at startup.
+The prediction requests arriving at the same time are micro-batched into a single vectorized prediction by model.
+
+Endpoints :
+    - GET /health : the server status.
+    - GET /models : the served models codes, and the number of independent variables expected by row.
+    - POST /predict : predicts the rows of independent variables of a JSON body like {"rows": [[...], ...], "models": ["MLR", ...]},
+      the "models" list being optional (all the served models by default).
+
+Desirable features :
+    - Reload the models when the store is updated.
+
+"""
+
+#### Libraries
+import utils.dataset_manager as dm
+import utils.input_parameters as ip
+import utils.micro_batcher as mb
+import utils.output_renderer as orr
+import models.common.common_model_selection as cms
+import models.common.models_store as ms
+import regression_model_selection as rms
+import classification_model_selection as clms
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import socket
+
+# Constants
+MODEL_TYPES = {
+    'regressor' : (rms.EXISTING_REGRESSORS, rms.print_evaluations, rms.get_R2_score),
+    'classifier' : (clms.EXISTING_CLASSIFIERS, clms.print_evaluations, clms.get_accuracy_score)
+}
+DEFAULT_MODEL_TYPE = 'regressor'
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH_SIZE = 1024
+DEFAULT_MAX_BATCH_WAIT_MS = 5.0
+
+
+
+def main():
+    """Prediction server main process.
+
+    """
+    # The model type is needed first, for the help and the codes of the models
+    modelTypeParser = argparse.ArgumentParser(add_help=False)
+    modelTypeParser.add_argument('-modelType', type=str, choices=list(MODEL_TYPES.keys()), default=DEFAULT_MODEL_TYPE)
+    modelName = modelTypeParser.parse_known_args()[0].modelType
+    existingModels, printEvaluations, scoreLambda = MODEL_TYPES[modelName]
+
+    # Get input parameters for dataset management and serving
+    argumentParser = get_argument_parser(modelName, cms.get_dictionary_codes(existingModels))
+    args = argumentParser.parse_args()
+    if args.maxBatchSize < 1 or args.maxBatchWaitMs < 0:
+        argumentParser.error("-maxBatchSize must be at least 1, and -maxBatchWaitMs can't be negative")
+    inputParameters = ip.get_input_parameters_from_arguments(argumentParser, args)
+    orr.set_output_format(inputParameters.outputFormat)
+
+    datasetManager = dm.DatasetManager(inputParameters)
+    modelsDictionary = get_models(modelName, existingModels, datasetManager, printEvaluations, scoreLambda)
+    if not modelsDictionary:
+        orr.print_message("No {0} to serve".format(modelName))
+        return
+
+    # One micro-batcher by model, predicting the batches one after another
+    batchers = {modelCode: mb.MicroBatcher(model.predict_values, args.maxBatchSize, args.maxBatchWaitMs / 1000) for modelCode, model in modelsDictionary.items()}
+    # The rows to predict are parsed in the float type the models were trained in
+    server = PredictionServer((args.host, args.port), batchers, datasetManager.get_nb_independent_variables(), dm.get_computation_dtype(datasetManager.X_train))
+    orr.print_message("Serving the {0}s {1} on http://{2}:{3}".format(modelName, list(batchers.keys()), *server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for batcher in batchers.values():
+            batcher.close()
+
+
+
+def get_argument_parser(modelName, modelCodes):
+    """Returns the command line parser of the input parameters, with the serving ones.
+
+    """
+    argumentParser = ip.get_argument_parser(modelName, modelCodes)
+    argumentParser.description = "Serve the predictions of the {0}s trained on a specific dataset over HTTP.".format(modelName)
+    argumentParser.add_argument('-modelType', type=str, choices=list(MODEL_TYPES.keys()), default=DEFAULT_MODEL_TYPE,\
+        help="Indicates the type of the served models (default: {0})".format(DEFAULT_MODEL_TYPE))
+    argumentParser.add_argument('-host', type=str, default=DEFAULT_HOST, help="Indicates the address the server listens on (default: {0})".format(DEFAULT_HOST))
+    argumentParser.add_argument('-port', type=int, default=DEFAULT_PORT, help="Indicates the port the server listens on, 0 means any free port (default: {0})".format(DEFAULT_PORT))
+    argumentParser.add_argument('-maxBatchSize', type=int, default=DEFAULT_MAX_BATCH_SIZE,\
+        help="Indicates the maximum number of rows predicted at once by a {0} (default: {1})".format(modelName, DEFAULT_MAX_BATCH_SIZE))
+    argumentParser.add_argument('-maxBatchWaitMs', type=float, default=DEFAULT_MAX_BATCH_WAIT_MS,\
+        help="Indicates the maximum time in milliseconds a request waits for other ones to be predicted with (default: {0})".format(DEFAULT_MAX_BATCH_WAIT_MS))
+    return argumentParser
+
+
+
+def get_models(modelName, existingModels, datasetManager, printEvaluations, scoreLambda):
+    """Returns the dictionary of the models to serve by model code.
+    The models are loaded from the store when all of them are stored, otherwise they are trained (and stored if a store is given).
+
+    """
+    params = datasetManager.params
+    modelsCodes = params.predictOnly if params.predictOnly is not None else cms.get_dictionary_codes(existingModels)
+    for modelCode in modelsCodes:
+        if modelCode not in existingModels:
+            raise AttributeError("Invalid {0} code for prediction : '{1}', expected codes {2}".format(modelName, modelCode, list(existingModels.keys())))
+
+    datasetManager.load_and_split_data()
+    if params.modelStoreDir is not None and set(modelsCodes) <= set(ms.get_stored_models_codes(existingModels, datasetManager)):
+        return ms.load_models(modelName, existingModels, datasetManager, modelsCodes)
+
+    modelsDictionary = cms.instantiate_models(cms.import_models(existingModels, modelsCodes), datasetManager)
+    evaluations, errors = cms.evaluate_and_sort_models(modelsDictionary, scoreLambda, params.nbJobs, params.executorType)
+    printEvaluations(evaluations)
+    cms.print_evaluation_errors(modelName, errors)
+
+    if params.modelStoreDir is not None:
+        ms.save_models(modelsDictionary, datasetManager)
+
+    return modelsDictionary
+
+
+
+#### Main PredictionServer class
+class PredictionServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+    # The requests arriving at the same time wait in the listen backlog instead of being reset
+    request_queue_size = socket.SOMAXCONN
+
+    def __init__(self, serverAddress, batchers, nbIndependentVariables, dtype=np.float64):
+        """Initialize the HTTP server with the micro-batchers of the served models, and the float type of the rows to predict.
+
+        """
+        self.batchers = batchers
+        self.nbIndependentVariables = nbIndependentVariables
+        self.dtype = np.dtype(dtype)
+        super().__init__(serverAddress, PredictionRequestHandler)
+
+
+
+#### Main PredictionRequestHandler class
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif self.path == '/models':
+            self.send_json(200, {'models': list(self.server.batchers.keys()), 'nbIndependentVariables': self.server.nbIndependentVariables})
+        else:
+            self.send_json(404, {'error': "Unknown path '{0}'".format(self.path)})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self.send_json(404, {'error': "Unknown path '{0}'".format(self.path)})
+            return
+
+        try:
+            valuesToPredict, modelsCodes = self.get_prediction_request()
+        except ValueError as error:
+            self.send_json(400, {'error': str(error)})
+            return
+
+        # All the models predict the rows at the same time, each one in its own batch
+        futures = {modelCode: self.server.batchers[modelCode].submit(valuesToPredict) for modelCode in modelsCodes}
+        try:
+            predictions = {modelCode: future.result().tolist() for modelCode, future in futures.items()}
+        except Exception as error:
+            self.send_json(500, {'error': "{0}: {1}".format(type(error).__name__, error)})
+            return
+
+        self.send_json(200, {'predictions': predictions})
+
+    def get_prediction_request(self):
+        """Reads the JSON body of a prediction request.
+        Returns the two dimensions table of independent variables and the codes of the models to use, raising a ValueError if the request is invalid.
+
+        """
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            valuesToPredict = np.asarray(request['rows'], dtype=self.server.dtype)
+        except (ValueError, TypeError, KeyError) as error:
+            raise ValueError("Invalid request, a JSON body like {{\"rows\": [[...], ...]}} of numbers is expected ({0})".format(error))
+
+        nbIndependentVariables = self.server.nbIndependentVariables
+        if valuesToPredict.ndim != 2 or valuesToPredict.shape[1] != nbIndependentVariables:
+            raise ValueError("Invalid rows, a two dimensions table with {0} independent variables by row is expected".format(nbIndependentVariables))
+
+        modelsCodes = request.get('models') or list(self.server.batchers.keys())
+        invalidCodes = [modelCode for modelCode in modelsCodes if modelCode not in self.server.batchers]
+        if invalidCodes:
+            raise ValueError("Invalid model codes {0}, expected codes {1}".format(invalidCodes, list(self.server.batchers.keys())))
+
+        return valuesToPredict, modelsCodes
+
+    def send_json(self, statusCode, content):
+        body = json.dumps(content, default=str).encode('utf-8')
+        self.send_response(statusCode)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+
+if __name__ == "__main__":
+    main()
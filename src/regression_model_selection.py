@@ -11,31 +11,36 @@ Desirable features :
 """
 
 #### Libraries
+import time
+# Taken before the other imports, for reporting the startup time
+STARTUP_START_TIME = time.perf_counter()
 import utils.dataset_manager as dm
 import utils.input_parameters as ip
-from texttable import Texttable
+import models.common.approximate_kernel as ak
 import models.common.common_model_selection as cms
-# Regressors
-from models.regressors.multiple_linear_regression import MultipleLinearRegressor as MLRReg
-from models.regressors.polynomial_regression import PolynomialRegressor as PolyReg
-from models.regressors.support_vector_regression import SupportVectorRegressor as SVRReg
-from models.regressors.decision_tree_regression import DecisionTreeRegressor as DTRReg
-from models.regressors.random_forest_regression import RandomForestRegressor as RFRReg
-
+import models.common.dtype_report as dr
+import models.common.forest_growth as fg
+import models.common.hyperparameters_search as hs
+import models.common.models_racing as mr
+import models.common.models_store as ms
+import utils.output_renderer as orr
+import utils.profiler as pr
 import sys
 sys.path.append("../src/")
 
 
 
 # Dictionary of all existing regressors.
-# For each row, the key is a regressor code (that can be used for restricting a specific prediction). And the value is the regressor class
+# For each row, the key is a regressor code (that can be used for restricting a specific prediction). And the value is the dotted path of the regressor class,
+# its module being only imported when the regressor is used
 # To avoid processing a specific regressor, feel free to comment the concerned line
 EXISTING_REGRESSORS = {
-    'MLR' : MLRReg,
-    'POLY' : PolyReg,
-    'SVR' : SVRReg,
-    'DTR' : DTRReg,
-    'RFR' : RFRReg
+    'MLR' : 'models.regressors.multiple_linear_regression.MultipleLinearRegressor',
+    'POLY' : 'models.regressors.polynomial_regression.PolynomialRegressor',
+    'SVR' : 'models.regressors.support_vector_regression.SupportVectorRegressor',
+    'DTR' : 'models.regressors.decision_tree_regression.DecisionTreeRegressor',
+    'RFR' : 'models.regressors.random_forest_regression.RandomForestRegressor',
+    'SGDR' : 'models.regressors.stochastic_gradient_descent_regression.StochasticGradientDescentRegressor'
 }
 
 def main():
@@ -44,44 +49,168 @@ def main():
     """
     # Get input parameters for dataset management
     inputParameters = ip.get_input_parameters('regressor', cms.get_dictionary_codes(EXISTING_REGRESSORS))
+    startupTime = time.perf_counter() - STARTUP_START_TIME
+    orr.set_output_format(inputParameters.outputFormat)
+    if inputParameters.showStartupTime:
+        orr.print_message("Startup time : {0:.3f}s (libraries imports and input parameters, the regressors being imported when used)".format(startupTime))
+
+    # Profile the stages and the regressors if requested, the report being written even if the run fails
+    profiler = pr.Profiler(inputParameters.profile, traceMemory=not inputParameters.profileTimesOnly)
+    profiler.record_stage('startup', startupTime)
+    try:
+        select_models(inputParameters, profiler)
+    finally:
+        profiler.write_report()
+
 
+
+def select_models(inputParameters, profiler, dataset=None):
+    """Loads the dataset (or uses the given DataFrame of the dataset file), then evaluates the regressors and predicts from them, depending of the input parameters.
+    Returns the evaluations ranking the regressors (the cross-validation ones if any), or None if none was evaluated.
+
+    """
     # Load the data
     datasetManager = dm.DatasetManager(inputParameters)
-    datasetManager.load_and_split_data()
+    if inputParameters.predictFromStore:
+        # Predict from the stored regressors only, without training : the dataset is loaded for finding the regressors trained on its content
+        with profiler.stage('loading'):
+            datasetManager.load_data(dataset)
+            datasetManager.split_data()
+            regressorsDictionary = ms.load_models('regressor', EXISTING_REGRESSORS, datasetManager, inputParameters.predictOnly)
+        with profiler.stage('prediction'):
+            if inputParameters.predict is not None:
+                predictions = cms.predict_from_lambda(regressorsDictionary.values(), lambda regressor : regressor.predict())
+                cms.print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='Predicted ')
+            if inputParameters.predictFile is not None:
+                nbPredictedRows = cms.predict_file('regressor', regressorsDictionary, datasetManager, inputParameters.predictOnly)
+                cms.print_predict_file_summary('regressor', nbPredictedRows, inputParameters.predictOutputFile)
+        return
+
+    if inputParameters.convertDatasetOnly:
+        with profiler.stage('loading'):
+            cacheEntryDirectory = datasetManager.convert_data_to_cache()
+        orr.print_message("Dataset cached into {0}".format(cacheEntryDirectory) if cacheEntryDirectory is not None else "Dataset can't be cached, only numeric values can be memory-mapped")
+        return
+
+    if inputParameters.streamingEvaluation:
+        # Only the regressors able to learn by batches are trained, the dataset being streamed
+        with profiler.stage('importing'):
+            existingModels = cms.get_streamable_models(cms.import_models(EXISTING_REGRESSORS))
+        with profiler.stage('loading'):
+            datasetManager.get_streamed_statistics()
+    else:
+        with profiler.stage('importing'):
+            existingModels = cms.import_models(EXISTING_REGRESSORS)
+        with profiler.stage('loading'):
+            datasetManager.load_data(dataset)
+        with profiler.stage('splitting'):
+            datasetManager.split_data()
+        if inputParameters.dtype is not None:
+            dr.print_memory_usage(datasetManager)
+
+    modelName = 'regressor'
+    # Tune the hyperparameters of the regressors
+    hyperparametersDictionary = None
+    if inputParameters.tune:
+        with profiler.stage('tuning'):
+            searchResults = hs.search_best_hyperparameters(existingModels, datasetManager, get_R2_score)
+        hs.print_search_results(modelName, searchResults, 'R2 Score')
+        hyperparametersDictionary = hs.get_best_hyperparameters(searchResults)
+
+    # Race the regressors, only the survivors going on
+    if inputParameters.race:
+        with profiler.stage('racing'):
+            existingModels, raceResults = mr.race_models(existingModels, datasetManager, get_R2_score, hyperparametersDictionary)
+        mr.print_race_results(modelName, raceResults, 'R2 Score')
+
+    # Cross-validate the regressors, the single split evaluation being only needed for predictions
+    if inputParameters.cvFolds is not None:
+        with profiler.stage('cross-validation'):
+            crossValidationEvaluations, errors = cms.cross_validate_and_sort_models(existingModels, datasetManager, get_R2_score, inputParameters.cvFolds, stratified=False,\
+                nbJobs=inputParameters.nbJobs, executorType=inputParameters.executorType, hyperparametersDictionary=hyperparametersDictionary)
+        print_cross_validation_evaluations(crossValidationEvaluations)
+        cms.print_evaluation_errors(modelName, errors)
+
+        if inputParameters.predict is None and inputParameters.predictFile is None and inputParameters.showPredictionsFor is None:
+            return crossValidationEvaluations
 
     # Instantiate the regressors dictionary
-    regressorsDictionary = cms.instantiate_models(EXISTING_REGRESSORS, datasetManager)
+    with profiler.stage('initialization'):
+        regressorsDictionary = cms.instantiate_models(existingModels, datasetManager, hyperparametersDictionary)
 
     # Get the evaluations
-    evaluations = cms.evaluate_and_sort_models(regressorsDictionary.values(), get_R2_score)
+    with profiler.stage('evaluation'):
+        evaluationsByModel, errors = cms.evaluate_models(regressorsDictionary, inputParameters.nbJobs, inputParameters.executorType)
+        evaluations = cms.sort_evaluations(evaluationsByModel, get_R2_score)
+    profiler.add_models_profiles(regressorsDictionary)
     
     # Print evaluations
-    print_evaluations(evaluations.copy())
+    with profiler.stage('rendering'):
+        print_evaluations(evaluations.copy(), profiler.get_evaluations_column(evaluations))
 
-    modelName = 'regressor'
-    # Predict from users input
-    if inputParameters.predict is not None:
-        predictLambda = lambda regressor : regressor.predict()
-        predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, regressorsDictionary, inputParameters.predictOnly), predictLambda)
-        cms.print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='Predicted ')
+    cms.print_evaluation_errors(modelName, errors)
+
+    # Print the score versus trees curves of the grown forests
+    if inputParameters.growForest:
+        fg.print_growth_curves(modelName, regressorsDictionary, 'R2 Score')
+
+    # Print the speedup and the score difference of the regressors fitted on an approximation of the RBF kernel
+    ak.print_approximations(modelName, regressorsDictionary, 'R2 Score')
+
+    # Evaluate the regressors again on the dataset loaded as float64, for the score drift of the float type
+    if inputParameters.dtypeDriftCheck:
+        with profiler.stage('drift check'):
+            driftRows, driftErrors = dr.check_dtype_drift(existingModels, evaluationsByModel, datasetManager, get_R2_score, hyperparametersDictionary, dataset)
+        dr.print_dtype_drift(driftRows, 'R2 Score', inputParameters.dtype)
+        cms.print_evaluation_errors(modelName, driftErrors)
+
+    # Store the fitted regressors
+    if inputParameters.modelStoreDir is not None:
+        with profiler.stage('storing'):
+            ms.save_models(regressorsDictionary, datasetManager)
+
+    with profiler.stage('prediction'):
+        # Predict from users input
+        if inputParameters.predict is not None:
+            predictLambda = lambda regressor : regressor.predict()
+            predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, regressorsDictionary, inputParameters.predictOnly), predictLambda)
+            cms.print_predictions(datasetManager, predictions, appendToDependentVariablesHeader='Predicted ')
+
+        # Predict from users file, by chunks
+        if inputParameters.predictFile is not None:
+            nbPredictedRows = cms.predict_file(modelName, regressorsDictionary, datasetManager, inputParameters.predictOnly)
+            cms.print_predict_file_summary(modelName, nbPredictedRows, inputParameters.predictOutputFile)
+
+        # Display predictions comparison
+        if inputParameters.showPredictionsFor is not None:
+            predictLambda = lambda regressor : regressor.predictions_relevance()
+            predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, regressorsDictionary, inputParameters.showPredictionsFor), predictLambda)
+            cms.print_predictions(datasetManager, predictions, additionalHeaders=[ "Predicted {0}".format(datasetManager.get_dependent_variable_header()) ])
+
+    return crossValidationEvaluations if inputParameters.cvFolds is not None else evaluations
+
+
+
+def print_evaluations(evaluations, profileColumn=None):
+    # Printing evaluations, with the profile of each regressor if any
+    headers = ["Regression Model", "R2 Score"]
+    evaluationsToPrint = [[evaluation[0], "{:.20f}".format(evaluation[1])] for evaluation in evaluations]
+
+    if profileColumn is not None:
+        headers.append(pr.Profiler.COLUMN_HEADER)
+        evaluationsToPrint = [evaluation + [profile] for evaluation, profile in zip(evaluationsToPrint, profileColumn)]
 
-    # Display predictions comparison
-    if inputParameters.showPredictionsFor is not None:
-        predictLambda = lambda regressor : regressor.predictions_relevance()
-        predictions = cms.predict_from_lambda(cms.get_models_for_prediction(modelName, regressorsDictionary, inputParameters.showPredictionsFor), predictLambda)
-        cms.print_predictions(datasetManager, predictions, additionalHeaders=[ "Predicted {0}".format(datasetManager.get_dependent_variable_header()) ])
+    evaluationsToPrint.insert(0, headers)
+    orr.print_table(evaluationsToPrint)
 
 
 
-def print_evaluations(evaluations):
-    # Printing evaluations
-    for evaluation in evaluations:
-        evaluation[1] = "{:.20f}".format(evaluation[1])
+def print_cross_validation_evaluations(crossValidationEvaluations):
+    # Printing cross-validation evaluations
+    evaluationsToPrint = [[evaluation[0], "{:.20f}".format(evaluation[1]), "{:.20f}".format(evaluation[2])] for evaluation in crossValidationEvaluations]
 
-    predictionTexttable = cms.get_text_table(2)
-    evaluations.insert(0, ["Regression Model", "R2 Score"])
-    predictionTexttable.add_rows(evaluations)
-    print(predictionTexttable.draw())
+    evaluationsToPrint.insert(0, ["Regression Model", "Mean R2 Score", "R2 Score Standard Deviation"])
+    orr.print_table(evaluationsToPrint)
 
 
 
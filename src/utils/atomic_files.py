@@ -0,0 +1,48 @@
+"""atomic_files.py
+~~~~~~~~~~~~~~
+
+The atomic writes of the files and directories shared between runs (dataset cache, results cache, models store, ...).
+A file or directory is written into a temporary one of the same directory first, which then replaces it at once :
+a concurrent run reads either the previous file or the new one, never a partial one, and an interrupted write leaves nothing behind.
+
+Desirable features :
+    - Lock the files written by several runs at the same time, the last one replacing the others for now.
+
+"""
+
+#### Libraries
+import os
+import shutil
+import tempfile
+
+
+
+def write_file(filePath, writeLambda, mode='wb', **openArguments):
+    """Writes the file with 'writeLambda', given the opened temporary file, then moves it to the file path.
+
+    """
+    fileDescriptor, temporaryFilePath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filePath)))
+    try:
+        with os.fdopen(fileDescriptor, mode, **openArguments) as temporaryFile:
+            writeLambda(temporaryFile)
+        os.replace(temporaryFilePath, filePath)
+    except BaseException:
+        if os.path.exists(temporaryFilePath):
+            os.remove(temporaryFilePath)
+        raise
+
+
+
+def write_directory(directoryPath, writeLambda):
+    """Writes the directory with 'writeLambda', given the path of the temporary directory, then moves it to the directory path (replacing the previous one).
+
+    """
+    temporaryDirectory = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(directoryPath)))
+    try:
+        writeLambda(temporaryDirectory)
+        if os.path.isdir(directoryPath):
+            shutil.rmtree(directoryPath)
+        os.replace(temporaryDirectory, directoryPath)
+    except BaseException:
+        shutil.rmtree(temporaryDirectory, ignore_errors=True)
+        raise
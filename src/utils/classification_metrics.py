@@ -0,0 +1,97 @@
+"""classification_metrics.py
+~~~~~~~~~~~~~~
+
+The classification metrics of an evaluation, computed together from one vectorized pass over the test and predicted labels :
+the labels are encoded as positions, then counted by pairs into the N-class confusion matrix (a single 'bincount'),
+from which the accuracy and the per-class precision, recall and F1 score are derived.
+Beyond a few thousands of labels, the confusion matrix is a sparse matrix instead of a dense one.
+
+Desirable features :
+    - Add the weighted averages of the per-class metrics.
+
+"""
+
+#### Libraries
+import numpy as np
+
+# Constants
+# Maximum number of cells of a dense confusion matrix (256 MB of counts), a sparse matrix being used beyond it
+DENSE_CONFUSION_MATRIX_MAX_CELLS = 1 << 25
+# Integer labels spanning less than this range (or than the number of rows) are encoded by offset, without sorting them
+MIN_OFFSET_ENCODING_RANGE = 1 << 16
+
+
+
+def encode_labels(y_test, y_pred):
+    """Returns the sorted labels found in y_test or y_pred, and the positions of the y_test and y_pred labels among them.
+
+    """
+    y_test = np.asarray(y_test).ravel()
+    y_pred = np.asarray(y_pred).ravel()
+
+    # Integer labels of a small range are encoded by offset from the smallest one, which is linear instead of sorting all the labels
+    if len(y_test) > 0 and y_test.dtype.kind in 'iub' and y_pred.dtype.kind in 'iub':
+        y_test = y_test.astype(np.int64, copy=False)
+        y_pred = y_pred.astype(np.int64, copy=False)
+        minLabel = min(y_test.min(), y_pred.min())
+        labelsRange = max(y_test.max(), y_pred.max()) - minLabel + 1
+        if labelsRange <= max(len(y_test), MIN_OFFSET_ENCODING_RANGE):
+            trueOffsets = y_test - minLabel
+            predictedOffsets = y_pred - minLabel
+            isLabel = (np.bincount(trueOffsets, minlength=labelsRange) + np.bincount(predictedOffsets, minlength=labelsRange)) > 0
+            labelsPositions = np.cumsum(isLabel) - 1
+            return np.flatnonzero(isLabel) + minLabel, labelsPositions[trueOffsets], labelsPositions[predictedOffsets]
+
+    labels, labelsPositions = np.unique(np.concatenate((y_test, y_pred)), return_inverse=True)
+    return labels, labelsPositions[:len(y_test)], labelsPositions[len(y_test):]
+
+
+
+def get_confusion_matrix(truePositions, predictedPositions, nbLabels):
+    """Returns the confusion matrix of the encoded labels, the true labels by row and the predicted ones by column.
+    A dense matrix is counted by a single 'bincount' over the pairs of labels, a sparse one (in CSR format) beyond 'DENSE_CONFUSION_MATRIX_MAX_CELLS' cells.
+
+    """
+    if nbLabels * nbLabels <= DENSE_CONFUSION_MATRIX_MAX_CELLS:
+        return np.bincount(truePositions * nbLabels + predictedPositions, minlength=nbLabels * nbLabels).reshape(nbLabels, nbLabels)
+
+    from scipy.sparse import coo_matrix
+
+    # The duplicated pairs of labels are summed on conversion
+    return coo_matrix((np.ones(len(truePositions), dtype=np.int64), (truePositions, predictedPositions)), shape=(nbLabels, nbLabels)).tocsr()
+
+
+
+def get_classification_metrics(y_test, y_pred):
+    """Returns the confusion matrix, the accuracy score and the per-class metrics of the predictions (see 'get_metrics_from_confusion_matrix').
+
+    """
+    labels, truePositions, predictedPositions = encode_labels(y_test, y_pred)
+    return get_metrics_from_confusion_matrix(labels, get_confusion_matrix(truePositions, predictedPositions, len(labels)))
+
+
+
+def get_metrics_from_confusion_matrix(labels, confusionMatrix):
+    """Returns a dictionary of the confusion matrix, the accuracy score, and by label (in the 'labels' order) :
+    the number of true positives, the support (test rows of the label), the precision, the recall and the F1 score.
+    A metric without any row to compute it on (like the precision of a never predicted label) is 0, like scikit-learn.
+
+    """
+    truePositives = np.asarray(confusionMatrix.diagonal(), dtype=np.int64).ravel()
+    support = np.asarray(confusionMatrix.sum(axis=1), dtype=np.int64).ravel()
+    nbPredicted = np.asarray(confusionMatrix.sum(axis=0), dtype=np.int64).ravel()
+
+    precision = np.divide(truePositives, nbPredicted, out=np.zeros(len(labels)), where=nbPredicted > 0)
+    recall = np.divide(truePositives, support, out=np.zeros(len(labels)), where=support > 0)
+    f1Score = np.divide(2 * precision * recall, precision + recall, out=np.zeros(len(labels)), where=precision + recall > 0)
+    nbRows = support.sum()
+    return {'confusionMatrix': confusionMatrix, 'accuracyScore': truePositives.sum() / nbRows if nbRows > 0 else 0.0, 'labels': np.asarray(labels),
+        'truePositives': truePositives, 'support': support, 'precision': precision, 'recall': recall, 'f1Score': f1Score}
+
+
+
+def get_macro_averages(metrics):
+    """Returns the unweighted means over the labels of the precision, the recall and the F1 score.
+
+    """
+    return metrics['precision'].mean(), metrics['recall'].mean(), metrics['f1Score'].mean()
@@ -0,0 +1,93 @@
+"""dataset_cache.py
+~~~~~~~~~~~~~~
+
+A binary cache of the loaded datasets, avoiding to parse the same CSV file at each run.
+The independent variables X and the dependent one y are written as '.npy' files, ordered with the training rows first, then memory-mapped by the next runs.
+Each cache entry is keyed by the dataset file path, size and modification time, and by the columns selection and split input parameters.
+
+Desirable features :
+    - Evict the oldest entries of the cache directory.
+
+"""
+
+#### Libraries
+import numpy as np
+import hashlib
+import json
+import os
+import utils.atomic_files as af
+
+# Constants
+METADATA_FILE_NAME = 'metadata.json'
+X_FILE_NAME = 'X.npy'
+Y_FILE_NAME = 'y.npy'
+ROW_INDEXES_FILE_NAME = 'rowIndexes.npy'
+
+
+
+def get_cache_key(params):
+    """Returns the key of the dataset cache entry, from the dataset file state and the input parameters used for loading it.
+
+    """
+    datasetFilePath = os.path.abspath(params.datasetFilePath)
+    datasetFileStat = os.stat(datasetFilePath)
+    keyElements = [datasetFilePath, datasetFileStat.st_size, datasetFileStat.st_mtime_ns, params.noHeader, params.dependentVariableColumnIndex,\
+        params.independentVariablesStartIndex, params.independentVariablesEndIndex]
+
+    # The arrays are cached split : the split parameters are part of the key, a streamed dataset being split on hashed row indexes
+    keyElements += ['split', params.splitTestSize, params.splitRandomState]
+    if params.chunkSize is not None:
+        keyElements += ['streamed']
+
+    # The arrays are cached in the float type they were loaded with
+    if params.dtype is not None:
+        keyElements += ['dtype', params.dtype]
+
+    return hashlib.sha256(json.dumps(keyElements).encode('utf-8')).hexdigest()
+
+
+
+def get_cache_entry_directory(params):
+    return os.path.join(params.datasetCacheDir, get_cache_key(params))
+
+
+
+def load(params):
+    """Returns the cached dataset as a dictionary of memory-mapped arrays and metadata, or None if it is not cached yet.
+
+    """
+    cacheEntryDirectory = get_cache_entry_directory(params)
+    metadataFilePath = os.path.join(cacheEntryDirectory, METADATA_FILE_NAME)
+    if not os.path.isfile(metadataFilePath):
+        return None
+
+    with open(metadataFilePath, 'r') as metadataFile:
+        cachedDataset = json.load(metadataFile)
+
+    cachedDataset['X'] = np.load(os.path.join(cacheEntryDirectory, X_FILE_NAME), mmap_mode='r')
+    cachedDataset['y'] = np.load(os.path.join(cacheEntryDirectory, Y_FILE_NAME), mmap_mode='r')
+    cachedDataset['rowIndexes'] = np.load(os.path.join(cacheEntryDirectory, ROW_INDEXES_FILE_NAME), mmap_mode='r')
+    return cachedDataset
+
+
+
+def save(params, X, y, allHeaders, rowIndexes, nbTrainingRows):
+    """Writes the dataset arrays into the cache, with their split : the dataset row indexes of X and y, and their number of training rows first.
+    Returns the cache entry directory, or None when the arrays can't be memory-mapped (like text labels).
+
+    """
+    if X.dtype == object or y.dtype == object:
+        return None
+
+    cacheEntryDirectory = get_cache_entry_directory(params)
+    os.makedirs(params.datasetCacheDir, exist_ok=True)
+
+    def write_entry(entryDirectory):
+        np.save(os.path.join(entryDirectory, X_FILE_NAME), X)
+        np.save(os.path.join(entryDirectory, Y_FILE_NAME), y)
+        np.save(os.path.join(entryDirectory, ROW_INDEXES_FILE_NAME), rowIndexes)
+        with open(os.path.join(entryDirectory, METADATA_FILE_NAME), 'w') as metadataFile:
+            json.dump({'allHeaders': allHeaders, 'nbTrainingRows': nbTrainingRows, 'datasetFilePath': os.path.abspath(params.datasetFilePath)}, metadataFile)
+
+    af.write_directory(cacheEntryDirectory, write_entry)
+    return cacheEntryDirectory
@@ -3,9 +3,11 @@
 
 An implementation of generic dataset manager for loading and splitting the dataset into a training and a test sets, based on inputs variables.
 Depending of the regressor type, this class can be also used for feature scaling, still based on initialization variables.
+A big dataset can be streamed by chunks : only the selected columns are kept, and each row is assigned to the training or the test set while reading.
+The loaded dataset can also be cached as binary files, memory-mapped by the next runs instead of parsing the CSV file again.
+The '-dtype' float type is applied from loading, the split, scaled and expanded sets keeping it.
 
 Desirable features :
-    - Read big dataset (chunksize -> TextParser).
     - More flexibility for independent and dependent variables definition.
     - Auto détection if should do feature scaling.
     - Handle missing data.
@@ -14,10 +16,18 @@ Desirable features :
 """
 
 #### Libraries
+# The scikit-learn modules are imported where used, scikit-learn being long to import for the runs not needing it (like '-h' or the dataset conversion)
+import copy
+import os
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 import utils.input_parameters as ip
+import utils.derived_data_cache as ddc
+import utils.dataset_cache as dc
+
+# Constants
+# Float type of the numbers read besides a loaded dataset (streamed chunks, rows to predict), without '-dtype' parameter
+DEFAULT_FLOAT_DTYPE = np.float64
 
 
 
@@ -36,26 +46,243 @@ class DatasetManager:
         self.dependentVariableHeader = None
         self.independentVariablesHeader = None
         self.headersToDisplay = None
-
-    def load_data(self):
+        self.rowIndexes = None
+        self.isSplitWhileLoading = False
+        self.derivedDataCache = ddc.DerivedDataCache(params.derivedDataMaxMemory)
+
+    def __getstate__(self):
+        # Sent to another process (like with each model trained by a process pool), only the split arrays are needed :
+        # the parsed dataset file and the derived data are left out, the headers being read from the dataset file before
+        if self._DatasetManager__dataset is not None:
+            self.get_all_headers()
+        state = self.__dict__.copy()
+        state.pop('_DatasetManager__dataset', None)
+        del state['derivedDataCache']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.derivedDataCache = ddc.DerivedDataCache(self.params.derivedDataMaxMemory)
+
+    def load_data(self, dataset=None):
         """Initialize independent variables tables into X variable, and the dependent one into Y.
+        'dataset' is the DataFrame of the dataset file if it was already parsed (like for several dependent variables of a same file), otherwise the file is read.
+
+        """
+        if self.params.datasetCacheDir is not None and self.load_data_from_cache():
+            return
+
+        if self.params.chunkSize is not None:
+            self.stream_data()
+        else:
+            self._DatasetManager__dataset = dataset if dataset is not None else read_dataset(self.params)
+            
+            self.X, self.y = apply_dtype(self._DatasetManager__dataset.iloc[:, self.params.independentVariablesStartIndex:self.params.independentVariablesEndIndex].values,\
+                self._DatasetManager__dataset.iloc[:, self.params.dependentVariableColumnIndex].values, self.params.dtype)
+
+        if self.params.datasetCacheDir is not None:
+            # X and y are cached already split, so that the next runs only take views of the memory-mapped arrays
+            self.split_data()
+            self.isSplitWhileLoading = True
+            self.save_data_to_cache()
+
+    def load_data_from_cache(self):
+        """Loads X and y as memory-mapped arrays from the binary dataset cache, already ordered with the training rows first.
+        Returns False if the dataset is not cached yet.
+
+        """
+        cachedDataset = dc.load(self.params)
+        if cachedDataset is None:
+            return False
+
+        self.allHeaders = cachedDataset['allHeaders']
+        self.X = cachedDataset['X']
+        self.y = cachedDataset['y']
+        self.rowIndexes = cachedDataset['rowIndexes']
+        self.set_split_views(cachedDataset['nbTrainingRows'])
+        self.isSplitWhileLoading = True
+        return True
+
+    def save_data_to_cache(self):
+        """Writes X and y into the binary dataset cache, with their split.
+        Returns the cache entry directory, or None if the dataset can't be cached.
+
+        """
+        return dc.save(self.params, self.X, self.y, self.get_all_headers(), self.rowIndexes, len(self.y_train))
+
+    def convert_data_to_cache(self):
+        """Loads the dataset, writing it into the binary dataset cache if not done yet.
+        Returns the cache entry directory, or None if the dataset can't be cached (like text values).
+
+        """
+        self.load_data()
+        cacheEntryDirectory = dc.get_cache_entry_directory(self.params)
+        return cacheEntryDirectory if os.path.isdir(cacheEntryDirectory) else None
+
+    def stream_data(self):
+        """Reads the dataset by chunks of 'chunkSize' rows, keeping only the selected columns as typed arrays.
+        Each row is assigned to the training or the test set while reading, so the whole dataset is never held in memory.
+
+        """
+        trainX, trainY, trainRowIndexes = [], [], []
+        testX, testY, testRowIndexes = [], [], []
+        for X, y, rowIndexes, isTestRow in self.read_data_chunks():
+            trainX.append(X[~isTestRow])
+            trainY.append(y[~isTestRow])
+            trainRowIndexes.append(rowIndexes[~isTestRow])
+            testX.append(X[isTestRow])
+            testY.append(y[isTestRow])
+            testRowIndexes.append(rowIndexes[isTestRow])
+
+        self.X = np.concatenate(trainX + testX)
+        self.y = np.concatenate(trainY + testY)
+        self.rowIndexes = np.concatenate(trainRowIndexes + testRowIndexes)
+        self.set_split_views(sum(len(rows) for rows in trainRowIndexes))
+        self.isSplitWhileLoading = True
+
+    def read_data_chunks(self):
+        """Reads the dataset by chunks of 'chunkSize' rows, only parsing the selected columns.
+        Yields, for each chunk, the independent variables, the dependent one, the dataset row indexes and a mask of the rows assigned to the test set.
+
+        """
+        allHeaders = self.get_all_headers()
+        columnsPositions = list(range(len(allHeaders)))
+        independentVariablesPositions = columnsPositions[self.params.independentVariablesStartIndex:self.params.independentVariablesEndIndex]
+        dependentVariablePosition = columnsPositions[self.params.dependentVariableColumnIndex]
+
+        # The parsed columns come in the file order, the selected ones are found back from their positions
+        usedColumnsPositions = sorted(set(independentVariablesPositions + [dependentVariablePosition]))
+        independentVariablesLocations = [usedColumnsPositions.index(position) for position in independentVariablesPositions]
+        dependentVariableLocation = usedColumnsPositions.index(dependentVariablePosition)
+
+        firstRowIndex = 0
+        for chunk in pd.read_csv(self.params.datasetFilePath, header=None if self.params.noHeader else 0, usecols=usedColumnsPositions, chunksize=self.params.chunkSize):
+            values = chunk.to_numpy(dtype=self.get_float_dtype())
+            rowIndexes = np.arange(firstRowIndex, firstRowIndex + len(values))
+            firstRowIndex += len(values)
+            yield values[:, independentVariablesLocations], values[:, dependentVariableLocation], rowIndexes,\
+                is_test_row(rowIndexes, self.params.splitTestSize, self.params.splitRandomState)
+
+    def read_prediction_chunks(self):
+        """Reads the '-predictFile' rows of independent variables by chunks of 'predictChunkSize' rows, from a CSV or a '.npy' binary file.
+        Each chunk is checked at once (number of columns, numeric and finite values), raising an AttributeError on the first invalid row.
+        Yields the independent variables of each chunk, as a two dimensions table.
+
+        """
+        predictFilePath = self.params.predictFile
+        predictChunkSize = self.params.predictChunkSize
+        if predictFilePath.endswith('.npy'):
+            # A memory-mapped binary file, only the slices of the chunks are read
+            allValues = np.load(predictFilePath, mmap_mode='r')
+            chunks = (allValues[start:start + predictChunkSize] for start in range(0, len(allValues), predictChunkSize))
+        else:
+            chunks = (chunk.to_numpy() for chunk in pd.read_csv(predictFilePath, header=None if self.params.noHeader else 0, chunksize=predictChunkSize))
+
+        independentVariablesNumber = self.get_nb_independent_variables()
+        firstRowIndex = 0
+        for chunk in chunks:
+            if chunk.ndim != 2 or chunk.shape[1] != independentVariablesNumber:
+                raise AttributeError("Invalid independent variables rows to predict in '{0}' : {1} columns, expected {2}".format(predictFilePath, chunk.shape[-1], independentVariablesNumber))
+
+            try:
+                values = np.asarray(chunk, dtype=self.get_float_dtype())
+            except (ValueError, TypeError):
+                values = pd.DataFrame(chunk).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=self.get_float_dtype())
+
+            invalidRows = np.flatnonzero(~np.isfinite(values).all(axis=1))
+            if len(invalidRows) > 0:
+                invalidRowIndex = invalidRows[0]
+                raise AttributeError("Invalid independent variables set to predict at row {0} of '{1}' : {2}, expected {3} numbers".format(\
+                    firstRowIndex + invalidRowIndex, predictFilePath, list(chunk[invalidRowIndex]), independentVariablesNumber))
+
+            firstRowIndex += len(values)
+            yield values
+
+    def get_float_dtype(self):
+        """Returns the float type of the numbers read besides the loaded dataset (streamed chunks, rows to predict).
 
         """
-        self._DatasetManager__dataset = pd.read_csv(self.params.datasetFilePath, header=None) if self.params.noHeader else pd.read_csv(self.params.datasetFilePath)
-        
-        self.X = self._DatasetManager__dataset.iloc[:, self.params.independentVariablesStartIndex:self.params.independentVariablesEndIndex].values
-        self.y = self._DatasetManager__dataset.iloc[:, self.params.dependentVariableColumnIndex].values
+        return np.dtype(self.params.dtype) if self.params.dtype is not None else np.dtype(DEFAULT_FLOAT_DTYPE)
+
+    def get_memory_usage(self):
+        """Returns the memory in bytes of X and y, and the memory they would take as float64 (a dependent variable of labels keeping its type).
+
+        """
+        nbBytes = self.X.nbytes + self.y.nbytes
+        nbFloat64Bytes = self.X.size * np.dtype(np.float64).itemsize + (self.y.size * np.dtype(np.float64).itemsize if self.y.dtype.kind == 'f' else self.y.nbytes)
+        return nbBytes, nbFloat64Bytes
 
     def split_data(self):
         """Split independent variables "X" and dependent "y" into training sets (X_train & y_train) and test sets (X_test & y_test).
+        The split is done once, on row indexes : all the models then share the same views of X and y.
+
+        """
+        if self.isSplitWhileLoading:
+            return
+
+        from sklearn.model_selection import train_test_split
+
+        trainPositions, testPositions = train_test_split(np.arange(len(self.y)), test_size = self.params.splitTestSize, random_state = self.params.splitRandomState)
+        self.set_split(trainPositions, testPositions)
+
+    def set_split(self, trainPositions, testPositions):
+        """Reorders X and y once so that the training rows are followed by the test rows,
+        making X_train, X_test, y_train and y_test views (and not copies) of X and y.
+        The dataset row indexes of the training and the test sets are kept into 'trainIndexes' and 'testIndexes'.
 
         """
-        X_train, X_test, y_train, y_test = train_test_split(self.X, self.y, test_size = self.params.splitTestSize, random_state = self.params.splitRandomState)
+        rowsOrder = np.concatenate((trainPositions, testPositions))
+        self.X = self.X[rowsOrder]
+        self.y = self.y[rowsOrder]
+        self.rowIndexes = rowsOrder if self.rowIndexes is None else self.rowIndexes[rowsOrder]
+        self.set_split_views(len(trainPositions))
 
-        self.X_train = X_train
-        self.X_test = X_test
-        self.y_train = y_train
-        self.y_test = y_test
+    def set_split_views(self, nbTrainingRows):
+        """Defines the training and the test sets as views of X and y, already ordered with the training rows first.
+
+        """
+        self.trainIndexes = self.rowIndexes[:nbTrainingRows]
+        self.testIndexes = self.rowIndexes[nbTrainingRows:]
+        self.X_train = self.X[:nbTrainingRows]
+        self.X_test = self.X[nbTrainingRows:]
+        self.y_train = self.y[:nbTrainingRows]
+        self.y_test = self.y[nbTrainingRows:]
+        self.derivedDataCache.clear()
+
+    def get_folds(self, nbFolds, stratified=False):
+        """Returns the K-fold cross-validation folds of X and y, as a list of training and test positions arrays.
+        Stratified folds keep the proportion of each dependent variable label (for classifiers).
+        Computed once and shared read-only by all the models.
+
+        """
+        def compute_folds():
+            from sklearn.model_selection import KFold, StratifiedKFold
+
+            foldsGenerator = StratifiedKFold(n_splits = nbFolds, shuffle = True, random_state = self.params.splitRandomState) if stratified\
+                else KFold(n_splits = nbFolds, shuffle = True, random_state = self.params.splitRandomState)
+            return [(trainPositions, testPositions) for trainPositions, testPositions in foldsGenerator.split(self.X, self.y)]
+
+        return self.derivedDataCache.get(('folds', nbFolds, stratified), compute_folds)
+
+    def get_subset_dataset_manager(self, trainPositions, testPositions):
+        """Returns a new dataset manager, sharing the input parameters and the headers, whose training and test sets are the given positions of X and y.
+        Used for a cross-validation fold or a subsample, it has its own derived data cache.
+
+        """
+        subsetDatasetManager = copy.copy(self)
+        subsetDatasetManager.derivedDataCache = ddc.DerivedDataCache(self.params.derivedDataMaxMemory)
+        subsetDatasetManager.isSplitWhileLoading = False
+        subsetDatasetManager.set_split(trainPositions, testPositions)
+        return subsetDatasetManager
+
+    def get_y_sets(self, twoDimensional=False):
+        """Returns views of y_train and y_test, from one dimension or reshaped to two (one column).
+
+        """
+        if not twoDimensional:
+            return self.y_train, self.y_test
+
+        return self.y_train.reshape(len(self.y_train), 1), self.y_test.reshape(len(self.y_test), 1)
 
     def load_and_split_data(self):
         """Load and split the dataset, from one call.
@@ -64,6 +291,59 @@ class DatasetManager:
         self.load_data()
         self.split_data()
     
+    def get_scaled_independent_variables(self):
+        """Returns the scaler fitted on X_train, the scaled X_train and the scaled X_test.
+        Computed once and shared read-only by all the models.
+
+        """
+        def scale_independent_variables():
+            X_scaler, X_train = do_feature_scaling(self.X_train)
+            return X_scaler, X_train, X_scaler.transform(self.X_test)
+
+        return self.derivedDataCache.get(('scaled_independent_variables',), scale_independent_variables)
+
+    def get_scaled_dependent_variable(self):
+        """Returns the scaler fitted on y_train and the scaled y_train, as a two dimensions table.
+        Computed once and shared read-only by all the models.
+
+        """
+        return self.derivedDataCache.get(('scaled_dependent_variable',), lambda : do_feature_scaling(self.get_y_sets(twoDimensional=True)[0]))
+
+    def get_streamed_statistics(self, collectLabels=False):
+        """Streams the dataset once to incrementally fit the scalers of X and y on the training rows, and to collect the dependent variable labels if asked (for the classifiers).
+        Returns the X scaler, the y scaler and the sorted labels (None if not collected), computed once and shared by all the models of the streaming evaluation.
+
+        """
+        def compute_streamed_statistics():
+            from sklearn.preprocessing import StandardScaler
+
+            X_scaler = StandardScaler()
+            y_scaler = StandardScaler()
+            labels = np.empty(0, dtype=self.get_float_dtype()) if collectLabels else None
+            for X, y, rowIndexes, isTestRow in self.read_data_chunks():
+                if collectLabels:
+                    labels = np.union1d(labels, y)
+                if not isTestRow.all():
+                    X_scaler.partial_fit(X[~isTestRow])
+                    y_scaler.partial_fit(y[~isTestRow].reshape(-1, 1))
+
+            return X_scaler, y_scaler, labels
+
+        return self.derivedDataCache.get(('streamed_statistics', collectLabels), compute_streamed_statistics)
+
+    def get_polynomial_features(self, degree):
+        """Returns the polynomial features transformer of the degree, and the expanded X_train and X_test, always in float64 (in float32, the high degree terms swamp the precision of the low degree ones).
+        Computed once by degree and shared read-only by all the models.
+
+        """
+        def expand_independent_variables():
+            from sklearn.preprocessing import PolynomialFeatures
+
+            polynomialFeatures = PolynomialFeatures(degree = degree)
+            return polynomialFeatures, polynomialFeatures.fit_transform(np.asarray(self.X_train, dtype=np.float64)), polynomialFeatures.transform(np.asarray(self.X_test, dtype=np.float64))
+
+        return self.derivedDataCache.get(('polynomial_features', degree), expand_independent_variables)
+
     def insert_header_to_top(self, elements, appendToDependentVariablesHeader='', additionalHeaders=None):
         headers = self.get_independent_variables_header() + [self.get_dependent_variable_header(appendToDependentVariablesHeader)]
 
@@ -83,6 +363,12 @@ class DatasetManager:
         self.independentVariablesHeader = independentVariablesHeader
         return independentVariablesHeader
 
+    def get_nb_independent_variables(self):
+        """Returns the number of independent variables, known from the headers (so without loading the dataset rows).
+
+        """
+        return len(self.get_independent_variables_header())
+
     def get_dependent_variable_header(self, appendToDependentVariablesHeader=''):
         if(self.dependentVariableHeader is not None):
             return appendToDependentVariablesHeader + self.dependentVariableHeader
@@ -97,7 +383,8 @@ class DatasetManager:
         if(self.allHeaders is not None):
             return self.allHeaders
 
-        allHeaders = list(self._DatasetManager__dataset.columns)
+        allHeaders = list(self._DatasetManager__dataset.columns) if self._DatasetManager__dataset is not None\
+            else list(pd.read_csv(self.params.datasetFilePath, header=None if self.params.noHeader else 0, nrows=0).columns)
         for i in range(len(allHeaders)):
             allHeaders[i] = str(allHeaders[i])
 
@@ -106,13 +393,43 @@ class DatasetManager:
 
 
 
-def reshape_y_set_split_data(datasetManager:DatasetManager):
-    """Reshape the dependent variables set (y, from one dimension to two) and split  the dataset into training sets (X_train & y_train) and test sets (X_test & y_test).
+def apply_dtype(X, y, dtype):
+    """Returns X converted to the float type (X and y unchanged if None), and y converted too if it is continuous (a float column), labels keeping their type.
+
+    """
+    if dtype is None:
+        return X, y
+
+    return X.astype(dtype, copy=False), y.astype(dtype, copy=False) if y.dtype.kind == 'f' else y
+
+
+
+def get_computation_dtype(values):
+    """Returns the float type to compute on the values with : float32 for float32 values, float64 otherwise (without precision loss).
 
     """
-    y = datasetManager.y
-    y = y.reshape(len(y), 1)
-    return train_test_split(datasetManager.X, y, test_size = datasetManager.params.splitTestSize, random_state = datasetManager.params.splitRandomState)
+    return np.dtype(np.float32) if np.asarray(values).dtype == np.float32 else np.dtype(np.float64)
+
+
+
+def read_dataset(params):
+    return pd.read_csv(params.datasetFilePath, header=None) if params.noHeader else pd.read_csv(params.datasetFilePath)
+
+
+
+def is_test_row(rowIndexes, testSize, randomState):
+    """Assigns each row to the test set from a hash of its index, so the assignment is reproducible without knowing the number of rows.
+    Returns a boolean mask, true for the rows of the test set (about 'testSize' of them).
+
+    """
+    # SplitMix64 hash of the row indexes, seeded by the random state (unsigned integers overflows are wanted)
+    with np.errstate(over='ignore'):
+        seed = np.uint64(0x9E3779B97F4A7C15) * np.uint64((randomState or 0) + 1)
+    hashes = rowIndexes.astype(np.uint64) + seed
+    hashes = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = (hashes ^ (hashes >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    hashes = hashes ^ (hashes >> np.uint64(31))
+    return (hashes >> np.uint64(11)) < np.uint64(testSize * (1 << 53))
 
 
 
@@ -121,5 +438,7 @@ def do_feature_scaling(inputTable:pd.DataFrame):
     Returns the scaler and the scaled table.
 
     """
+    from sklearn.preprocessing import StandardScaler
+
     scaler = StandardScaler()
     return scaler, scaler.fit_transform(inputTable)
@@ -0,0 +1,102 @@
+"""derived_data_cache.py
+~~~~~~~~~~~~~~
+
+A keyed cache of the matrices derived from the dataset (scaled sets, polynomial expansions, ...).
+Each entry is computed once on first use, then shared read-only by every regressor or classifier.
+The memory held by the cache is accounted and the least recently used entries are evicted beyond the maximum memory.
+An entry bigger than the maximum memory on its own is kept apart for the whole run, out of the accounting, so that it is still computed only once.
+
+Desirable features :
+    - Spill evicted entries to disk instead of recomputing them.
+
+"""
+
+#### Libraries
+import numpy as np
+from collections import OrderedDict
+import threading
+import utils.profiler as pr
+
+
+
+#### Main DerivedDataCache class
+class DerivedDataCache:
+
+    def __init__(self, maxMemoryInMegabytes=None):
+        """Initialize an empty cache, 'maxMemoryInMegabytes' set to None means no memory limit.
+
+        """
+        self.maxMemory = None if maxMemoryInMegabytes is None else int(maxMemoryInMegabytes * pr.BYTES_PER_MEGABYTE)
+        self.entries = OrderedDict()
+        self.entriesMemory = {}
+        self.memoryUsage = 0
+        self.oversizedEntries = {}
+        self.lock = threading.RLock()
+
+    def __getstate__(self):
+        # The lock can't be pickled (when a model is sent to another process), a new one is created on unpickling
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    def get(self, key, computeLambda):
+        """Returns the entry of the key, computing it through 'computeLambda' on first use.
+        All the numpy arrays of the computed entry are made read-only, because they are shared.
+
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            if key in self.oversizedEntries:
+                return self.oversizedEntries[key]
+
+            value = computeLambda()
+            entryMemory = freeze_and_get_memory(value)
+            if self.maxMemory is not None and entryMemory > self.maxMemory:
+                # Evicting it would make every model compute and keep its own copy : it is shared, but never accounted nor evicted
+                self.oversizedEntries[key] = value
+                return value
+
+            self.entries[key] = value
+            self.entriesMemory[key] = entryMemory
+            self.memoryUsage += entryMemory
+            self.evict_least_recently_used()
+            return value
+
+    def evict_least_recently_used(self):
+        """Removes the least recently used entries until the memory usage fits in the maximum memory.
+
+        """
+        if self.maxMemory is None:
+            return
+
+        while self.memoryUsage > self.maxMemory and self.entries:
+            key, _ = self.entries.popitem(last=False)
+            self.memoryUsage -= self.entriesMemory.pop(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.entriesMemory.clear()
+            self.memoryUsage = 0
+            self.oversizedEntries.clear()
+
+
+
+def freeze_and_get_memory(value):
+    """Makes read-only all the numpy arrays of the value (an array, or a tuple or list of elements) and returns their memory size in bytes.
+
+    """
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value.nbytes
+
+    if isinstance(value, (tuple, list)):
+        return sum(freeze_and_get_memory(element) for element in value)
+
+    return 0
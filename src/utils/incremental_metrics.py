@@ -0,0 +1,77 @@
+"""incremental_metrics.py
+~~~~~~~~~~~~~~
+
+Regression and classification metrics computed batch after batch, for the evaluation of a streamed test set.
+Only a few running statistics are kept : the test set is never held in memory.
+
+"""
+
+#### Libraries
+import numpy as np
+import utils.classification_metrics as cm
+
+
+
+#### Main IncrementalR2Score class
+class IncrementalR2Score:
+
+    def __init__(self):
+        """Initialize the running statistics : number of samples, mean and sum of squared deviations of y_test, and sum of squared errors.
+
+        """
+        self.nbSamples = 0
+        self.mean = 0.0
+        self.sumOfSquaredDeviations = 0.0
+        self.sumOfSquaredErrors = 0.0
+
+    def update(self, y_test, y_pred):
+        """Adds a batch of test and predicted values to the running statistics.
+
+        """
+        y_test = np.asarray(y_test, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+        nbBatchSamples = len(y_test)
+        if nbBatchSamples == 0:
+            return
+
+        # Merging of the batch mean and squared deviations (Chan et al.), more stable than a running sum of squares
+        batchMean = y_test.mean()
+        batchSumOfSquaredDeviations = np.sum((y_test - batchMean) ** 2)
+        nbSamples = self.nbSamples + nbBatchSamples
+        delta = batchMean - self.mean
+        self.mean += delta * nbBatchSamples / nbSamples
+        self.sumOfSquaredDeviations += batchSumOfSquaredDeviations + delta ** 2 * self.nbSamples * nbBatchSamples / nbSamples
+        self.nbSamples = nbSamples
+        self.sumOfSquaredErrors += np.sum((y_test - y_pred) ** 2)
+
+    def get_score(self):
+        """Returns the R2 score of all the batches.
+
+        """
+        return 1.0 - self.sumOfSquaredErrors / self.sumOfSquaredDeviations
+
+
+
+#### Main IncrementalConfusionMatrix class
+class IncrementalConfusionMatrix:
+
+    def __init__(self, labels):
+        """Initialize an empty confusion matrix over the sorted labels of the dependent variable (sparse beyond the dense cells limit of the classification metrics).
+
+        """
+        self.labels = np.sort(np.asarray(labels))
+        noPositions = np.zeros(0, dtype=np.int64)
+        self.confusionMatrix = cm.get_confusion_matrix(noPositions, noPositions, len(self.labels))
+
+    def update(self, y_test, y_pred):
+        """Adds a batch of test and predicted values to the confusion matrix.
+
+        """
+        batchConfusionMatrix = cm.get_confusion_matrix(np.searchsorted(self.labels, y_test), np.searchsorted(self.labels, y_pred), len(self.labels))
+        self.confusionMatrix = self.confusionMatrix + batchConfusionMatrix
+
+    def get_confusion_matrix(self):
+        return self.confusionMatrix
+
+    def get_accuracy_score(self):
+        return self.confusionMatrix.diagonal().sum() / self.confusionMatrix.sum()
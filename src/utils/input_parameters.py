@@ -23,6 +23,49 @@ DEFAULT_INDEPENDENT_VARIABLES_TABLE_FOR_PREDICTION = None
 DEFAULT_MODEL_TYPES_LIST_FOR_PREDICTION = None
 DEFAULT_MODEL_TYPES_LIST_FOR_TEST_AND_PREDICTIONS_SETS_DISPLAY = None
 DEFAULT_PREDICTIONS_LINES_TO_DISPLAY = 10
+DEFAULT_NB_JOBS = 1
+DEFAULT_EXECUTOR_TYPE = None
+EXECUTOR_TYPES = ['serial', 'thread', 'process']
+KNN_INDEX_TYPES = ['auto', 'kd_tree', 'ball_tree', 'brute', 'ivf']
+OUTPUT_FORMATS = ['table', 'csv', 'json', 'markdown']
+DTYPES = ['float64', 'float32']
+DEFAULT_DERIVED_DATA_MAX_MEMORY = 1024
+DEFAULT_CHUNK_SIZE = None
+DEFAULT_DATASET_CACHE_DIRECTORY = None
+DEFAULT_CONVERT_DATASET_ONLY = False
+DEFAULT_STREAMING_EVALUATION = False
+DEFAULT_STREAMING_EPOCHS = 5
+DEFAULT_CROSS_VALIDATION_FOLDS = None
+DEFAULT_TUNE = False
+DEFAULT_TUNE_TIME_BUDGET = 60.0
+DEFAULT_TUNE_CANDIDATES = 27
+DEFAULT_TUNE_REDUCTION_FACTOR = 3
+DEFAULT_RACE = False
+DEFAULT_RACE_RUNGS = 3
+DEFAULT_RACE_CONFIDENCE = 0.95
+DEFAULT_MODEL_STORE_DIRECTORY = None
+DEFAULT_PREDICT_FROM_STORE = False
+DEFAULT_PREDICT_FILE = None
+DEFAULT_PREDICT_OUTPUT_FILE = None
+DEFAULT_PREDICT_CHUNK_SIZE = 100000
+DEFAULT_PROFILE_REPORT_FILE = None
+DEFAULT_PROFILE_TIMES_ONLY = False
+DEFAULT_SHOW_STARTUP_TIME = False
+DEFAULT_POLYNOMIAL_MEMORY_BUDGET = 512
+DEFAULT_APPROXIMATE_KERNEL_ROW_THRESHOLD = 100000
+DEFAULT_KNN_INDEX = 'auto'
+DEFAULT_KNN_PROBED_CELLS = 8
+DEFAULT_KNN_QUERY_JOBS = 1
+DEFAULT_KNN_RECALL_REPORT = False
+DEFAULT_OUTPUT_FORMAT = 'table'
+DEFAULT_GROW_FOREST = False
+DEFAULT_GROW_FOREST_BLOCK_SIZE = 10
+DEFAULT_GROW_FOREST_MAX_TREES = 500
+DEFAULT_GROW_FOREST_TOLERANCE = 0.001
+DEFAULT_RESULT_CACHE_DIRECTORY = None
+DEFAULT_RESULT_CACHE_MAX_SIZE = 1024
+DEFAULT_DTYPE = None
+DEFAULT_DTYPE_DRIFT_CHECK = False
 
 
 
@@ -32,7 +75,21 @@ class InputParameters:
         independentVariablesStartIndex=DEFAULT_INDEPENDENT_VARIABLES_START_INDEX, independentVariablesEndIndex=DEFAULT_INDEPENDENT_VARIABLES_END_INDEX,\
         splitTestSize=DEFAULT_SPLIT_TEST_SIZE, splitRandomState=DEFAULT_SPLIT_RANDOM_STATE, featureScaleDependentVariables=DEFAULT_FEATURE_SCALE_DEPENDENT_VARIABLES,\
         predict=DEFAULT_INDEPENDENT_VARIABLES_TABLE_FOR_PREDICTION, predictOnly=DEFAULT_MODEL_TYPES_LIST_FOR_PREDICTION,\
-        showPredictionsFor=DEFAULT_MODEL_TYPES_LIST_FOR_TEST_AND_PREDICTIONS_SETS_DISPLAY, nbPredictionLinesToShow=DEFAULT_PREDICTIONS_LINES_TO_DISPLAY):
+        showPredictionsFor=DEFAULT_MODEL_TYPES_LIST_FOR_TEST_AND_PREDICTIONS_SETS_DISPLAY, nbPredictionLinesToShow=DEFAULT_PREDICTIONS_LINES_TO_DISPLAY,\
+        nbJobs=DEFAULT_NB_JOBS, executorType=DEFAULT_EXECUTOR_TYPE, derivedDataMaxMemory=DEFAULT_DERIVED_DATA_MAX_MEMORY,\
+        chunkSize=DEFAULT_CHUNK_SIZE, datasetCacheDir=DEFAULT_DATASET_CACHE_DIRECTORY, convertDatasetOnly=DEFAULT_CONVERT_DATASET_ONLY,\
+        streamingEvaluation=DEFAULT_STREAMING_EVALUATION, streamingEpochs=DEFAULT_STREAMING_EPOCHS,\
+        cvFolds=DEFAULT_CROSS_VALIDATION_FOLDS, tune=DEFAULT_TUNE, tuneTimeBudget=DEFAULT_TUNE_TIME_BUDGET, tuneCandidates=DEFAULT_TUNE_CANDIDATES,\
+        tuneReductionFactor=DEFAULT_TUNE_REDUCTION_FACTOR, race=DEFAULT_RACE, raceRungs=DEFAULT_RACE_RUNGS, raceConfidence=DEFAULT_RACE_CONFIDENCE,\
+        modelStoreDir=DEFAULT_MODEL_STORE_DIRECTORY, predictFromStore=DEFAULT_PREDICT_FROM_STORE,\
+        predictFile=DEFAULT_PREDICT_FILE, predictOutputFile=DEFAULT_PREDICT_OUTPUT_FILE, predictChunkSize=DEFAULT_PREDICT_CHUNK_SIZE,\
+        profile=DEFAULT_PROFILE_REPORT_FILE, profileTimesOnly=DEFAULT_PROFILE_TIMES_ONLY, showStartupTime=DEFAULT_SHOW_STARTUP_TIME,\
+        polynomialMemoryBudget=DEFAULT_POLYNOMIAL_MEMORY_BUDGET,\
+        approximateKernelRowThreshold=DEFAULT_APPROXIMATE_KERNEL_ROW_THRESHOLD,\
+        knnIndex=DEFAULT_KNN_INDEX, knnProbedCells=DEFAULT_KNN_PROBED_CELLS, knnQueryJobs=DEFAULT_KNN_QUERY_JOBS, knnRecallReport=DEFAULT_KNN_RECALL_REPORT,\
+        outputFormat=DEFAULT_OUTPUT_FORMAT, growForest=DEFAULT_GROW_FOREST, growForestBlockSize=DEFAULT_GROW_FOREST_BLOCK_SIZE,\
+        growForestMaxTrees=DEFAULT_GROW_FOREST_MAX_TREES, growForestTolerance=DEFAULT_GROW_FOREST_TOLERANCE,\
+        resultCacheDir=DEFAULT_RESULT_CACHE_DIRECTORY, resultCacheMaxSize=DEFAULT_RESULT_CACHE_MAX_SIZE, dtype=DEFAULT_DTYPE, dtypeDriftCheck=DEFAULT_DTYPE_DRIFT_CHECK):
         """Initialize input parameters values.
 
         """
@@ -48,6 +105,45 @@ class InputParameters:
         self.predictOnly = predictOnly
         self.showPredictionsFor = showPredictionsFor
         self.nbPredictionLinesToShow = nbPredictionLinesToShow
+        self.nbJobs = nbJobs
+        self.executorType = executorType
+        self.derivedDataMaxMemory = derivedDataMaxMemory
+        self.chunkSize = chunkSize
+        self.datasetCacheDir = datasetCacheDir
+        self.convertDatasetOnly = convertDatasetOnly
+        self.streamingEvaluation = streamingEvaluation
+        self.streamingEpochs = streamingEpochs
+        self.cvFolds = cvFolds
+        self.tune = tune
+        self.tuneTimeBudget = tuneTimeBudget
+        self.tuneCandidates = tuneCandidates
+        self.tuneReductionFactor = tuneReductionFactor
+        self.race = race
+        self.raceRungs = raceRungs
+        self.raceConfidence = raceConfidence
+        self.modelStoreDir = modelStoreDir
+        self.predictFromStore = predictFromStore
+        self.predictFile = predictFile
+        self.predictOutputFile = predictOutputFile
+        self.predictChunkSize = predictChunkSize
+        self.profile = profile
+        self.profileTimesOnly = profileTimesOnly
+        self.showStartupTime = showStartupTime
+        self.polynomialMemoryBudget = polynomialMemoryBudget
+        self.approximateKernelRowThreshold = approximateKernelRowThreshold
+        self.knnIndex = knnIndex
+        self.knnProbedCells = knnProbedCells
+        self.knnQueryJobs = knnQueryJobs
+        self.knnRecallReport = knnRecallReport
+        self.outputFormat = outputFormat
+        self.growForest = growForest
+        self.growForestBlockSize = growForestBlockSize
+        self.growForestMaxTrees = growForestMaxTrees
+        self.growForestTolerance = growForestTolerance
+        self.resultCacheDir = resultCacheDir
+        self.resultCacheMaxSize = resultCacheMaxSize
+        self.dtype = dtype
+        self.dtypeDriftCheck = dtypeDriftCheck
 
 
 
@@ -61,6 +157,15 @@ def get_input_parameters(modelType, modelCodes):
     # return  InputParameters('src/data/Data-For-Classification.csv')
 
     # Getting parameters from command line
+    argumentParser = get_argument_parser(modelType, modelCodes)
+    return get_input_parameters_from_arguments(argumentParser, argumentParser.parse_args())
+
+
+
+def get_argument_parser(modelType, modelCodes):
+    """Returns the command line parser of all input parameters, other entry points can add their own arguments to it.
+
+    """
     argumentParser = argparse.ArgumentParser(description="Determine the best {0} type to use for a specific dataset.".format(modelType))
     argumentParser.add_argument('dataset', type=str, help='A dataset file path')
     argumentParser.add_argument('-noHeader', action=get_action(DEFAULT_NO_HEADER), help="Indicates that there is no header in the dataset (default: {0})".format(DEFAULT_NO_HEADER))
@@ -78,13 +183,148 @@ def get_input_parameters(modelType, modelCodes):
         help="Define a list of {0}s to display a comparison table of test and predictions values sets (default: {1}, means don't show any comparison table). Here is the complete list of {0}s codes {2}".format(modelType, DEFAULT_MODEL_TYPES_LIST_FOR_TEST_AND_PREDICTIONS_SETS_DISPLAY, modelCodes))
     argumentParser.add_argument('-nbPredictionLinesToShow', type=int, default=DEFAULT_PREDICTIONS_LINES_TO_DISPLAY,\
         help="Indicates the number of lines to display for the comparison table (default: {0}), only applicable with -nbPredictionLinesToShow parameter".format(DEFAULT_PREDICTIONS_LINES_TO_DISPLAY))
-    
-    args = argumentParser.parse_args()
+    argumentParser.add_argument('-jobs', type=int, default=DEFAULT_NB_JOBS,\
+        help="Indicates the number of {0}s to train at the same time, -1 means use all processors (default: {1})".format(modelType, DEFAULT_NB_JOBS))
+    argumentParser.add_argument('-executor', type=str, choices=EXECUTOR_TYPES, default=DEFAULT_EXECUTOR_TYPE,\
+        help="Indicates how the {0}s are trained (default: {1}, means 'serial' for one job and 'process' for several jobs)".format(modelType, DEFAULT_EXECUTOR_TYPE))
+    argumentParser.add_argument('-derivedDataMaxMemory', type=float, default=DEFAULT_DERIVED_DATA_MAX_MEMORY,\
+        help="Indicates the maximum memory in megabytes kept for the matrices shared by all {0}s, like scaled sets (default: {1})".format(modelType, DEFAULT_DERIVED_DATA_MAX_MEMORY))
+    argumentParser.add_argument('-chunkSize', type=int, default=DEFAULT_CHUNK_SIZE,\
+        help="Indicates the number of rows to read at once for streaming a big dataset, only the selected columns are kept and the rows are assigned to the training or the test set while reading (default: {0}, means read the whole dataset at once)".format(DEFAULT_CHUNK_SIZE))
+    argumentParser.add_argument('-datasetCacheDir', type=str, default=DEFAULT_DATASET_CACHE_DIRECTORY,\
+        help="Indicates a directory where the loaded dataset is cached as binary files, already split, memory-mapped by the next runs (default: {0}, means no cache)".format(DEFAULT_DATASET_CACHE_DIRECTORY))
+    argumentParser.add_argument('-convertDatasetOnly', action=get_action(DEFAULT_CONVERT_DATASET_ONLY),\
+        help="Indicates to only convert the dataset into the binary cache, without training any {0}, only applicable with -datasetCacheDir parameter (default: {1})".format(modelType, DEFAULT_CONVERT_DATASET_ONLY))
+    argumentParser.add_argument('-streamingEvaluation', action=get_action(DEFAULT_STREAMING_EVALUATION),\
+        help="Indicates to only train the {0}s able to learn by batches, on the dataset streamed by chunks without holding it in memory, only applicable with -chunkSize parameter (default: {1})".format(modelType, DEFAULT_STREAMING_EVALUATION))
+    argumentParser.add_argument('-streamingEpochs', type=int, default=DEFAULT_STREAMING_EPOCHS,\
+        help="Indicates the number of passes over the streamed training set for the iterative {0}s, only applicable with -streamingEvaluation parameter (default: {1})".format(modelType, DEFAULT_STREAMING_EPOCHS))
+    argumentParser.add_argument('-cvFolds', type=int, default=DEFAULT_CROSS_VALIDATION_FOLDS,\
+        help="Indicates the number of folds for evaluating each {0} by K-fold cross-validation, reporting the mean and the standard deviation of its score (default: {1}, means a single train/test split)".format(modelType, DEFAULT_CROSS_VALIDATION_FOLDS))
+    argumentParser.add_argument('-tune', action=get_action(DEFAULT_TUNE),\
+        help="Indicates to search the best hyperparameters of each {0} by successive halving before evaluating it (default: {1})".format(modelType, DEFAULT_TUNE))
+    argumentParser.add_argument('-tuneTimeBudget', type=float, default=DEFAULT_TUNE_TIME_BUDGET,\
+        help="Indicates the time budget in seconds of the hyperparameters search, shared by all the {0}s, the trainings running at its end being waited for, only applicable with -tune parameter (default: {1})".format(modelType, DEFAULT_TUNE_TIME_BUDGET))
+    argumentParser.add_argument('-tuneCandidates', type=int, default=DEFAULT_TUNE_CANDIDATES,\
+        help="Indicates the maximum number of hyperparameters candidates by {0}, only applicable with -tune parameter (default: {1})".format(modelType, DEFAULT_TUNE_CANDIDATES))
+    argumentParser.add_argument('-tuneReductionFactor', type=int, default=DEFAULT_TUNE_REDUCTION_FACTOR,\
+        help="Indicates the factor by which the candidates are reduced, and the training rows increased, at each successive halving rung, only applicable with -tune parameter (default: {0})".format(DEFAULT_TUNE_REDUCTION_FACTOR))
+    argumentParser.add_argument('-race', action=get_action(DEFAULT_RACE),\
+        help="Indicates to race the {0}s on growing subsamples of the training set, and only train on the whole training set the ones that can still reach the leader (default: {1})".format(modelType, DEFAULT_RACE))
+    argumentParser.add_argument('-raceRungs', type=int, default=DEFAULT_RACE_RUNGS,\
+        help="Indicates the number of subsamples of the race, doubling at each rung up to the half of the training set, only applicable with -race parameter (default: {0})".format(DEFAULT_RACE_RUNGS))
+    argumentParser.add_argument('-raceConfidence', type=float, default=DEFAULT_RACE_CONFIDENCE,\
+        help="Indicates the confidence level of the scores intervals used to drop the {0}s, only applicable with -race parameter (default: {1})".format(modelType, DEFAULT_RACE_CONFIDENCE))
+    argumentParser.add_argument('-modelStoreDir', type=str, default=DEFAULT_MODEL_STORE_DIRECTORY,\
+        help="Indicates a directory where the fitted {0}s are stored, for predicting later without training them again (default: {1}, means no store)".format(modelType, DEFAULT_MODEL_STORE_DIRECTORY))
+    argumentParser.add_argument('-predictFromStore', action=get_action(DEFAULT_PREDICT_FROM_STORE),\
+        help="Indicates to predict with the {0}s stored for the dataset content, without training (the tuned ones with -tune parameter), only applicable with -modelStoreDir and -predict or -predictFile parameters (default: {1})".format(modelType, DEFAULT_PREDICT_FROM_STORE))
+    argumentParser.add_argument('-predictFile', type=str, default=DEFAULT_PREDICT_FILE,\
+        help="Defines a CSV file (with the same header setting as the dataset) or a '.npy' binary file of independent variables rows for prediction, read by chunks (default: {0})".format(DEFAULT_PREDICT_FILE))
+    argumentParser.add_argument('-predictOutputFile', type=str, default=DEFAULT_PREDICT_OUTPUT_FILE,\
+        help="Defines the CSV file where the predictions of the -predictOnly {0}s are written by chunks, only applicable with -predictFile parameter (default: {1})".format(modelType, DEFAULT_PREDICT_OUTPUT_FILE))
+    argumentParser.add_argument('-predictChunkSize', type=int, default=DEFAULT_PREDICT_CHUNK_SIZE,\
+        help="Indicates the number of rows of the -predictFile file predicted at once (default: {0})".format(DEFAULT_PREDICT_CHUNK_SIZE))
+    argumentParser.add_argument('-profile', type=str, default=DEFAULT_PROFILE_REPORT_FILE,\
+        help="Defines a JSON file where the wall time, CPU time and peak memory of each stage and of each {0} are reported, also shown in the evaluation table (default: {1}, means no profiling)".format(modelType, DEFAULT_PROFILE_REPORT_FILE))
+    argumentParser.add_argument('-profileTimesOnly', action=get_action(DEFAULT_PROFILE_TIMES_ONLY),\
+        help="Indicates to profile the wall and CPU times only, without tracing the memory which slows down the profiled code (default: {0})".format(DEFAULT_PROFILE_TIMES_ONLY))
+    argumentParser.add_argument('-showStartupTime', action=get_action(DEFAULT_SHOW_STARTUP_TIME),\
+        help="Indicates to print the startup time, from the libraries imports to the input parameters parsing (default: {0})".format(DEFAULT_SHOW_STARTUP_TIME))
+    argumentParser.add_argument('-polynomialMemoryBudget', type=float, default=DEFAULT_POLYNOMIAL_MEMORY_BUDGET,\
+        help="Indicates the memory in megabytes the polynomial features may take, beyond it they are expanded by blocks and the degree is lowered until the normal equations fit into it (default: {0})".format(DEFAULT_POLYNOMIAL_MEMORY_BUDGET))
+    argumentParser.add_argument('-approximateKernelRowThreshold', type=int, default=DEFAULT_APPROXIMATE_KERNEL_ROW_THRESHOLD,\
+        help="Indicates the number of training rows above which the RBF kernel {0}s are fitted on a Nystroem approximation of the kernel, the speedup and the score difference being probed on a subsample (default: {1})".format(modelType, DEFAULT_APPROXIMATE_KERNEL_ROW_THRESHOLD))
+    # The nearest neighbors index parameters only apply to the K Nearest Neighbors classifier
+    if modelType == 'classifier':
+        argumentParser.add_argument('-knnIndex', type=str, choices=KNN_INDEX_TYPES, default=DEFAULT_KNN_INDEX,\
+            help="Indicates the nearest neighbors index of the K Nearest Neighbors classifier, 'ivf' being an approximate inverted file index of k-means cells, built once and shared (default: {0})".format(DEFAULT_KNN_INDEX))
+        argumentParser.add_argument('-knnProbedCells', type=int, default=DEFAULT_KNN_PROBED_CELLS,\
+            help="Indicates the number of nearest cells searched by a query of the 'ivf' nearest neighbors index, trading recall for latency (default: {0})".format(DEFAULT_KNN_PROBED_CELLS))
+        argumentParser.add_argument('-knnQueryJobs', type=int, default=DEFAULT_KNN_QUERY_JOBS,\
+            help="Indicates the number of threads querying the nearest neighbors index by batches, -1 means use all processors (default: {0})".format(DEFAULT_KNN_QUERY_JOBS))
+        argumentParser.add_argument('-knnRecallReport', action=get_action(DEFAULT_KNN_RECALL_REPORT),\
+            help="Indicates to print the recall versus latency report of the nearest neighbors indexes, on a sample of the test set (default: {0})".format(DEFAULT_KNN_RECALL_REPORT))
+    argumentParser.add_argument('-outputFormat', type=str, choices=OUTPUT_FORMATS, default=DEFAULT_OUTPUT_FORMAT,\
+        help="Indicates the format of the printed results tables, the 'csv' and 'json' ones writing the other messages to the error output (default: {0})".format(DEFAULT_OUTPUT_FORMAT))
+    argumentParser.add_argument('-growForest', action=get_action(DEFAULT_GROW_FOREST),\
+        help="Indicates to grow the random forest {0}s by blocks of trees with warm start, until their out-of-bag score plateaus, and to print their score versus trees curve (default: {1})".format(modelType, DEFAULT_GROW_FOREST))
+    argumentParser.add_argument('-growForestBlockSize', type=int, default=DEFAULT_GROW_FOREST_BLOCK_SIZE,\
+        help="Indicates the number of trees added at once to a growing forest, only applicable with -growForest parameter (default: {0})".format(DEFAULT_GROW_FOREST_BLOCK_SIZE))
+    argumentParser.add_argument('-growForestMaxTrees', type=int, default=DEFAULT_GROW_FOREST_MAX_TREES,\
+        help="Indicates the maximum number of trees of a growing forest, only applicable with -growForest parameter (default: {0})".format(DEFAULT_GROW_FOREST_MAX_TREES))
+    argumentParser.add_argument('-growForestTolerance', type=float, default=DEFAULT_GROW_FOREST_TOLERANCE,\
+        help="Indicates the minimum out-of-bag score improvement of the last blocks of trees for growing further, only applicable with -growForest parameter (default: {0})".format(DEFAULT_GROW_FOREST_TOLERANCE))
+    argumentParser.add_argument('-resultCacheDir', type=str, default=DEFAULT_RESULT_CACHE_DIRECTORY,\
+        help="Indicates a directory where the evaluations and the fitted {0}s are cached, keyed by the dataset content and the {0} configuration, so that the next runs only train the {0}s whose inputs changed (default: {1}, means no cache)".format(modelType, DEFAULT_RESULT_CACHE_DIRECTORY))
+    argumentParser.add_argument('-resultCacheMaxSize', type=float, default=DEFAULT_RESULT_CACHE_MAX_SIZE,\
+        help="Indicates the maximum size in megabytes of the result cache, the least recently used results being evicted beyond it, only applicable with -resultCacheDir parameter (default: {0})".format(DEFAULT_RESULT_CACHE_MAX_SIZE))
+    argumentParser.add_argument('-dtype', type=str, choices=DTYPES, default=DEFAULT_DTYPE,\
+        help="Indicates the float type of the independent variables (and of a continuous dependent variable) from loading, kept through the split, the feature scaling and the {0}s inputs, 'float32' halving their memory (default: {1}, means the types inferred from the dataset, and float64 for a streamed one)".format(modelType, DEFAULT_DTYPE))
+    argumentParser.add_argument('-dtypeDriftCheck', action=get_action(DEFAULT_DTYPE_DRIFT_CHECK),\
+        help="Indicates to evaluate the {0}s again on the dataset loaded as float64, and to print the score drift of the -dtype float type, only applicable with -dtype parameter (default: {1})".format(modelType, DEFAULT_DTYPE_DRIFT_CHECK))
+
+    return argumentParser
+
+
+
+def get_input_parameters_from_arguments(argumentParser, args):
+    """Checks the parsed command line arguments compatibility, then returns the input parameters object.
+
+    """
+    if args.convertDatasetOnly and args.datasetCacheDir is None:
+        argumentParser.error("-convertDatasetOnly requires the -datasetCacheDir parameter")
+    if args.streamingEvaluation and args.chunkSize is None:
+        argumentParser.error("-streamingEvaluation requires the -chunkSize parameter")
+    if args.streamingEvaluation and (args.predict is not None or args.predictFile is not None or args.showPredictionsFor is not None):
+        argumentParser.error("-predict, -predictFile and -showPredictionsFor are not available with -streamingEvaluation parameter")
+    if args.cvFolds is not None and (args.cvFolds < 2 or args.streamingEvaluation):
+        argumentParser.error("-cvFolds requires at least 2 folds, and is not available with -streamingEvaluation parameter")
+    if args.tune and (args.tuneReductionFactor < 2 or args.streamingEvaluation):
+        argumentParser.error("-tune requires a reduction factor of at least 2, and is not available with -streamingEvaluation parameter")
+    if args.race and (args.raceRungs < 1 or not 0 < args.raceConfidence < 1 or args.streamingEvaluation):
+        argumentParser.error("-race requires at least 1 rung and a confidence level between 0 and 1, and is not available with -streamingEvaluation parameter")
+    if args.modelStoreDir is not None and args.streamingEvaluation:
+        argumentParser.error("-modelStoreDir is not available with -streamingEvaluation parameter")
+    if args.predictFromStore and (args.modelStoreDir is None or (args.predict is None and args.predictFile is None)):
+        argumentParser.error("-predictFromStore requires the -modelStoreDir and -predict or -predictFile parameters")
+    if (args.predictFile is None) != (args.predictOutputFile is None) or args.predictChunkSize < 1:
+        argumentParser.error("-predictFile and -predictOutputFile must be given together, and -predictChunkSize requires at least 1 row")
+    if args.polynomialMemoryBudget <= 0:
+        argumentParser.error("-polynomialMemoryBudget must be positive")
+    if args.approximateKernelRowThreshold < 0:
+        argumentParser.error("-approximateKernelRowThreshold can't be negative")
+    # Absent from the regressors arguments
+    knnIndex = getattr(args, 'knnIndex', DEFAULT_KNN_INDEX)
+    knnProbedCells = getattr(args, 'knnProbedCells', DEFAULT_KNN_PROBED_CELLS)
+    knnQueryJobs = getattr(args, 'knnQueryJobs', DEFAULT_KNN_QUERY_JOBS)
+    knnRecallReport = getattr(args, 'knnRecallReport', DEFAULT_KNN_RECALL_REPORT)
+    if knnProbedCells < 1 or knnQueryJobs == 0:
+        argumentParser.error("-knnProbedCells requires at least 1 cell, and -knnQueryJobs can't be 0")
+    if args.growForest and (args.growForestBlockSize < 1 or args.growForestMaxTrees < 1):
+        argumentParser.error("-growForest requires at least 1 tree by block and 1 tree at most")
+    if args.resultCacheMaxSize <= 0:
+        argumentParser.error("-resultCacheMaxSize must be positive")
+    if args.dtypeDriftCheck and (args.dtype is None or args.streamingEvaluation):
+        argumentParser.error("-dtypeDriftCheck requires the -dtype parameter, and is not available with -streamingEvaluation parameter")
 
     return InputParameters(args.dataset, noHeader=args.noHeader, dependentVariableColumnIndex=args.dependentVariableColumnIndex,\
             independentVariablesStartIndex=args.independentVariablesStartIndex, independentVariablesEndIndex=args.independentVariablesEndIndex,\
             splitTestSize=args.splitTestSize, splitRandomState=args.splitRandomState, featureScaleDependentVariables=args.featureScaleDependentVariables,\
-            predict=args.predict, predictOnly=args.predictOnly, showPredictionsFor=args.showPredictionsFor, nbPredictionLinesToShow=args.nbPredictionLinesToShow)
+            predict=args.predict, predictOnly=args.predictOnly, showPredictionsFor=args.showPredictionsFor, nbPredictionLinesToShow=args.nbPredictionLinesToShow,\
+            nbJobs=args.jobs, executorType=args.executor, derivedDataMaxMemory=args.derivedDataMaxMemory,\
+            chunkSize=args.chunkSize, datasetCacheDir=args.datasetCacheDir, convertDatasetOnly=args.convertDatasetOnly,\
+            streamingEvaluation=args.streamingEvaluation, streamingEpochs=args.streamingEpochs,\
+            cvFolds=args.cvFolds, tune=args.tune, tuneTimeBudget=args.tuneTimeBudget, tuneCandidates=args.tuneCandidates, tuneReductionFactor=args.tuneReductionFactor,\
+            race=args.race, raceRungs=args.raceRungs, raceConfidence=args.raceConfidence,\
+            modelStoreDir=args.modelStoreDir, predictFromStore=args.predictFromStore,\
+            predictFile=args.predictFile, predictOutputFile=args.predictOutputFile, predictChunkSize=args.predictChunkSize,\
+            profile=args.profile, profileTimesOnly=args.profileTimesOnly, showStartupTime=args.showStartupTime, polynomialMemoryBudget=args.polynomialMemoryBudget,\
+            approximateKernelRowThreshold=args.approximateKernelRowThreshold,\
+            knnIndex=knnIndex, knnProbedCells=knnProbedCells, knnQueryJobs=knnQueryJobs, knnRecallReport=knnRecallReport,\
+            outputFormat=args.outputFormat, growForest=args.growForest, growForestBlockSize=args.growForestBlockSize,\
+            growForestMaxTrees=args.growForestMaxTrees, growForestTolerance=args.growForestTolerance,\
+            resultCacheDir=args.resultCacheDir, resultCacheMaxSize=args.resultCacheMaxSize, dtype=args.dtype, dtypeDriftCheck=args.dtypeDriftCheck)
 
 
 
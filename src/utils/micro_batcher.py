@@ -0,0 +1,105 @@
+"""micro_batcher.py
+~~~~~~~~~~~~~~
+
+Gathers the prediction requests arriving at the same time for a model, and serves them with a single vectorized prediction.
+Each request is a two dimensions table of independent variables, queued with a future receiving its own predictions.
+A batch is sent to the model as soon as it holds the maximum batch size rows, or when the maximum wait time of its first request is over.
+
+Desirable features :
+    - Adapt the maximum wait time to the requests rate.
+
+"""
+
+#### Libraries
+import numpy as np
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+# Constants
+STOP_REQUEST = None
+
+
+
+#### Main MicroBatcher class
+class MicroBatcher:
+
+    def __init__(self, predictLambda, maxBatchSize, maxBatchWait):
+        """Initialize the batcher of a model and starts its batching thread.
+        'predictLambda' predicts a two dimensions table of independent variables, 'maxBatchWait' is in seconds.
+
+        """
+        self.predictLambda = predictLambda
+        self.maxBatchSize = maxBatchSize
+        self.maxBatchWait = maxBatchWait
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, valuesToPredict):
+        """Queues a two dimensions table of independent variables.
+        Returns a future of its one dimension table of predictions.
+
+        """
+        future = Future()
+        self.requests.put((valuesToPredict, future))
+        return future
+
+    def close(self):
+        self.requests.put(STOP_REQUEST)
+        self.thread.join()
+
+    def run(self):
+        """Batching loop : waits for a first request, gathers the next ones until the batch is full or the wait time is over, then predicts them.
+
+        """
+        pendingRequest = None
+        while True:
+            firstRequest = pendingRequest if pendingRequest is not None else self.requests.get()
+            pendingRequest = None
+            if firstRequest is STOP_REQUEST:
+                return
+
+            batch = [firstRequest]
+            nbRows = len(firstRequest[0])
+            deadline = time.monotonic() + self.maxBatchWait
+            while nbRows < self.maxBatchSize:
+                remainingTime = deadline - time.monotonic()
+                try:
+                    request = self.requests.get(timeout=remainingTime) if remainingTime > 0 else self.requests.get_nowait()
+                except queue.Empty:
+                    break
+
+                # A request exceeding the batch size (or the stop request) waits for the next batch
+                if request is STOP_REQUEST or nbRows + len(request[0]) > self.maxBatchSize:
+                    pendingRequest = request
+                    break
+
+                batch.append(request)
+                nbRows += len(request[0])
+
+            self.predict_batch(batch)
+
+    def predict_batch(self, batch):
+        """Predicts all the rows of the batch at once, then gives back to each request its own predictions.
+
+        """
+        # The cancelled requests are skipped
+        batch = [(values, future) for values, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            valuesToPredict = np.concatenate([values for values, _ in batch]) if len(batch) > 1 else batch[0][0]
+            y_pred = self.predictLambda(valuesToPredict)
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        # Splitting the predictions back, in the order of the requests
+        offset = 0
+        for values, future in batch:
+            future.set_result(y_pred[offset:offset + len(values)])
+            offset += len(values)
@@ -0,0 +1,116 @@
+"""output_renderer.py
+~~~~~~~~~~~~~~
+
+The rendering of the results tables (evaluations, predictions, reports ...) and messages, in one of the output formats :
+    - 'table' : text tables fitted to the terminal width, not limited when the output is not a terminal.
+    - 'csv', 'json' (a JSON object by table and by line) and 'markdown' : written straight to the output stream, without text tables.
+The terminal capabilities are worked out once, by the renderer configured at startup.
+With the 'csv' and 'json' formats, the messages are written to the error stream, so that the output stream only holds the results.
+
+Desirable features :
+    - Add an HTML format.
+
+"""
+
+#### Libraries
+import csv
+import json
+import shutil
+import sys
+from texttable import Texttable
+
+# Constants
+DEFAULT_OUTPUT_FORMAT = 'table'
+# Formats whose output stream only holds the results
+DATA_OUTPUT_FORMATS = ['csv', 'json']
+# Renderer of the printing functions, configured once at startup
+RENDERER = None
+
+
+
+def get_renderer():
+    global RENDERER
+    if RENDERER is None:
+        RENDERER = OutputRenderer()
+
+    return RENDERER
+
+
+
+def set_output_format(outputFormat, stream=None):
+    """Configures the renderer used by all the printing functions, writing to 'stream' (the standard output if None).
+
+    """
+    global RENDERER
+    RENDERER = OutputRenderer(outputFormat, stream)
+
+
+
+def print_table(rows, title=None):
+    """Renders the table (its first row being the header) with the configured renderer, preceded by its title if any.
+
+    """
+    get_renderer().render_table(rows, title)
+
+
+
+def print_message(message):
+    get_renderer().render_message(message)
+
+
+
+#### Main OutputRenderer class
+class OutputRenderer:
+
+    def __init__(self, outputFormat=DEFAULT_OUTPUT_FORMAT, stream=None):
+        """Initialize the renderer of the output format, working out the terminal width once (0 meaning no limit, when the stream is not a terminal).
+
+        """
+        self.outputFormat = outputFormat
+        self.stream = stream if stream is not None else sys.stdout
+        self.isTerminal = self.stream.isatty()
+        self.terminalWidth = shutil.get_terminal_size(fallback=(0, 0)).columns if self.isTerminal else 0
+        self.renderTableLambdas = {'table': self.render_text_table, 'csv': self.render_csv_table, 'json': self.render_json_table, 'markdown': self.render_markdown_table}
+
+    def render_table(self, rows, title=None):
+        rows = [[str(value) for value in row] for row in rows]
+        self.renderTableLambdas[self.outputFormat](rows, title)
+        self.stream.flush()
+
+    def render_message(self, message):
+        print(message, file=sys.stderr if self.outputFormat in DATA_OUTPUT_FORMATS else self.stream, flush=True)
+
+    def render_text_table(self, rows, title):
+        if title is not None:
+            print("\n{0}".format(title), file=self.stream)
+
+        textTable = Texttable(max_width=self.terminalWidth)
+        textTable.set_cols_align(['c'] * len(rows[0]))
+        textTable.set_cols_valign(['m'] * len(rows[0]))
+        textTable.set_cols_dtype(['t'] * len(rows[0]))
+        textTable.add_rows(rows)
+        print(textTable.draw(), file=self.stream)
+
+    def render_csv_table(self, rows, title):
+        # The tables are separated by an empty line, the title being a single value row
+        csvWriter = csv.writer(self.stream, lineterminator='\n')
+        if title is not None:
+            csvWriter.writerow([title])
+
+        csvWriter.writerows(rows)
+        self.stream.write('\n')
+
+    def render_json_table(self, rows, title):
+        print(json.dumps({'title': title, 'header': rows[0], 'rows': rows[1:]}), file=self.stream)
+
+    def render_markdown_table(self, rows, title):
+        if title is not None:
+            print("\n### {0}".format(title), file=self.stream)
+
+        print('', file=self.stream)
+        rows = [[value.replace('|', '\\|').replace('\n', '<br>') for value in row] for row in rows]
+        print("| {0} |".format(" | ".join(rows[0])), file=self.stream)
+        print("|{0}|".format("|".join(['---'] * len(rows[0]))), file=self.stream)
+        for row in rows[1:]:
+            print("| {0} |".format(" | ".join(row)), file=self.stream)
+
@@ -0,0 +1,185 @@
+"""profiler.py
+~~~~~~~~~~~~~~
+
+A profiling layer recording, for each stage of a run and for each stage of each regressor or classifier,
+the wall time, the CPU time of the process and the memory (peak of the Python allocations traced by tracemalloc, and maximum resident set size).
+As tracemalloc slows down the traced code, a profile can record the times only.
+A profile is a plain dictionary, so that the profile of a model trained in another process comes back with the model.
+The profiles are reported as a column of the evaluation table, and as a JSON report.
+
+Desirable features :
+    - Isolate the peak memory of the models trained at the same time by threads.
+
+"""
+
+#### Libraries
+from contextlib import contextmanager
+import json
+import sys
+import threading
+import time
+import tracemalloc
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the resident set size is not reported
+    resource = None
+
+# Constants
+BYTES_PER_MEGABYTE = 1024 * 1024
+# Peaks of the traced memory of the stages being profiled by the current thread, the innermost last
+STAGES_PEAKS = threading.local()
+
+
+
+def new_profile(name=None, traceMemory=True):
+    """Returns an empty profile, 'traceMemory' set to False meaning to record the times only (tracemalloc slowing down the profiled code).
+
+    """
+    return {'name': name, 'stages': {}, 'traceMemory': traceMemory}
+
+
+
+@contextmanager
+def profile_stage(profile, stageName):
+    """Records the wall time, the CPU time and the memory of the enclosed code as the 'stageName' stage of the profile.
+    A profile set to None means no profiling. A stage profiled several times accumulates its times and keeps its maximum memory.
+
+    """
+    if profile is None:
+        yield
+        return
+
+    if not profile.get('traceMemory', True):
+        yield from profile_stage_times(profile, stageName)
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    # The traced memory peak is reset for this stage, the enclosing stages keeping the peak reached so far
+    stagesPeaks = get_stages_peaks()
+    if stagesPeaks:
+        stagesPeaks[-1] = max(stagesPeaks[-1], tracemalloc.get_traced_memory()[1])
+    startMemory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    stagesPeaks.append(startMemory)
+
+    startWallTime = time.perf_counter()
+    startCpuTime = time.process_time()
+    try:
+        yield
+    finally:
+        wallTime = time.perf_counter() - startWallTime
+        cpuTime = time.process_time() - startCpuTime
+        peakMemory = max(stagesPeaks.pop(), tracemalloc.get_traced_memory()[1])
+        if stagesPeaks:
+            stagesPeaks[-1] = max(stagesPeaks[-1], peakMemory)
+
+        stageRecord = profile['stages'].setdefault(stageName, {'calls': 0, 'wallTime': 0.0, 'cpuTime': 0.0, 'peakMemory': 0, 'maxRss': None})
+        stageRecord['calls'] += 1
+        stageRecord['wallTime'] += wallTime
+        stageRecord['cpuTime'] += cpuTime
+        stageRecord['peakMemory'] = max(stageRecord['peakMemory'], peakMemory - startMemory)
+        stageRecord['maxRss'] = get_max_rss()
+
+
+
+def profile_stage_times(profile, stageName):
+    # Recording the wall time and the CPU time only, without tracing the memory
+    startWallTime = time.perf_counter()
+    startCpuTime = time.process_time()
+    try:
+        yield
+    finally:
+        stageRecord = profile['stages'].setdefault(stageName, {'calls': 0, 'wallTime': 0.0, 'cpuTime': 0.0, 'peakMemory': None, 'maxRss': None})
+        stageRecord['calls'] += 1
+        stageRecord['wallTime'] += time.perf_counter() - startWallTime
+        stageRecord['cpuTime'] += time.process_time() - startCpuTime
+        stageRecord['maxRss'] = get_max_rss()
+
+
+
+def get_stages_peaks():
+    if not hasattr(STAGES_PEAKS, 'peaks'):
+        STAGES_PEAKS.peaks = []
+    return STAGES_PEAKS.peaks
+
+
+
+def get_max_rss():
+    """Returns the maximum resident set size of the process in bytes, or None if it is not available.
+
+    """
+    if resource is None:
+        return None
+
+    # Kilobytes on Linux, bytes on macOS
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxRss if sys.platform == 'darwin' else maxRss * 1024
+
+
+
+def format_stage_record(stageRecord):
+    if stageRecord is None:
+        return ''
+
+    if stageRecord['peakMemory'] is None:
+        return "{0:.3f}s / {1:.3f}s / -".format(stageRecord['wallTime'], stageRecord['cpuTime'])
+
+    return "{0:.3f}s / {1:.3f}s / {2:.1f} MB".format(stageRecord['wallTime'], stageRecord['cpuTime'], stageRecord['peakMemory'] / BYTES_PER_MEGABYTE)
+
+
+
+#### Main Profiler class
+class Profiler:
+
+    # Header of the evaluation table column
+    COLUMN_HEADER = "Evaluation Profile (wall / CPU / peak memory)"
+
+    def __init__(self, reportFilePath=None, traceMemory=True):
+        """Initialize the profiler of a run, 'reportFilePath' set to None means no profiling, and 'traceMemory' set to False means to profile the times only.
+
+        """
+        self.reportFilePath = reportFilePath
+        self.isEnabled = reportFilePath is not None
+        self.profile = new_profile(traceMemory=traceMemory) if self.isEnabled else None
+        self.modelsProfiles = {}
+
+    def stage(self, stageName):
+        return profile_stage(self.profile, stageName)
+
+    def record_stage(self, stageName, wallTime):
+        """Records a stage measured apart, like the startup (its CPU time being the one of the process so far).
+
+        """
+        if self.isEnabled:
+            self.profile['stages'][stageName] = {'calls': 1, 'wallTime': wallTime, 'cpuTime': time.process_time(), 'peakMemory': None, 'maxRss': get_max_rss()}
+
+    def add_models_profiles(self, modelsDictionary):
+        """Keeps the profiles of the evaluated models of the dictionary, by model code.
+
+        """
+        for modelCode, model in modelsDictionary.items():
+            if model.profile is not None:
+                self.modelsProfiles[modelCode] = model.profile
+
+    def get_evaluations_column(self, evaluations):
+        """Returns the formatted 'evaluation' stage of the model of each evaluation (in the same order), or None if profiling is disabled.
+
+        """
+        if not self.isEnabled:
+            return None
+
+        profilesByName = {profile['name']: profile for profile in self.modelsProfiles.values()}
+        return [format_stage_record(profilesByName.get(evaluation[0], new_profile())['stages'].get('evaluation')) for evaluation in evaluations]
+
+    def write_report(self):
+        """Writes the JSON report of the run stages and of the models stages, if profiling is enabled.
+
+        """
+        if not self.isEnabled:
+            return
+
+        with open(self.reportFilePath, 'w') as reportFile:
+            json.dump({'stages': self.profile['stages'], 'models': self.modelsProfiles, 'maxRss': get_max_rss()}, reportFile, indent=2)
@@ -0,0 +1,40 @@
+"""conftest.py
+~~~~~~~~~~~~~~
+
+The tests import the modules like the scripts of the 'src' directory do, from it, and share the random datasets fixture.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+
+
+@pytest.fixture
+def dataset_manager_factory(tmp_path):
+    """Returns a function writing a random CSV dataset of 'nbRows' rows and 'nbColumns' independent variables,
+    then returning its loaded and split dataset manager, with the given input parameters.
+    The dependent variable is a linear function of the independent ones plus noise, or its sign (as 0 or 1 labels) for a classification dataset.
+
+    """
+    def get_dataset_manager(nbRows=200, nbColumns=3, classification=False, randomState=0, **parameters):
+        import utils.dataset_manager as dm
+        import utils.input_parameters as ip
+
+        randomGenerator = np.random.default_rng(randomState)
+        X = randomGenerator.normal(size=(nbRows, nbColumns))
+        y = X @ np.arange(1, nbColumns + 1) + randomGenerator.normal(scale=0.1, size=nbRows)
+        y = (y > 0).astype(int) if classification else y
+        datasetFilePath = tmp_path / 'dataset{0}.csv'.format(randomState)
+        np.savetxt(datasetFilePath, np.column_stack((X, y)), delimiter=',', header=','.join(['x{0}'.format(column) for column in range(nbColumns)] + ['y']), comments='')
+
+        datasetManager = dm.DatasetManager(ip.InputParameters(str(datasetFilePath), **parameters))
+        datasetManager.load_and_split_data()
+        return datasetManager
+
+    return get_dataset_manager
@@ -0,0 +1,49 @@
+"""test_approximate_kernel.py
+~~~~~~~~~~~~~~
+
+The Nystroem approximation of the RBF kernel beyond the rows threshold, its score close to the exact models one, and its probe computed once.
+
+"""
+
+#### Libraries
+import pytest
+from sklearn.svm import SVC, SVR
+import models.common.approximate_kernel as ak
+from models.classifiers.kernel_svm_classification import KernelSvmClassifier
+from models.regressors.support_vector_regression import SupportVectorRegressor
+import classification_model_selection as clms
+import regression_model_selection as rms
+
+
+
+@pytest.mark.parametrize('modelClass, classification', [(SupportVectorRegressor, False), (KernelSvmClassifier, True)])
+def test_exact_kernel_under_the_rows_threshold(dataset_manager_factory, modelClass, classification):
+    datasetManager = dataset_manager_factory(nbRows=1000, classification=classification, approximateKernelRowThreshold=1000)
+    model = modelClass(datasetManager)
+    model.evaluate()
+
+    assert model.approximateDuration is None
+    assert isinstance(model.regressor if not classification else model.classifier, SVR if not classification else SVC)
+
+
+
+@pytest.mark.parametrize('modelClass, classification, scoreLambda, maxScoreDifference',\
+    [(SupportVectorRegressor, False, rms.get_R2_score, 0.02), (KernelSvmClassifier, True, clms.get_accuracy_score, 0.03)])
+def test_approximate_kernel_beyond_the_rows_threshold(dataset_manager_factory, modelClass, classification, scoreLambda, maxScoreDifference):
+    datasetManager = dataset_manager_factory(nbRows=2000, classification=classification, approximateKernelRowThreshold=500)
+    model = modelClass(datasetManager)
+    score = scoreLambda(model.evaluate())
+
+    approximateModel = model.regressor if not classification else model.classifier
+    nystroem = approximateModel.steps[0][1]
+    _, X_train, _ = datasetManager.get_scaled_independent_variables()
+    assert model.approximateDuration is not None
+    assert nystroem.n_components == ak.NB_COMPONENTS
+    assert nystroem.gamma == pytest.approx(1.0 / (X_train.shape[1] * X_train.var()))
+
+    # The probe fits the exact model on all the training rows (fewer than the probe rows), once for the model class and hyperparameters
+    probe = model.probe_approximation()
+    assert probe['nbProbeRows'] == len(datasetManager.y_train)
+    assert abs(probe['scoreDifference']) < maxScoreDifference
+    assert modelClass(datasetManager).probe_approximation() is probe
+    assert score > 0.9
@@ -0,0 +1,41 @@
+"""test_atomic_files.py
+~~~~~~~~~~~~~~
+
+The atomic writes of the shared files and directories, an interrupted write keeping the previous version.
+
+"""
+
+#### Libraries
+import os
+import pytest
+import utils.atomic_files as af
+
+
+
+def interrupt_write(_):
+    raise KeyboardInterrupt
+
+
+
+def test_interrupted_file_write_keeps_the_previous_file(tmp_path):
+    filePath = str(tmp_path / 'result.txt')
+    af.write_file(filePath, lambda file: file.write('previous'), 'w')
+    with pytest.raises(KeyboardInterrupt):
+        af.write_file(filePath, interrupt_write, 'w')
+
+    with open(filePath, 'r') as file:
+        assert file.read() == 'previous'
+    assert os.listdir(tmp_path) == ['result.txt']
+
+
+
+def test_directory_write_replaces_the_previous_directory(tmp_path):
+    directoryPath = str(tmp_path / 'entry')
+    af.write_directory(directoryPath, lambda directory: open(os.path.join(directory, 'previous.npy'), 'w').close())
+    with pytest.raises(KeyboardInterrupt):
+        af.write_directory(directoryPath, interrupt_write)
+    assert os.listdir(directoryPath) == ['previous.npy']
+
+    af.write_directory(directoryPath, lambda directory: open(os.path.join(directory, 'new.npy'), 'w').close())
+    assert os.listdir(directoryPath) == ['new.npy']
+    assert os.listdir(tmp_path) == ['entry']
@@ -0,0 +1,61 @@
+"""test_batch_model_selection.py
+~~~~~~~~~~~~~~
+
+The parsing of the batch manifest into the input parameters of each run and target.
+
+"""
+
+#### Libraries
+import pytest
+import batch_model_selection as bms
+
+
+
+@pytest.fixture
+def manifest_directory(tmp_path):
+    (tmp_path / 'data').mkdir()
+    for datasetFileName in ['regression.csv', 'classification.csv']:
+        (tmp_path / 'data' / datasetFileName).write_text("a,b,c,y\n1,2,3,4\n")
+    return str(tmp_path)
+
+
+
+def test_command_line_arguments_of_the_parameters():
+    parameters = {'splitTestSize': 0.25, 'noHeader': True, 'tune': False, 'profile': None, 'predictOnly': ['MLR', 'SVR'], 'predict': [[1, 2], [3, 4]]}
+    assert bms.get_command_line_arguments(parameters) == ['-splitTestSize', '0.25', '-noHeader', '-predictOnly', 'MLR', 'SVR', '-predict', '1', '2', '-predict', '3', '4']
+
+
+
+def test_runs_parameters_of_each_target(manifest_directory):
+    manifest = {
+        'parameters': {'splitTestSize': 0.25, 'splitRandomState': 1, 'jobs': 8},
+        'runs': [
+            {'modelType': 'regressor', 'dataset': 'data/regression.csv', 'parameters': {'splitRandomState': 2},
+             'targets': [-1, {'dependentVariableColumnIndex': 0, 'independentVariablesStartIndex': 1, 'splitRandomState': 3}]},
+            {'modelType': 'classifier', 'dataset': 'data/classification.csv'}
+        ]
+    }
+    runsParameters = bms.get_runs_parameters(manifest, manifest_directory, 2, 'thread')
+
+    assert [modelType for modelType, _ in runsParameters] == ['regressor', 'regressor', 'classifier']
+    firstTarget, secondTarget, classificationRun = [inputParameters for _, inputParameters in runsParameters]
+    assert firstTarget.datasetFilePath.endswith('regression.csv') and classificationRun.datasetFilePath.endswith('classification.csv')
+
+    # The common parameters are overridden by the run ones, then by the target ones, the shared pool ones being forced
+    assert (firstTarget.dependentVariableColumnIndex, firstTarget.splitRandomState, firstTarget.splitTestSize) == (-1, 2, 0.25)
+    assert (secondTarget.dependentVariableColumnIndex, secondTarget.independentVariablesStartIndex, secondTarget.splitRandomState) == (0, 1, 3)
+    assert (classificationRun.splitRandomState, classificationRun.splitTestSize) == (1, 0.25)
+    assert all((inputParameters.nbJobs, inputParameters.executorType) == (2, 'thread') for _, inputParameters in runsParameters)
+
+
+
+def test_invalid_manifests_are_rejected_before_any_run(manifest_directory):
+    with pytest.raises(AttributeError, match="Invalid model type"):
+        bms.get_runs_parameters({'runs': [{'modelType': 'clusterer', 'dataset': 'data/regression.csv'}]}, manifest_directory, 1, 'serial')
+
+    with pytest.raises(FileNotFoundError):
+        bms.get_runs_parameters({'runs': [{'dataset': 'data/missing.csv'}]}, manifest_directory, 1, 'serial')
+
+    # Checked by the command line parser of the model selection
+    with pytest.raises(SystemExit):
+        bms.get_runs_parameters({'runs': [{'dataset': 'data/regression.csv', 'parameters': {'splitTestSize': 'half'}}]}, manifest_directory, 1, 'serial')
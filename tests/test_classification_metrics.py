@@ -0,0 +1,69 @@
+"""test_classification_metrics.py
+~~~~~~~~~~~~~~
+
+The classification metrics, compared with the scikit-learn ones.
+
+"""
+
+#### Libraries
+from collections import Counter
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
+import utils.classification_metrics as cm
+
+
+
+def get_predictions(labels, nbRows, accuracy, randomState=0):
+    # Test labels drawn among the labels, a proportion of them predicted right and the others drawn again
+    randomGenerator = np.random.default_rng(randomState)
+    y_test = labels[randomGenerator.integers(len(labels), size=nbRows)]
+    y_pred = np.where(randomGenerator.random(nbRows) < accuracy, y_test, labels[randomGenerator.integers(len(labels), size=nbRows)])
+    return y_test, y_pred
+
+
+
+def assert_metrics_equal(metrics, y_test, y_pred):
+    labels = np.unique(np.concatenate((y_test, y_pred)))
+    precision, recall, f1Score, support = precision_recall_fscore_support(y_test, y_pred, labels=labels, zero_division=0)
+    np.testing.assert_array_equal(metrics['labels'], labels)
+    assert metrics['accuracyScore'] == pytest.approx(accuracy_score(y_test, y_pred))
+    np.testing.assert_array_equal(metrics['support'], support)
+    np.testing.assert_allclose(metrics['precision'], precision)
+    np.testing.assert_allclose(metrics['recall'], recall)
+    np.testing.assert_allclose(metrics['f1Score'], f1Score)
+
+
+
+@pytest.mark.parametrize('labels', [np.array([0, 1]), np.arange(-3, 7), np.array([10, 1000, 100000]), np.array(['a', 'b', 'c', 'd'])])
+def test_dense_metrics(labels):
+    y_test, y_pred = get_predictions(labels, 2000, 0.7)
+    metrics = cm.get_classification_metrics(y_test, y_pred)
+
+    assert isinstance(metrics['confusionMatrix'], np.ndarray)
+    np.testing.assert_array_equal(metrics['confusionMatrix'], confusion_matrix(y_test, y_pred, labels=metrics['labels']))
+    assert_metrics_equal(metrics, y_test, y_pred)
+
+
+
+def test_never_predicted_label():
+    y_test = np.array([0, 1, 2, 2])
+    y_pred = np.array([0, 0, 2, 2])
+    assert_metrics_equal(cm.get_classification_metrics(y_test, y_pred), y_test, y_pred)
+
+
+
+@pytest.mark.parametrize('labels', [np.arange(7000), np.array(["class{0}".format(label) for label in range(7000)])])
+def test_sparse_metrics_of_many_classes(labels):
+    y_test, y_pred = get_predictions(labels, 50000, 0.6)
+    metrics = cm.get_classification_metrics(y_test, y_pred)
+
+    # Beyond the dense cells limit, the confusion matrix is sparse (its dense scikit-learn reference would take 392 MB)
+    confusionMatrix = metrics['confusionMatrix']
+    assert len(metrics['labels']) ** 2 > cm.DENSE_CONFUSION_MATRIX_MAX_CELLS
+    assert not isinstance(confusionMatrix, np.ndarray)
+    labelsPositions = {label: position for position, label in enumerate(metrics['labels'])}
+    pairsCounts = Counter((labelsPositions[trueLabel], labelsPositions[predictedLabel]) for trueLabel, predictedLabel in zip(y_test, y_pred))
+    confusionMatrix = confusionMatrix.tocoo()
+    assert dict(zip(zip(confusionMatrix.row.tolist(), confusionMatrix.col.tolist()), confusionMatrix.data.tolist())) == pairsCounts
+    assert_metrics_equal(metrics, y_test, y_pred)
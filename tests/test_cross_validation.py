@@ -0,0 +1,76 @@
+"""test_cross_validation.py
+~~~~~~~~~~~~~~
+
+The K-fold cross-validation of the models, compared with the scikit-learn one, whatever the executor of the model x fold grid.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold, cross_val_score
+import models.common.common_model_selection as cms
+import utils.profiler as pr
+import regression_model_selection as rms
+
+# Constants
+NB_FOLDS = 5
+
+
+
+#### Failing model class
+class FailingRegressor:
+
+    def __init__(self, datasetManager):
+        self.datasetManager = datasetManager
+        self.profile = None
+
+    def set_hyperparameters(self, hyperparameters):
+        pass
+
+    def profile_stage(self, stageName):
+        return pr.profile_stage(None, stageName)
+
+    def evaluate(self):
+        raise ValueError("Invalid fold")
+
+
+
+def test_folds_partition_the_rows(dataset_manager_factory):
+    datasetManager = dataset_manager_factory(nbRows=503, classification=True)
+    for stratified in (False, True):
+        folds = datasetManager.get_folds(NB_FOLDS, stratified)
+        assert len(folds) == NB_FOLDS
+        np.testing.assert_array_equal(np.sort(np.concatenate([testPositions for _, testPositions in folds])), np.arange(503))
+        for trainPositions, testPositions in folds:
+            assert len(np.intersect1d(trainPositions, testPositions)) == 0 and len(trainPositions) + len(testPositions) == 503
+
+    # Computed once and shared
+    assert datasetManager.get_folds(NB_FOLDS, True) is folds
+    labelsProportion = datasetManager.y.mean()
+    for _, testPositions in folds:
+        assert datasetManager.y[testPositions].mean() == pytest.approx(labelsProportion, abs=0.02)
+
+
+
+@pytest.mark.parametrize('executorType', ['serial', 'thread', 'process'])
+def test_cross_validation_matches_scikit_learn(dataset_manager_factory, executorType):
+    datasetManager = dataset_manager_factory(nbRows=300)
+    modelsClasses = cms.import_models(rms.EXISTING_REGRESSORS, ['MLR', 'DTR'])
+    evaluations, errors = cms.cross_validate_and_sort_models(modelsClasses, datasetManager, rms.get_R2_score, NB_FOLDS, nbJobs=2, executorType=executorType)
+
+    assert not errors
+    assert [evaluation[0] for evaluation in evaluations] == ["Multiple Linear Regression", "Decision Tree Regression"]
+    scores = cross_val_score(LinearRegression(), datasetManager.X, datasetManager.y, scoring='r2',\
+        cv=KFold(n_splits=NB_FOLDS, shuffle=True, random_state=datasetManager.params.splitRandomState))
+    assert evaluations[0][1:] == pytest.approx([scores.mean(), scores.std()])
+
+
+
+def test_model_failing_on_a_fold_is_in_error(dataset_manager_factory):
+    modelsClasses = {**cms.import_models(rms.EXISTING_REGRESSORS, ['MLR']), 'FAIL': FailingRegressor}
+    evaluations, errors = cms.cross_validate_and_sort_models(modelsClasses, dataset_manager_factory(), rms.get_R2_score, NB_FOLDS)
+
+    assert [evaluation[0] for evaluation in evaluations] == ["Multiple Linear Regression"]
+    assert errors == {'FAIL': "Fold 1, ValueError: Invalid fold"}
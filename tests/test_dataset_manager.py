@@ -0,0 +1,73 @@
+"""test_dataset_manager.py
+~~~~~~~~~~~~~~
+
+The hashed assignment of the rows to the test set.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+import pickle
+import utils.dataset_manager as dm
+import utils.input_parameters as ip
+
+
+
+@pytest.mark.parametrize('testSize', [0.1, 0.25, 0.5])
+def test_is_test_row_proportion(testSize):
+    isTestRow = dm.is_test_row(np.arange(200000), testSize, 0)
+    assert isTestRow.mean() == pytest.approx(testSize, abs=0.01)
+
+
+
+def test_is_test_row_is_reproducible_by_chunks():
+    rowIndexes = np.arange(10000)
+    isTestRow = dm.is_test_row(rowIndexes, 0.25, 42)
+
+    # The assignment of a row only depends on its index and on the random state
+    np.testing.assert_array_equal(np.concatenate([dm.is_test_row(chunk, 0.25, 42) for chunk in np.array_split(rowIndexes, 7)]), isTestRow)
+    assert not np.array_equal(dm.is_test_row(rowIndexes, 0.25, 43), isTestRow)
+    assert dm.is_test_row(rowIndexes, 0.0, 42).sum() == 0
+    assert dm.is_test_row(rowIndexes, 1.0, 42).all()
+
+
+
+@pytest.mark.parametrize('chunkSize', [None, 100])
+def test_cached_dataset_is_split_into_views(tmp_path, chunkSize):
+    datasetFilePath = tmp_path / 'dataset.csv'
+    values = np.random.default_rng(0).normal(size=(1000, 4))
+    np.savetxt(datasetFilePath, values, delimiter=',', header='a,b,c,y', comments='')
+    params = ip.InputParameters(str(datasetFilePath), chunkSize=chunkSize, datasetCacheDir=str(tmp_path / 'cache'))
+
+    # The first run parses the CSV file and caches the split arrays, the next one memory-maps them
+    parsedDatasetManager = dm.DatasetManager(params)
+    parsedDatasetManager.load_and_split_data()
+    cachedDatasetManager = dm.DatasetManager(params)
+    cachedDatasetManager.load_and_split_data()
+
+    assert isinstance(cachedDatasetManager.X, np.memmap)
+    for setName in ['X_train', 'X_test', 'y_train', 'y_test', 'trainIndexes', 'testIndexes']:
+        cachedSet = getattr(cachedDatasetManager, setName)
+        np.testing.assert_array_equal(cachedSet, getattr(parsedDatasetManager, setName))
+        assert isinstance(cachedSet, np.memmap)
+    np.testing.assert_allclose(cachedDatasetManager.X_train, values[cachedDatasetManager.trainIndexes, :3])
+
+
+
+def test_pickled_dataset_manager_only_holds_the_split_arrays(dataset_manager_factory):
+    datasetManager = dataset_manager_factory(nbRows=1000)
+    datasetManager.get_scaled_independent_variables()
+    assert datasetManager._DatasetManager__dataset is not None
+
+    # Like for a model sent to a process pool
+    unpickledDatasetManager = pickle.loads(pickle.dumps(datasetManager))
+    assert unpickledDatasetManager._DatasetManager__dataset is None
+    assert unpickledDatasetManager.derivedDataCache.memoryUsage == 0
+    assert unpickledDatasetManager.get_all_headers() == datasetManager.get_all_headers()
+    np.testing.assert_array_equal(unpickledDatasetManager.X_train, datasetManager.X_train)
+    np.testing.assert_array_equal(unpickledDatasetManager.y_test, datasetManager.y_test)
+
+    # The shared dataset manager keeps its parsed dataset and its derived data
+    assert datasetManager._DatasetManager__dataset is not None
+    assert datasetManager.derivedDataCache.memoryUsage > 0
@@ -0,0 +1,65 @@
+"""test_derived_data_cache.py
+~~~~~~~~~~~~~~
+
+The derived matrices shared by the models, their eviction and the entries too big for the maximum memory.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+import utils.derived_data_cache as ddc
+import utils.profiler as pr
+from models.classifiers.logistic_regression_classification import LogisticRegressionClassifier
+from models.classifiers.naive_bayes_classification import NaiveBayesClassifier
+
+# Constants
+ENTRY_SIZE = 1000
+
+
+
+def get_entry():
+    return np.zeros(ENTRY_SIZE // 8)
+
+
+
+def test_least_recently_used_entries_are_evicted():
+    derivedDataCache = ddc.DerivedDataCache(2.5 * ENTRY_SIZE / pr.BYTES_PER_MEGABYTE)
+    firstEntry = derivedDataCache.get('first', get_entry)
+    derivedDataCache.get('second', get_entry)
+    # The first entry is used again, the second one becomes the least recently used
+    assert derivedDataCache.get('first', get_entry) is firstEntry
+    derivedDataCache.get('third', get_entry)
+
+    assert list(derivedDataCache.entries) == ['first', 'third']
+    assert derivedDataCache.memoryUsage == 2 * ENTRY_SIZE
+    assert not firstEntry.flags.writeable
+
+
+
+def test_oversized_entry_is_computed_once():
+    derivedDataCache = ddc.DerivedDataCache(0.5 * ENTRY_SIZE / pr.BYTES_PER_MEGABYTE)
+    nbComputations = []
+    def compute_entry():
+        nbComputations.append(1)
+        return get_entry()
+
+    oversizedEntry = derivedDataCache.get('oversized', compute_entry)
+    assert derivedDataCache.get('oversized', compute_entry) is oversizedEntry
+    assert len(nbComputations) == 1
+    assert derivedDataCache.memoryUsage == 0
+
+    derivedDataCache.clear()
+    assert derivedDataCache.get('oversized', compute_entry) is not oversizedEntry
+
+
+
+@pytest.mark.parametrize('derivedDataMaxMemory', [None, 1e-6])
+def test_models_share_the_scaled_sets(dataset_manager_factory, derivedDataMaxMemory):
+    datasetManager = dataset_manager_factory(classification=True, derivedDataMaxMemory=derivedDataMaxMemory)
+    firstModel = LogisticRegressionClassifier(datasetManager)
+    secondModel = NaiveBayesClassifier(datasetManager)
+
+    assert secondModel.X_train is firstModel.X_train
+    assert secondModel.X_test is firstModel.X_test
+    assert secondModel.X_scaler is firstModel.X_scaler
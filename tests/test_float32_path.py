@@ -0,0 +1,44 @@
+"""test_float32_path.py
+~~~~~~~~~~~~~~
+
+The '-dtype float32' training path : the arrays stay float32 from the loading to the models inputs, the polynomial expansion excepted.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+from models.classifiers.logistic_regression_classification import LogisticRegressionClassifier
+from models.regressors.polynomial_regression import PolynomialRegressor
+
+
+
+def test_arrays_stay_float32(dataset_manager_factory):
+    datasetManager = dataset_manager_factory(dtype='float32')
+    for values in [datasetManager.X, datasetManager.y, datasetManager.X_train, datasetManager.X_test, datasetManager.y_train, datasetManager.y_test]:
+        assert values.dtype == np.float32
+
+    _, X_train, X_test = datasetManager.get_scaled_independent_variables()
+    _, y_train = datasetManager.get_scaled_dependent_variable()
+    assert X_train.dtype == X_test.dtype == y_train.dtype == np.float32
+
+    classificationDatasetManager = dataset_manager_factory(classification=True, dtype='float32')
+    classifier = LogisticRegressionClassifier(classificationDatasetManager)
+    assert classifier.X_train.dtype == classifier.X_test.dtype == np.float32
+
+
+
+def test_polynomial_features_are_expanded_in_float64(dataset_manager_factory):
+    # Values around 1000, like the ambient pressure : their 4th power swamps the float32 precision of the low degree terms
+    evaluations = {}
+    for dtype in ['float32', None]:
+        datasetManager = dataset_manager_factory(nbRows=500, dtype=dtype)
+        datasetManager.X_train = np.asarray(datasetManager.X_train) + np.asarray(1000, dtype=datasetManager.X_train.dtype)
+        datasetManager.X_test = np.asarray(datasetManager.X_test) + np.asarray(1000, dtype=datasetManager.X_test.dtype)
+        assert all(values.dtype == np.float64 for values in datasetManager.get_polynomial_features(4)[1:])
+
+        regressor = PolynomialRegressor(datasetManager)
+        evaluations[dtype] = regressor.evaluate()[1]
+        assert regressor.predict_values(datasetManager.X_test[:5]).dtype == np.float64
+
+    assert evaluations['float32'] == pytest.approx(evaluations[None], abs=1e-6)
@@ -0,0 +1,62 @@
+"""test_forest_growth.py
+~~~~~~~~~~~~~~
+
+The random forests grown by blocks of trees with warm start, until the out-of-bag score plateaus or the maximum number of trees.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+import models.common.forest_growth as fg
+
+
+
+def get_growing_forest(forest, blockSize=10, maxTrees=200, tolerance=0.0):
+    return fg.GrowingForest(forest, SimpleNamespace(growForestBlockSize=blockSize, growForestMaxTrees=maxTrees, growForestTolerance=tolerance))
+
+
+
+def get_dataset(nbRows=400):
+    randomGenerator = np.random.default_rng(0)
+    X = randomGenerator.normal(size=(nbRows, 4))
+    return X, X @ np.arange(1, 5) + randomGenerator.normal(scale=0.5, size=nbRows)
+
+
+
+@pytest.mark.parametrize('forestClass', [RandomForestRegressor, RandomForestClassifier])
+def test_grown_forest_is_the_forest_fitted_at_once(forestClass):
+    X, y = get_dataset()
+    y = (y > 0).astype(int) if forestClass is RandomForestClassifier else y
+    growingForest = get_growing_forest(forestClass(random_state=0), maxTrees=30, tolerance=-np.inf).fit(X, y)
+
+    # Warm start draws the same trees as a single fit of the final number of trees
+    forest = forestClass(n_estimators=30, oob_score=True, random_state=0).fit(X, y)
+    assert [nbTrees for nbTrees, _ in growingForest.growthCurve] == [10, 20, 30]
+    np.testing.assert_array_equal(growingForest.predict(X), forest.predict(X))
+    assert growingForest.growthCurve[-1][1] == pytest.approx(forest.oob_score_)
+
+
+
+def test_growth_stops_on_the_score_plateau():
+    X, y = get_dataset()
+    growingForest = get_growing_forest(RandomForestRegressor(random_state=0), blockSize=20, tolerance=1.0).fit(X, y)
+
+    # With a tolerance of the whole R2 range, the first scored blocks are never improved enough
+    scoredBlocks = [nbTrees for nbTrees, score in growingForest.growthCurve if score is not None]
+    assert len(scoredBlocks) == fg.PLATEAU_BLOCKS + 1
+    assert growingForest.growthCurve[-1][0] < growingForest.maxTrees
+    assert growingForest.is_plateau()
+
+
+
+def test_growth_stops_at_the_maximum_number_of_trees():
+    X, y = get_dataset(nbRows=100)
+    growingForest = get_growing_forest(RandomForestRegressor(random_state=0), blockSize=5, maxTrees=12, tolerance=-np.inf).fit(X, y)
+
+    assert [nbTrees for nbTrees, _ in growingForest.growthCurve] == [5, 10, 12]
+    assert len(growingForest.forest.estimators_) == 12
+    # With few trees, some rows are never out of bag : the biased score of the first block isn't kept
+    assert growingForest.growthCurve[0][1] is None
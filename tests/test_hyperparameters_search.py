@@ -0,0 +1,67 @@
+"""test_hyperparameters_search.py
+~~~~~~~~~~~~~~
+
+The candidates hyperparameters drawn for the successive halving search.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+import models.common.common_model_selection as cms
+import models.common.hyperparameters_search as hs
+import utils.input_parameters as ip
+import classification_model_selection as clms
+import regression_model_selection as rms
+from types import SimpleNamespace
+
+# Constants
+TUNABLE_MODELS_CLASSES = [modelClass for existingModels in [rms.EXISTING_REGRESSORS, clms.EXISTING_CLASSIFIERS]\
+    for modelClass in cms.import_models(existingModels).values() if modelClass.HYPERPARAMETERS_SPACE]
+
+
+
+@pytest.mark.parametrize('modelClass', TUNABLE_MODELS_CLASSES, ids=lambda modelClass : modelClass.__name__)
+@pytest.mark.parametrize('nbCandidates', [4, 1000])
+def test_candidates_are_distinct_configurations(modelClass, nbCandidates):
+    candidates = hs.draw_candidates(modelClass, nbCandidates, np.random.RandomState(0))
+    defaultHyperparameters = {**modelClass.ESTIMATOR_DEFAULT_HYPERPARAMETERS, **modelClass.DEFAULT_HYPERPARAMETERS}
+    configurations = [tuple(sorted({**defaultHyperparameters, **candidate}.items(), key=str)) for candidate in candidates]
+
+    # The default hyperparameters are the first candidate, and every hyperparameter of the space has a known default value
+    assert candidates[0] == {}
+    assert set(modelClass.HYPERPARAMETERS_SPACE) <= set(defaultHyperparameters)
+    assert len(set(configurations)) == len(candidates) == min(nbCandidates, np.prod([len(values) for values in modelClass.HYPERPARAMETERS_SPACE.values()]))
+
+
+
+@pytest.mark.parametrize('nbTimeUnitsBudget, expectedRung', [(1, 1), (100, 3)])
+def test_only_the_last_rung_winner_is_adopted(monkeypatch, nbTimeUnitsBudget, expectedRung):
+    modelClass = next(modelClass for modelClass in TUNABLE_MODELS_CLASSES if modelClass.__name__ == 'RandomForestClassifier')
+    params = ip.InputParameters('dataset.csv', tuneCandidates=9, tuneReductionFactor=3)
+
+    # Each rung takes one time unit, the last candidate always being the best one
+    clock = [0.0]
+    def evaluate_candidates(executor, tasks, deadline):
+        clock[0] += 1
+        return list(range(len(tasks))), []
+    monkeypatch.setattr(hs, 'evaluate_candidates', evaluate_candidates)
+    monkeypatch.setattr(hs, 'time', SimpleNamespace(monotonic=lambda : clock[0]))
+
+    searchResult = hs.successive_halving('RFC', modelClass, None, 1, lambda evaluation : evaluation, 1000, nbTimeUnitsBudget, np.random.RandomState(0), params)
+
+    assert (searchResult['rung'], searchResult['nbRungs']) == (expectedRung, 3)
+    if expectedRung < searchResult['nbRungs']:
+        # The budget is spent after a rung trained on a part of the training rows : the default hyperparameters are kept
+        assert searchResult['nbTrainingRows'] < 1000
+        assert (searchResult['hyperparameters'], searchResult['score']) == ({}, None)
+    else:
+        assert searchResult['nbTrainingRows'] == 1000
+        assert searchResult['hyperparameters'] != {}
+
+
+
+def test_validation_positions_split():
+    trainingPositions, validationPositions = hs.split_validation_positions(1000, np.random.RandomState(0))
+    assert len(validationPositions) == 1000 * hs.VALIDATION_SIZE
+    assert sorted(np.concatenate((trainingPositions, validationPositions)).tolist()) == list(range(1000))
@@ -0,0 +1,63 @@
+"""test_incremental_metrics.py
+~~~~~~~~~~~~~~
+
+The metrics computed batch after batch, compared with the scikit-learn ones computed at once.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, confusion_matrix, r2_score
+import utils.incremental_metrics as im
+
+# Constants
+BATCH_SIZE = 37
+
+
+
+def test_incremental_r2_score():
+    randomGenerator = np.random.default_rng(0)
+    # A large offset, for the stability of the running squared deviations
+    y_test = 1e6 + randomGenerator.normal(size=1000)
+    y_pred = y_test + randomGenerator.normal(scale=0.3, size=1000)
+
+    r2Score = im.IncrementalR2Score()
+    for start in range(0, len(y_test), BATCH_SIZE):
+        r2Score.update(y_test[start:start + BATCH_SIZE], y_pred[start:start + BATCH_SIZE])
+    r2Score.update(y_test[:0], y_pred[:0])
+
+    assert r2Score.get_score() == pytest.approx(r2_score(y_test, y_pred), rel=1e-9)
+
+
+
+def test_incremental_confusion_matrix():
+    randomGenerator = np.random.default_rng(0)
+    labels = np.array([-1, 3, 8, 20])
+    y_test = labels[randomGenerator.integers(len(labels), size=1000)]
+    y_pred = np.where(randomGenerator.random(1000) < 0.8, y_test, labels[randomGenerator.integers(len(labels), size=1000)])
+
+    # The labels are sorted by the confusion matrix
+    confusionMatrix = im.IncrementalConfusionMatrix(labels[::-1])
+    for start in range(0, len(y_test), BATCH_SIZE):
+        confusionMatrix.update(y_test[start:start + BATCH_SIZE], y_pred[start:start + BATCH_SIZE])
+
+    np.testing.assert_array_equal(confusionMatrix.get_confusion_matrix(), confusion_matrix(y_test, y_pred, labels=labels))
+    assert confusionMatrix.get_accuracy_score() == pytest.approx(accuracy_score(y_test, y_pred))
+
+
+
+def test_incremental_sparse_confusion_matrix():
+    randomGenerator = np.random.default_rng(0)
+    labels = np.arange(7000)
+    y_test = randomGenerator.integers(len(labels), size=20000)
+    y_pred = np.where(randomGenerator.random(20000) < 0.6, y_test, randomGenerator.integers(len(labels), size=20000))
+
+    confusionMatrix = im.IncrementalConfusionMatrix(labels)
+    for start in range(0, len(y_test), 100 * BATCH_SIZE):
+        confusionMatrix.update(y_test[start:start + 100 * BATCH_SIZE], y_pred[start:start + 100 * BATCH_SIZE])
+
+    # Beyond the dense cells limit, the batches are summed as sparse matrices
+    assert not isinstance(confusionMatrix.get_confusion_matrix(), np.ndarray)
+    np.testing.assert_array_equal(confusionMatrix.get_confusion_matrix().diagonal(), np.bincount(y_test[y_test == y_pred], minlength=len(labels)))
+    assert confusionMatrix.get_accuracy_score() == pytest.approx(accuracy_score(y_test, y_pred))
@@ -0,0 +1,75 @@
+"""test_models_racing.py
+~~~~~~~~~~~~~~
+
+The confidence bounds of the scores, and the racing dropping the models that can't reach the leader.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from sklearn.dummy import DummyRegressor
+from sklearn.metrics import r2_score
+import models.classifiers.generic_classifier as gc
+import models.common.common_model_selection as cms
+import models.common.hyperparameters_search as hs
+import models.common.models_racing as mr
+import models.regressors.generic_regressor as gr
+import regression_model_selection as rms
+
+# Constants
+Z_SCORE_95 = 1.959963984540054
+
+
+
+#### Mean regressor class, hopeless against a linear regression on a linear dataset
+class MeanRegressor(gr.GenericRegressor):
+
+    DEFAULT_HYPERPARAMETERS = {}
+
+    def evaluate(self):
+        return self.evaluate_from_dataset_manager_and_regressor("Mean Regression", DummyRegressor())
+
+
+
+def get_evaluated_model(y_test, y_pred):
+    return SimpleNamespace(datasetManager=SimpleNamespace(y_test=np.asarray(y_test)), y_pred=np.asarray(y_pred))
+
+
+
+def test_r2_score_bounds_narrow_with_the_test_rows():
+    randomGenerator = np.random.default_rng(0)
+    bounds = []
+    for nbTestRows in (50, 5000):
+        y_test = randomGenerator.normal(size=nbTestRows)
+        y_pred = y_test + randomGenerator.normal(scale=0.5, size=nbTestRows)
+        lowerBound, upperBound = gr.GenericRegressor.get_score_confidence_bounds(get_evaluated_model(y_test, y_pred), Z_SCORE_95)
+        assert lowerBound < r2_score(y_test, y_pred) < upperBound
+        bounds.append(upperBound - lowerBound)
+
+    assert bounds[1] < bounds[0] / 5
+
+
+
+def test_accuracy_bounds_are_wilson_intervals():
+    # Wilson score intervals of 0 and 8 right predictions out of 10
+    lowerBound, upperBound = gc.GenericClassifier.get_score_confidence_bounds(get_evaluated_model(np.ones(10), np.zeros(10)), Z_SCORE_95)
+    assert (lowerBound, upperBound) == pytest.approx((0.0, 0.2775), abs=1e-4)
+    lowerBound, upperBound = gc.GenericClassifier.get_score_confidence_bounds(get_evaluated_model(np.ones(10), np.arange(10) < 8), Z_SCORE_95)
+    assert (lowerBound, upperBound) == pytest.approx((0.4902, 0.9433), abs=1e-4)
+
+
+
+def test_hopeless_model_is_dropped_at_the_first_rung(dataset_manager_factory):
+    datasetManager = dataset_manager_factory(nbRows=2000, race=True, raceRungs=3)
+    modelsClasses = {**cms.import_models(rms.EXISTING_REGRESSORS, ['MLR']), 'MEAN': MeanRegressor}
+    survivors, raceResults = mr.race_models(modelsClasses, datasetManager, rms.get_R2_score)
+
+    # The first rung trains on an eighth of the training part of the training set
+    trainingPositions, _ = hs.split_validation_positions(len(datasetManager.y_train), np.random.RandomState(datasetManager.params.splitRandomState))
+    assert list(survivors.keys()) == ['MLR']
+    assert raceResults['MEAN']['status'] == 'dropped'
+    assert raceResults['MEAN']['nbTrainingRows'] == max(hs.MIN_TRAINING_ROWS, len(trainingPositions) // 8)
+    assert raceResults['MEAN']['bounds'][1] < raceResults['MLR']['bounds'][0]
+    assert raceResults['MLR']['status'] == 'kept'
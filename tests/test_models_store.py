@@ -0,0 +1,53 @@
+"""test_models_store.py
+~~~~~~~~~~~~~~
+
+The stored models, keyed by the dataset content and by their configuration.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+import models.common.common_model_selection as cms
+import models.common.models_store as ms
+
+# Constants
+EXISTING_REGRESSORS = {'DTR' : 'models.regressors.decision_tree_regression.DecisionTreeRegressor'}
+
+
+
+def train_and_store(datasetManager, hyperparameters=None):
+    modelsDictionary = cms.instantiate_models(cms.import_models(EXISTING_REGRESSORS), datasetManager, hyperparameters)
+    cms.evaluate_models(modelsDictionary)
+    ms.save_models(modelsDictionary, datasetManager)
+    return modelsDictionary['DTR']
+
+
+
+def test_tuned_models_never_replace_the_default_ones(dataset_manager_factory, tmp_path):
+    datasetManager = dataset_manager_factory(modelStoreDir=str(tmp_path / 'store'))
+    defaultRegressor = train_and_store(datasetManager)
+    datasetManager.params.tune = True
+    tunedRegressor = train_and_store(datasetManager, {'DTR': {'max_depth': 2}})
+
+    X_test = np.asarray(datasetManager.X_test)
+    assert ms.load_models('regressor', EXISTING_REGRESSORS, datasetManager, None)['DTR'].hyperparameters == {'max_depth': 2}
+    np.testing.assert_array_equal(ms.load_models('regressor', EXISTING_REGRESSORS, datasetManager, ['DTR'])['DTR'].predict_values(X_test), tunedRegressor.predict_values(X_test))
+
+    # Without the -tune parameter, the default regressor is still the stored one
+    datasetManager.params.tune = False
+    storedRegressor = ms.load_models('regressor', EXISTING_REGRESSORS, datasetManager, None)['DTR']
+    assert storedRegressor.hyperparameters == {}
+    np.testing.assert_array_equal(storedRegressor.predict_values(X_test), defaultRegressor.predict_values(X_test))
+
+
+
+def test_stored_models_are_keyed_by_the_dataset_content(dataset_manager_factory, tmp_path):
+    datasetManager = dataset_manager_factory(modelStoreDir=str(tmp_path / 'store'))
+    train_and_store(datasetManager)
+    assert ms.get_stored_models_codes(EXISTING_REGRESSORS, dataset_manager_factory(modelStoreDir=str(tmp_path / 'store'))) == ['DTR']
+
+    otherDatasetManager = dataset_manager_factory(randomState=1, modelStoreDir=str(tmp_path / 'store'))
+    assert ms.get_stored_models_codes(EXISTING_REGRESSORS, otherDatasetManager) == []
+    with pytest.raises(LookupError):
+        ms.load_models('regressor', EXISTING_REGRESSORS, otherDatasetManager, ['DTR'])
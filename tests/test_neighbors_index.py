@@ -0,0 +1,74 @@
+"""test_neighbors_index.py
+~~~~~~~~~~~~~~
+
+The inverted file index, compared with the exact scikit-learn nearest neighbors.
+
+"""
+
+#### Libraries
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+import models.common.neighbors_index as ni
+import os
+import subprocess
+import sys
+
+# Constants
+NB_NEIGHBORS = 5
+
+
+
+def get_index_and_exact_neighbors(dtype=np.float64):
+    randomGenerator = np.random.default_rng(0)
+    X_train = randomGenerator.normal(size=(2000, 8)).astype(dtype)
+    X_test = randomGenerator.normal(size=(300, 8)).astype(dtype)
+    invertedFileIndex = ni.InvertedFileIndex(*ni.build_inverted_file(X_train))
+    exactDistances, exactPositions = NearestNeighbors(n_neighbors = NB_NEIGHBORS, algorithm = 'brute').fit(X_train).kneighbors(X_test)
+    return invertedFileIndex, X_test, exactDistances, exactPositions
+
+
+
+def test_all_cells_probed_is_exact():
+    invertedFileIndex, X_test, exactDistances, exactPositions = get_index_and_exact_neighbors()
+    distances, positions = invertedFileIndex.kneighbors(X_test, NB_NEIGHBORS, invertedFileIndex.get_nb_cells())
+
+    np.testing.assert_allclose(distances, exactDistances, rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(positions, exactPositions)
+    assert ni.get_recall(distances, exactDistances) == 1.0
+
+
+
+def test_float32_index():
+    invertedFileIndex, X_test, exactDistances, _ = get_index_and_exact_neighbors(np.float32)
+    distances, _ = invertedFileIndex.kneighbors(X_test, NB_NEIGHBORS, invertedFileIndex.get_nb_cells())
+
+    assert distances.dtype == np.float32
+    assert ni.get_recall(distances, exactDistances) == 1.0
+
+
+
+def test_probed_cells_recall():
+    invertedFileIndex, X_test, exactDistances, _ = get_index_and_exact_neighbors()
+    recalls = [ni.get_recall(invertedFileIndex.kneighbors(X_test, NB_NEIGHBORS, nbProbedCells)[0], exactDistances) for nbProbedCells in [1, 4, 16]]
+
+    # More probed cells never find fewer exact neighbors
+    assert recalls == sorted(recalls)
+    assert 0 < recalls[0] < 1.0
+
+
+
+def test_missing_neighbors():
+    invertedFileIndex, X_test, _, _ = get_index_and_exact_neighbors()
+    # Asking more neighbors than the rows of one cell
+    distances, positions = invertedFileIndex.kneighbors(X_test[:10], 1000, 1)
+
+    assert np.all(np.isinf(distances) == (positions == -1))
+    assert np.isinf(distances).any()
+
+
+
+def test_scripts_import_without_sklearn():
+    # Scikit-Learn is only imported once an index is built, keeping the scripts startup fast
+    sourceDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src')
+    command = "import sys, classification_model_selection; print(any(module.startswith('sklearn') for module in sys.modules))"
+    assert subprocess.check_output([sys.executable, '-c', command], cwd=sourceDirectory, text=True).strip() == 'False'
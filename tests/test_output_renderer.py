@@ -0,0 +1,90 @@
+"""test_output_renderer.py
+~~~~~~~~~~~~~~
+
+The output formats of the results tables and messages, and the terminal width worked out once.
+
+"""
+
+#### Libraries
+import csv
+import io
+import json
+import os
+import pytest
+import utils.output_renderer as orr
+
+# Constants
+ROWS = [["Model", "Score"], ["Linear | Regression", 0.5], ["Tree", 0.25]]
+
+
+
+#### Terminal stream class
+class TerminalStream(io.StringIO):
+
+    def isatty(self):
+        return True
+
+
+
+@pytest.fixture(autouse=True)
+def restore_renderer(monkeypatch):
+    # The renderer configured by a test is not kept for the next ones
+    monkeypatch.setattr(orr, 'RENDERER', None)
+
+
+
+def render(outputFormat, rows=ROWS, title="Evaluations"):
+    stream = io.StringIO()
+    orr.set_output_format(outputFormat, stream)
+    orr.print_table(rows, title)
+    return stream.getvalue()
+
+
+
+def test_csv_tables_are_separated_by_an_empty_line():
+    assert list(csv.reader(io.StringIO(render('csv')))) == [["Evaluations"], ["Model", "Score"], ["Linear | Regression", "0.5"], ["Tree", "0.25"], []]
+
+
+
+def test_json_table_is_a_single_line_object():
+    output = render('json')
+    assert output.count('\n') == 1
+    assert json.loads(output) == {'title': "Evaluations", 'header': ["Model", "Score"], 'rows': [["Linear | Regression", "0.5"], ["Tree", "0.25"]]}
+
+
+
+def test_markdown_table_escapes_the_pipes():
+    assert render('markdown').splitlines() == ["", "### Evaluations", "", "| Model | Score |", "|---|---|", "| Linear \\| Regression | 0.5 |", "| Tree | 0.25 |"]
+
+
+
+def test_text_table_is_not_limited_out_of_a_terminal():
+    longValue = "x" * 300
+    assert longValue in render('table', [["Model", "Score"], [longValue, 0.5]], None)
+
+
+
+@pytest.mark.parametrize('outputFormat, isMessageOnErrorStream', [('table', False), ('markdown', False), ('csv', True), ('json', True)])
+def test_messages_of_the_data_formats_are_on_the_error_stream(capsys, outputFormat, isMessageOnErrorStream):
+    stream = io.StringIO()
+    orr.set_output_format(outputFormat, stream)
+    orr.print_message("Results loaded")
+    assert ("Results loaded" in capsys.readouterr().err) == isMessageOnErrorStream
+    assert ("Results loaded" in stream.getvalue()) != isMessageOnErrorStream
+
+
+
+def test_terminal_width_is_worked_out_once(monkeypatch):
+    terminalSizeCalls = []
+    def get_terminal_size(fallback):
+        terminalSizeCalls.append(fallback)
+        return os.terminal_size((40, 24))
+    monkeypatch.setattr(orr.shutil, 'get_terminal_size', get_terminal_size)
+
+    stream = TerminalStream()
+    orr.set_output_format('table', stream)
+    for _ in range(3):
+        orr.print_table([["Model", "Score"], ["y" * 100, 0.5]])
+
+    assert len(terminalSizeCalls) == 1
+    assert max(len(line) for line in stream.getvalue().splitlines()) <= 40
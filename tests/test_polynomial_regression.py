@@ -0,0 +1,57 @@
+"""test_polynomial_regression.py
+~~~~~~~~~~~~~~
+
+The least squares accumulated by blocks, and the Polynomial Regression by blocks within a memory budget, compared with scikit-learn.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures, StandardScaler
+import models.common.incremental_least_squares as ils
+import models.regressors.polynomial_regression as plr
+
+
+
+@pytest.mark.parametrize('fit_intercept', [True, False])
+def test_least_squares_by_blocks_match_scikit_learn(fit_intercept):
+    randomGenerator = np.random.default_rng(0)
+    X = randomGenerator.normal(size=(1000, 6))
+    y = X @ randomGenerator.normal(size=6) + 3.0 + randomGenerator.normal(scale=0.1, size=1000)
+
+    regressor = ils.IncrementalLinearRegression(fit_intercept)
+    for start in range(0, len(X), 128):
+        regressor.partial_fit(X[start:start + 128], y[start:start + 128])
+    referenceRegressor = LinearRegression(fit_intercept=fit_intercept).fit(X, y)
+
+    assert regressor.n_samples_seen_ == len(X)
+    np.testing.assert_allclose(regressor.predict(X), referenceRegressor.predict(X), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(regressor.coef_, referenceRegressor.coef_, rtol=1e-9, atol=1e-9)
+    assert regressor.intercept_ == pytest.approx(referenceRegressor.intercept_, abs=1e-9)
+
+
+
+def test_polynomial_regression_by_blocks_matches_scikit_learn(dataset_manager_factory):
+    # 2000 rows of 35 expanded features (degree 4 of 3 variables) don't fit into 0.2 MB, blocks of 321 rows do
+    datasetManager = dataset_manager_factory(nbRows=2000, polynomialMemoryBudget=0.2)
+    regressor = plr.PolynomialRegressor(datasetManager)
+    regressorName, r2Score = regressor.evaluate()
+
+    assert regressorName == "Polynomial Regression (degree 4, by blocks)"
+    assert regressor.blockSize == 321 and regressor.blockSize < len(datasetManager.X_train)
+    referenceRegressor = make_pipeline(StandardScaler(), PolynomialFeatures(degree=4), LinearRegression()).fit(datasetManager.X_train, datasetManager.y_train)
+    y_pred = referenceRegressor.predict(datasetManager.X_test)
+    np.testing.assert_allclose(regressor.y_pred, y_pred, rtol=1e-6, atol=1e-6)
+    assert r2Score == pytest.approx(regressor.get_r2_score(datasetManager.y_test, y_pred))
+
+
+
+def test_degree_is_lowered_within_the_memory_budget():
+    # 50 variables : 316251 features for the degree 4, 23426 for the degree 3 and 1326 for the degree 2
+    assert plr.get_degree_within_memory_budget(50, 4, 64 * 1024 * 1024) == 2
+    assert plr.get_degree_within_memory_budget(50, 2, 64 * 1024 * 1024) == 2
+    with pytest.raises(MemoryError):
+        plr.get_degree_within_memory_budget(50, 4, 1024)
@@ -0,0 +1,67 @@
+"""test_predict_file.py
+~~~~~~~~~~~~~~
+
+The bulk predictions of a CSV or '.npy' file, predicted by chunks, and its invalid rows.
+
+"""
+
+#### Libraries
+import numpy as np
+import pandas as pd
+import pytest
+import models.common.common_model_selection as cms
+import regression_model_selection as rms
+
+# Constants
+NB_ROWS_TO_PREDICT = 25
+
+
+
+def get_trained_regressors(dataset_manager_factory, predictFilePath, tmp_path):
+    datasetManager = dataset_manager_factory(predictFile=str(predictFilePath), predictOutputFile=str(tmp_path / 'predictions.csv'), predictChunkSize=7)
+    modelsDictionary = cms.instantiate_models(cms.import_models(rms.EXISTING_REGRESSORS, ['MLR', 'DTR']), datasetManager)
+    cms.evaluate_models(modelsDictionary)
+    return datasetManager, modelsDictionary
+
+
+
+@pytest.mark.parametrize('fileExtension', ['.csv', '.npy'])
+def test_file_rows_are_predicted_by_chunks(dataset_manager_factory, tmp_path, fileExtension):
+    valuesToPredict = np.random.default_rng(1).normal(size=(NB_ROWS_TO_PREDICT, 3))
+    predictFilePath = tmp_path / ('rows' + fileExtension)
+    if fileExtension == '.npy':
+        np.save(predictFilePath, valuesToPredict)
+    else:
+        pd.DataFrame(valuesToPredict, columns=['x0', 'x1', 'x2']).to_csv(predictFilePath, index=False, float_format='%.17g')
+
+    datasetManager, modelsDictionary = get_trained_regressors(dataset_manager_factory, predictFilePath, tmp_path)
+    assert cms.predict_file('regressor', modelsDictionary, datasetManager, ['DTR', 'MLR']) == NB_ROWS_TO_PREDICT
+
+    # A column by model, in the order of the desired models
+    predictions = pd.read_csv(datasetManager.params.predictOutputFile)
+    assert list(predictions.columns) == ['Predicted y (DTR)', 'Predicted y (MLR)']
+    for modelCode in ['DTR', 'MLR']:
+        np.testing.assert_allclose(predictions["Predicted y ({0})".format(modelCode)], modelsDictionary[modelCode].predict_values(valuesToPredict))
+
+
+
+@pytest.mark.parametrize('invalidValue', ['abc', 'nan'])
+def test_invalid_row_is_reported(dataset_manager_factory, tmp_path, invalidValue):
+    predictFilePath = tmp_path / 'rows.csv'
+    rows = [['1.0', '2.0', '3.0']] * 10
+    rows[8] = ['1.0', invalidValue, '3.0']
+    pd.DataFrame(rows, columns=['x0', 'x1', 'x2']).to_csv(predictFilePath, index=False)
+
+    datasetManager, modelsDictionary = get_trained_regressors(dataset_manager_factory, predictFilePath, tmp_path)
+    with pytest.raises(AttributeError, match="at row 8 of"):
+        cms.predict_file('regressor', modelsDictionary, datasetManager, None)
+
+
+
+def test_wrong_number_of_columns_is_reported(dataset_manager_factory, tmp_path):
+    predictFilePath = tmp_path / 'rows.npy'
+    np.save(predictFilePath, np.zeros((NB_ROWS_TO_PREDICT, 2)))
+
+    datasetManager, modelsDictionary = get_trained_regressors(dataset_manager_factory, predictFilePath, tmp_path)
+    with pytest.raises(AttributeError, match="2 columns, expected 3"):
+        cms.predict_file('regressor', modelsDictionary, datasetManager, None)
@@ -0,0 +1,121 @@
+"""test_prediction_server.py
+~~~~~~~~~~~~~~
+
+The prediction server on localhost, its concurrent clients being micro-batched.
+
+"""
+
+#### Libraries
+import numpy as np
+import pytest
+import prediction_server as psv
+import utils.micro_batcher as mb
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import urllib.error
+import urllib.request
+
+# Constants
+NB_INDEPENDENT_VARIABLES = 3
+
+
+
+@pytest.fixture
+def server_url():
+    """Serves a model predicting the sum of the independent variables, recording the size of its batches.
+
+    """
+    batchSizes = []
+    def predict_values(valuesToPredict):
+        batchSizes.append(len(valuesToPredict))
+        return valuesToPredict.sum(axis=1)
+
+    batchers = {'SUM': mb.MicroBatcher(predict_values, 64, 0.01)}
+    server = psv.PredictionServer(('127.0.0.1', 0), batchers, NB_INDEPENDENT_VARIABLES)
+    serverThread = threading.Thread(target=server.serve_forever, daemon=True)
+    serverThread.start()
+    yield "http://{0}:{1}".format(*server.server_address[:2]), batchSizes
+    server.shutdown()
+    server.server_close()
+    batchers['SUM'].close()
+
+
+
+def post_predict(url, content):
+    request = urllib.request.Request(url + '/predict', data=json.dumps(content).encode('utf-8'), headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+
+@pytest.mark.parametrize('nbClients', [32, 64])
+def test_concurrent_clients_are_all_predicted(server_url, nbClients):
+    url, batchSizes = server_url
+    rows = np.arange(300 * NB_INDEPENDENT_VARIABLES, dtype=float).reshape(300, NB_INDEPENDENT_VARIABLES)
+    with ThreadPoolExecutor(nbClients) as executor:
+        responses = list(executor.map(lambda row: post_predict(url, {'rows': [row.tolist()]}), rows))
+
+    # Each client gets back its own prediction, whatever the batch it was predicted in
+    assert [response['predictions']['SUM'] for response in responses] == [[row.sum()] for row in rows]
+    assert sum(batchSizes) == len(rows)
+    assert len(batchSizes) < len(rows)
+
+
+
+def test_invalid_requests(server_url):
+    url, _ = server_url
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_predict(url, {'rows': [[1.0, 2.0]]})
+    assert error.value.code == 400
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_predict(url, {'rows': [[1.0, 2.0, 3.0]], 'models': ['MLR']})
+    assert error.value.code == 400
+
+
+
+def test_rows_are_parsed_in_the_served_float_type():
+    batchDtypes = []
+    def predict_values(valuesToPredict):
+        batchDtypes.append(valuesToPredict.dtype)
+        return valuesToPredict.sum(axis=1)
+
+    batchers = {'SUM': mb.MicroBatcher(predict_values, 64, 0.0)}
+    server = psv.PredictionServer(('127.0.0.1', 0), batchers, NB_INDEPENDENT_VARIABLES, np.float32)
+    serverThread = threading.Thread(target=server.serve_forever, daemon=True)
+    serverThread.start()
+    try:
+        response = post_predict("http://{0}:{1}".format(*server.server_address[:2]), {'rows': [[0.1, 0.2, 0.3]]})
+    finally:
+        server.shutdown()
+        server.server_close()
+        batchers['SUM'].close()
+
+    # Like a model trained with the -dtype float32 parameter, predicting float32 rows
+    assert batchDtypes == [np.float32]
+    assert response['predictions']['SUM'] == pytest.approx([0.6], rel=1e-6)
+
+
+
+def test_micro_batcher_splits_the_predictions_back():
+    batcher = mb.MicroBatcher(lambda valuesToPredict: valuesToPredict[:, 0] * 2, 8, 0.05)
+    try:
+        futures = [batcher.submit(np.full((nbRows, 1), float(nbRows))) for nbRows in (1, 3, 5, 2)]
+        for nbRows, future in zip((1, 3, 5, 2), futures):
+            np.testing.assert_array_equal(future.result(timeout=10), np.full(nbRows, 2.0 * nbRows))
+    finally:
+        batcher.close()
+
+
+
+def test_micro_batcher_forwards_the_prediction_errors():
+    def predict_values(valuesToPredict):
+        raise ValueError("Invalid values")
+
+    batcher = mb.MicroBatcher(predict_values, 8, 0.0)
+    try:
+        with pytest.raises(ValueError):
+            batcher.submit(np.zeros((1, 1))).result(timeout=10)
+    finally:
+        batcher.close()
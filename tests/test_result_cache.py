@@ -0,0 +1,87 @@
+"""test_result_cache.py
+~~~~~~~~~~~~~~
+
+The cached results, only reused for the same dataset content and the same model configuration, and their eviction.
+
+"""
+
+#### Libraries
+import numpy as np
+import os
+import models.common.common_model_selection as cms
+import models.common.result_cache as rc
+import utils.profiler as pr
+
+# Constants
+EXISTING_REGRESSORS = {'POLY' : 'models.regressors.polynomial_regression.PolynomialRegressor'}
+
+
+
+def get_regressor(datasetManager, hyperparameters=None):
+    hyperparametersDictionary = {'POLY': hyperparameters} if hyperparameters is not None else None
+    return cms.instantiate_models(cms.import_models(EXISTING_REGRESSORS), datasetManager, hyperparametersDictionary)['POLY']
+
+
+
+def train_and_cache(datasetManager, hyperparameters=None):
+    modelsDictionary = {'POLY': get_regressor(datasetManager, hyperparameters)}
+    evaluations, errors = cms.evaluate_models(modelsDictionary)
+    assert not errors
+    return modelsDictionary['POLY'], evaluations['POLY']
+
+
+
+def test_same_inputs_reuse_the_cached_result(dataset_manager_factory, tmp_path):
+    datasetManager = dataset_manager_factory(resultCacheDir=str(tmp_path / 'results'))
+    trainedRegressor, evaluation = train_and_cache(datasetManager)
+
+    cachedRegressor = get_regressor(dataset_manager_factory(resultCacheDir=str(tmp_path / 'results')))
+    assert rc.load_result(cachedRegressor) == evaluation
+    np.testing.assert_array_equal(cachedRegressor.predict_values(datasetManager.X_test), trainedRegressor.predict_values(datasetManager.X_test))
+
+
+
+def test_changed_hyperparameters_miss_the_cached_result(dataset_manager_factory, tmp_path):
+    datasetManager = dataset_manager_factory(resultCacheDir=str(tmp_path / 'results'))
+    train_and_cache(datasetManager)
+
+    assert rc.load_result(get_regressor(datasetManager, {'degree': 2})) is None
+    assert rc.load_result(get_regressor(datasetManager, {'degree': 4})) is not None
+
+
+
+def test_only_the_result_parameters_miss_the_cached_result(dataset_manager_factory, tmp_path):
+    datasetManager = dataset_manager_factory(resultCacheDir=str(tmp_path / 'results'))
+    train_and_cache(datasetManager)
+
+    # The output format isn't read by the training, unlike the polynomial memory budget
+    datasetManager.params.outputFormat = 'json'
+    assert rc.load_result(get_regressor(datasetManager)) is not None
+    assert 'polynomialMemoryBudget' in get_regressor(datasetManager).RESULT_PARAMETERS
+    datasetManager.params.polynomialMemoryBudget = datasetManager.params.polynomialMemoryBudget / 2
+    assert rc.load_result(get_regressor(datasetManager)) is None
+
+
+
+def test_changed_data_miss_the_cached_result(dataset_manager_factory, tmp_path):
+    train_and_cache(dataset_manager_factory(resultCacheDir=str(tmp_path / 'results')))
+
+    assert rc.load_result(get_regressor(dataset_manager_factory(randomState=1, resultCacheDir=str(tmp_path / 'results')))) is None
+    # The same content with another test set
+    assert rc.load_result(get_regressor(dataset_manager_factory(splitRandomState=1, resultCacheDir=str(tmp_path / 'results')))) is None
+
+
+
+def test_least_recently_used_results_are_evicted(dataset_manager_factory, tmp_path):
+    datasetManager = dataset_manager_factory(resultCacheDir=str(tmp_path / 'results'))
+    regressors = [train_and_cache(datasetManager, {'degree': degree})[0] for degree in (2, 3, 4)]
+    resultsFilesPaths = [rc.get_result_file_path(regressor) for regressor in regressors]
+
+    # The degree 3 result is the least recently used one, the degree 4 one being used last
+    for modificationTime, resultFilePath in zip((2, 1, 3), resultsFilesPaths):
+        os.utime(resultFilePath, (modificationTime, modificationTime))
+    resultsSize = sum(os.path.getsize(resultFilePath) for resultFilePath in resultsFilesPaths)
+    datasetManager.params.resultCacheMaxSize = (resultsSize - 1) / pr.BYTES_PER_MEGABYTE
+    rc.evict_least_recently_used(datasetManager.params)
+
+    assert [os.path.isfile(resultFilePath) for resultFilePath in resultsFilesPaths] == [True, False, True]
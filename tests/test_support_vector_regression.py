@@ -0,0 +1,55 @@
+"""test_support_vector_regression.py
+~~~~~~~~~~~~~~
+
+The train/test split done once on row indexes, its sets being views of X and y shared by the Support Vector Regression and the other models.
+
+"""
+
+#### Libraries
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVR
+from models.regressors.support_vector_regression import SupportVectorRegressor
+
+
+
+def test_split_sets_are_views_of_the_dataset_rows(dataset_manager_factory):
+    datasetManager = dataset_manager_factory(nbRows=500)
+    dataset = pd.read_csv(datasetManager.params.datasetFilePath).to_numpy()
+
+    # The training and test rows are the ones of a scikit-learn split of the row indexes
+    trainPositions, testPositions = train_test_split(np.arange(len(dataset)), test_size=datasetManager.params.splitTestSize, random_state=datasetManager.params.splitRandomState)
+    np.testing.assert_array_equal(datasetManager.trainIndexes, trainPositions)
+    np.testing.assert_array_equal(datasetManager.testIndexes, testPositions)
+    np.testing.assert_array_equal(datasetManager.X_train, dataset[trainPositions, :-1])
+    np.testing.assert_array_equal(datasetManager.y_test, dataset[testPositions, -1])
+
+    for setName, fullSet in [('X_train', 'X'), ('X_test', 'X'), ('y_train', 'y'), ('y_test', 'y')]:
+        assert getattr(datasetManager, setName).base is getattr(datasetManager, fullSet)
+    y_train, y_test = datasetManager.get_y_sets(twoDimensional=True)
+    assert y_train.shape == (len(trainPositions), 1) and np.shares_memory(y_test, datasetManager.y)
+
+
+
+@pytest.mark.parametrize('featureScaleDependentVariables', [False, True])
+def test_svr_is_trained_on_the_shared_split(dataset_manager_factory, featureScaleDependentVariables):
+    datasetManager = dataset_manager_factory(nbRows=500, featureScaleDependentVariables=featureScaleDependentVariables)
+    regressor = SupportVectorRegressor(datasetManager)
+    _, r2Score = regressor.evaluate()
+
+    # The scalers are the shared ones, fitted on the training set of the dataset manager
+    assert regressor.X_scaler is datasetManager.get_scaled_independent_variables()[0]
+    if featureScaleDependentVariables:
+        assert regressor.y_scaler is datasetManager.get_scaled_dependent_variable()[0]
+
+    X_scaler = StandardScaler().fit(datasetManager.X_train)
+    y_train = datasetManager.y_train.reshape(-1, 1)
+    y_scaler = StandardScaler().fit(y_train) if featureScaleDependentVariables else None
+    referenceRegressor = SVR(kernel='rbf').fit(X_scaler.transform(datasetManager.X_train), (y_scaler.transform(y_train) if y_scaler is not None else y_train).ravel())
+    y_pred = referenceRegressor.predict(X_scaler.transform(datasetManager.X_test))
+    y_pred = y_scaler.inverse_transform(y_pred.reshape(-1, 1)).ravel() if y_scaler is not None else y_pred
+    np.testing.assert_allclose(regressor.y_pred, y_pred)
+    assert r2Score == pytest.approx(regressor.get_r2_score(datasetManager.y_test, y_pred))